@@ -10,6 +10,8 @@ from ipywidgets import (
     interact, interactive, IntSlider, widget, FloatText, FloatSlider
 )
 import matplotlib
+from . import _set_rcParams
+_set_rcParams()
 
 def WaveVelSkind(frequency, epsr, sigma):
     omega = np.pi*np.complex128(frequency)
@@ -3,6 +3,8 @@ from __future__ import absolute_import
 
 import ipywidgets
 import matplotlib.pyplot as plt
+from . import _set_rcParams
+_set_rcParams()
 
 
 class MyApp(ipywidgets.Box):
@@ -0,0 +1,411 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import functools
+import multiprocessing
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+
+from . import KernelBackends
+
+# Chunked, thread parallel evaluation of the analytic field kernels.
+#
+# The kernels (FDEMDipolarfields, TDEMDipolarfields, FDEMPlanewave, the
+# induction spheres, DCsphere) are elementwise over the receivers. They
+# are evaluated a block of receivers at a time: blocks small enough to
+# stay in cache (chunkSize evaluations) and for the temporaries of all the
+# threads to fit the memory budget, run on a pool of threads (NumPy
+# releases the GIL in its ufuncs) and written into preallocated outputs.
+#
+# broadcastKernel also evaluates a dipole kernel on every combination of
+# nloc locations, nfreq frequencies (or times) and nsig conductivities, by
+# flattening the combinations of a block of locations into one array per
+# argument. The dipole kernels also take a prepared
+# KernelBackends.DipoleGeometry in place of the locations, whose blocks are
+# sliced out of its precomputed terms. All the kernels take a
+# KernelBackends.AxisGrid: the locations of a block are built from its axis
+# vectors, so a grid is never held as an (nloc, 3) array.
+#
+# With precision='single' the kernels decorated by broadcastKernel compute
+# in float32 / complex64, which halves the memory of the dense grids drawn
+# by the widgets (the numba and numexpr backends evaluate each value in
+# double and store it in single precision). The dipole kernels take the
+# offsets to the source in double and only cast them, so that the error
+# does not grow away from the origin; the plane wave kernels get their
+# locations in float32. The error is below 1e-6 of the largest value for
+# the frequency domain kernels, growing with the phase as 1e-7 kr (1e-4 at
+# kr = 1000); values below 1e-38 (e.g. past about 87 skin depths) flush to
+# zero. The time domain kernels cancel erf terms at small theta r, so they
+# compute in double and only return single precision arrays
+# (broadcastKernel(single=False)). Use it for display, not for data.
+
+precisions = {
+    'double': (np.float64, np.complex128),
+    'single': (np.float32, np.complex64),
+}
+
+_options = {
+    'memoryBudget': 256 * 2**20,
+    'chunkSize': 2**14,
+    'nThreads': multiprocessing.cpu_count(),
+}
+_pool = {}
+
+# bytes of temporaries per evaluated point, about 30 complex arrays
+bytesPerPoint = 512
+
+# inside: set while a kernel is evaluated, so that the kernels it calls (J
+# from E, B from H) evaluate elementwise on the flattened block
+# worker: set in the threads of the pool, which evaluate nested calls
+# serially
+_state = threading.local()
+
+
+def setMemoryBudget(nbytes):
+    """
+        Memory (bytes) the temporaries of the blocks evaluated at once may
+        use
+    """
+    if nbytes <= 0:
+        raise Exception("the memory budget should be positive")
+    _options['memoryBudget'] = int(nbytes)
+
+
+def getMemoryBudget():
+    return _options['memoryBudget']
+
+
+def setChunkSize(n):
+    """
+        Number of evaluations (receivers times frequencies times
+        conductivities) per block, None to only be bound by the memory
+        budget
+    """
+    if n is not None and n < 1:
+        raise Exception("the chunk size should be positive")
+    _options['chunkSize'] = n
+
+
+def getChunkSize():
+    return _options['chunkSize']
+
+
+def setThreads(n):
+    """
+        Number of threads the blocks are evaluated on (1 to evaluate them
+        serially)
+    """
+    if n < 1:
+        raise Exception("the number of threads should be positive")
+    _options['nThreads'] = int(n)
+
+
+def getThreads():
+    return _options['nThreads']
+
+
+def _getPool(n):
+    if _pool.get('n') != n:
+        if 'pool' in _pool:
+            _pool['pool'].terminate()
+        _pool['pool'] = ThreadPool(n)
+        _pool['n'] = n
+    return _pool['pool']
+
+
+def getBlockSize(perRow=1, bytesPerPoint=bytesPerPoint):
+    """
+        Number of rows (e.g. receivers) of a block, with perRow
+        evaluations per row
+    """
+    points = _options['memoryBudget'] // (
+        bytesPerPoint * _options['nThreads']
+    )
+    if _options['chunkSize'] is not None:
+        points = min(points, _options['chunkSize'])
+    return max(1, int(points // perRow))
+
+
+def _flatten(out):
+    """
+        Arrays of a kernel output: an array, a tuple of components, or a
+        dict of tuples
+    """
+    if isinstance(out, dict):
+        keys = [(name, len(out[name])) for name in sorted(out)]
+        arrays = [a for name in sorted(out) for a in out[name]]
+        return keys, arrays
+    if isinstance(out, np.ndarray):
+        return None, [out]
+    return len(out), list(out)
+
+
+def _unflatten(keys, arrays):
+    if keys is None:
+        return arrays[0]
+    if not isinstance(keys, list):
+        return tuple(arrays)
+    out, i = {}, 0
+    for name, n in keys:
+        out[name] = tuple(arrays[i:i+n])
+        i += n
+    return out
+
+
+def evalInChunks(func, nrow, perRow=1):
+    """
+        Evaluate func(start, stop) on blocks of the rows [0, nrow), on the
+        thread pool
+
+        func returns an array, a tuple of arrays or a dict of tuples of
+        arrays, whose first axis are the rows start to stop. The blocks are
+        written into outputs allocated from the first one.
+
+        :param int perRow: number of evaluations per row, to size the
+                           blocks
+    """
+    rows = getBlockSize(perRow)
+    if nrow <= rows:
+        return func(0, nrow)
+
+    keys, arrays = _flatten(func(0, rows))
+    outputs = []
+    for a in arrays:
+        o = np.empty((nrow,) + a.shape[1:], dtype=a.dtype)
+        o[:rows] = a
+        outputs.append(o)
+
+    def write(block):
+        start, stop = block
+        for o, a in zip(outputs, _flatten(func(start, stop))[1]):
+            o[start:stop] = a
+
+    def run(block):
+        _state.worker = True
+        write(block)
+
+    blocks = [(i, min(i + rows, nrow)) for i in range(rows, nrow, rows)]
+    nThreads = _options['nThreads']
+    if nThreads > 1 and not getattr(_state, 'worker', False):
+        _getPool(nThreads).map(run, blocks, chunksize=1)
+    else:
+        for block in blocks:
+            write(block)
+    return _unflatten(keys, outputs)
+
+
+def evalElementwise(func, *arrays):
+    """
+        Evaluate an elementwise func(*arrays) on blocks of the broadcast
+        arrays, on the thread pool
+
+        :rtype: same as func
+        :return: outputs with the broadcast shape of the arrays
+    """
+    b = np.broadcast(*arrays)
+    if b.size <= getBlockSize():
+        return func(*arrays)
+    flat = [np.broadcast_to(a, b.shape).ravel() for a in arrays]
+    out = evalInChunks(
+        lambda start, stop: func(*[a[start:stop] for a in flat]), b.size
+    )
+    keys, outputs = _flatten(out)
+    return _unflatten(keys, [o.reshape(b.shape) for o in outputs])
+
+
+def getPrecision(precision):
+    """
+        Real and complex dtypes of a precision, 'double' or 'single'
+    """
+    if precision not in precisions:
+        raise Exception(
+            "precision should be one of {}".format(", ".join(precisions))
+        )
+    return precisions[precision]
+
+
+def _castOutputs(arrays, precision):
+    real, cplx = getPrecision(precision)
+    return [
+        a.astype(cplx if np.iscomplexobj(a) else real, copy=False)
+        for a in arrays
+    ]
+
+
+def broadcastKernel(func=None, single=True, geometry=False):
+    """
+        Decorator broadcasting an elementwise kernel
+        func(XYZ, srcLoc, sig, f, ...) over all the locations, frequencies
+        (or times) and conductivities
+
+        Each component is returned as a (nloc, nfreq, nsig) array, or as a
+        1D array when there is a single conductivity and a single location
+        or frequency (the shapes the kernels always had).
+
+        The decorated kernel takes a precision keyword, 'double' (default)
+        or 'single' to compute and return float32 / complex64 arrays.
+
+        :param bool single: False for kernels that are not accurate in
+                            single precision, which then compute in double
+                            and only return single precision arrays
+        :param bool geometry: True for the dipole kernels, which take a
+                              KernelBackends.DipoleGeometry as XYZ and get
+                              the blocks of its prepared terms
+
+        XYZ may also be a KernelBackends.AxisGrid, of which the dipole
+        kernels get the geometry and the others the locations of each
+        block.
+    """
+    if func is None:
+        return functools.partial(
+            broadcastKernel, single=single, geometry=geometry
+        )
+
+    @functools.wraps(func)
+    def wrapper(XYZ, srcLoc, sig, f, *args, **kwargs):
+        precision = kwargs.pop('precision', 'double')
+        if getattr(_state, 'inside', False):
+            return func(XYZ, srcLoc, sig, f, *args, **kwargs)
+
+        real = getPrecision(precision)[0] if single else np.float64
+        grid = isinstance(XYZ, KernelBackends.AxisGrid)
+        prepared = isinstance(XYZ, KernelBackends.DipoleGeometry)
+        if prepared and not geometry:
+            XYZ, prepared = XYZ.XYZ, False
+        if geometry and not prepared:
+            # the offsets to the source in double, cast only after the
+            # difference, so single precision holds far from the origin
+            if not grid:
+                XYZ = np.atleast_2d(np.asarray(XYZ, dtype=float))
+                if XYZ.shape[1] != 3:
+                    raise Exception("XYZ should be a (nloc, 3) array")
+            XYZ = KernelBackends.DipoleGeometry(XYZ, srcLoc)
+            grid, prepared = False, True
+        if prepared:
+            XYZ = XYZ.astype(real)
+            nloc = XYZ.n
+        elif grid:
+            nloc = XYZ.n
+        else:
+            XYZ = np.atleast_2d(np.asarray(XYZ, dtype=real))
+            if XYZ.shape[1] != 3:
+                raise Exception("XYZ should be a (nloc, 3) array")
+            nloc = XYZ.shape[0]
+        srcLoc = np.asarray(srcLoc, dtype=float if geometry else real)
+        sig = np.asarray(sig, dtype=real).ravel()
+        f = np.asarray(f, dtype=real).ravel()
+        nf, ns = f.size, sig.size
+
+        # frequency and conductivity of each evaluation of a location
+        fs = np.repeat(f, ns)
+        sigs = np.tile(sig, nf)
+
+        def block(start, stop):
+            m = stop - start
+            if prepared:
+                xyz = XYZ.take(start, stop, nf * ns)
+            elif grid:
+                xyz = XYZ.take(start, stop, nf * ns, dtype=real)
+            else:
+                xyz = np.repeat(XYZ[start:stop], nf * ns, axis=0)
+            _state.inside = True
+            try:
+                out = func(
+                    xyz, srcLoc, np.tile(sigs, m), np.tile(fs, m), *args,
+                    **kwargs
+                )
+            finally:
+                _state.inside = False
+            keys, arrays = _flatten(out)
+            return _unflatten(keys, [a.reshape((m, nf, ns)) for a in arrays])
+
+        keys, outputs = _flatten(evalInChunks(block, nloc, perRow=nf * ns))
+        outputs = _castOutputs(outputs, precision)
+        if ns == 1 and (nloc == 1 or nf == 1):
+            outputs = [o.reshape(-1) for o in outputs]
+        return _unflatten(keys, outputs)
+
+    # lets the callers (View.DataView) know they can broadcast, pass an
+    # AxisGrid and a prepared geometry
+    wrapper.broadcasts = True
+    wrapper.dipoleGeometry = geometry
+    return wrapper
+
+
+def _benchmarkKernels(n):
+    from . import FDEMDipolarfields, TDEMDipolarfields, FDEMPlanewave
+    from . import InductionSphereFEM, InductionSphereTEM, DCsphere
+
+    xyz = np.random.RandomState(0).rand(n, 3) * 200. - 100.
+    x, y, z = xyz.T
+    src = np.r_[0., 0., 0.]
+    return {
+        'FDEM': lambda: FDEMDipolarfields.E_from_ElectricDipoleWholeSpace(
+            xyz, src, 1e-2, np.r_[1e3]
+        ),
+        'TDEM': lambda: TDEMDipolarfields.E_from_ElectricDipoleWholeSpace(
+            xyz, src, 1e-2, np.r_[1e-3]
+        ),
+        'planewave': lambda: FDEMPlanewave.E_field_from_SheetCurruent(
+            xyz, 0., 1e-2, np.r_[1e3]
+        ),
+        'sphereFEM': lambda: InductionSphereFEM.SphereFEM(
+            1., 'z', 0., 0., 10.
+        ).fcn_ComputeFrequencyResponse(
+            1e3, 1e2, 1., 5., 0., 0., -20., x, y, z
+        ),
+        'sphereTEM': lambda: InductionSphereTEM.SphereTEM(
+            1., 'z', 0., 0., 10.
+        ).fcn_ComputeTimeResponse(
+            1e-3, 1e2, 1., 5., 0., 0., -20., x, y, z, 'b'
+        ),
+        'DCsphere': lambda: DCsphere.DCSpherePointCurrent(
+            np.r_[-50., 0., 0.], xyz, 0., 20., 100., 10.
+        ),
+    }
+
+
+def benchmarkThreads(
+    kernels=('FDEM', 'TDEM', 'planewave', 'sphereFEM', 'sphereTEM',
+             'DCsphere'),
+    nThreads=(1, 2, 4, 8, 16, 32), n=10**6, nrepeat=3
+):
+    """
+        Time of the kernels at n random receivers for a number of threads
+
+        :param list kernels: any of 'FDEM', 'TDEM' (electric dipoles),
+                             'planewave', 'sphereFEM', 'sphereTEM',
+                             'DCsphere'
+        :param list nThreads: numbers of threads
+        :rtype: dict
+        :return: best time (s) of each kernel for each number of threads
+    """
+    funcs = _benchmarkKernels(n)
+    nThreads0 = _options['nThreads']
+    results = {}
+    print("{:>10s} {:>8s} {:>10s} {:>8s}".format(
+        "kernel", "threads", "time (s)", "speedup"
+    ))
+    try:
+        for name in kernels:
+            results[name] = {}
+            for nt in nThreads:
+                setThreads(nt)
+                times = []
+                for _ in range(nrepeat):
+                    t0 = time.time()
+                    funcs[name]()
+                    times.append(time.time() - t0)
+                results[name][nt] = min(times)
+                print("{:>10s} {:8d} {:10.3f} {:8.2f}".format(
+                    name, nt, min(times),
+                    results[name][nThreads[0]] / min(times)
+                ))
+    finally:
+        setThreads(nThreads0)
+    return results
@@ -7,6 +7,9 @@ import matplotlib
 import matplotlib.pyplot as plt
 from .FreqtoTime import transFilt
 
+from . import _set_rcParams
+_set_rcParams()
+
 def ColeColePelton(f, sigmaInf, eta, tau, c, option):
     """
 
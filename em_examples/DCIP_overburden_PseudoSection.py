@@ -14,7 +14,6 @@ from matplotlib import colors, ticker, cm
 from matplotlib.path import Path
 import matplotlib.patches as patches
 from scipy.constants import epsilon_0
-from scipy.interpolate import griddata
 import copy
 
 from ipywidgets import (
@@ -23,6 +22,15 @@ from ipywidgets import (
     )
 
 from .Base import widgetify
+from .DCSolvers import getDCSolver
+from .ModelBuilder import getSurfaceIndex, getNearestColumn
+from .DCSurvey import (
+    getSurveyGeometry, makeSourceList, gridPseudoSection
+)
+from .LinearIP import LinearIP
+
+from . import _set_rcParams
+_set_rcParams()
 
 # Mesh, sigmaMap can be globals global
 npad = 12
@@ -81,29 +89,18 @@ def model_valley(lnsig_air=np.log(1e-8), ln_sigback=np.log(1e-4),
     return mtrue, mhalf, mair, mover
 
 
-def findnearest(A):
-    idx = np.abs(mesh.gridCC[:, 0, None]-A).argmin(axis=0)
-    return mesh.gridCC[idx, 0]
-
-
-def get_Surface(mtrue, A):
-    active = (mtrue > (np.log(1e-8)))
-    nearpoint = findnearest(A)
-    columns = mesh.gridCC[:, 0, None] == nearpoint
-    ind = np.logical_and(columns.T, active).T
-    idm = []
-    surface = []
-    for i in range(ind.shape[1]):
-        idm.append(np.where(np.all(mesh.gridCC == np.r_[nearpoint[i], np.max(mesh.gridCC[ind[:, i], 1])],
-                   axis=1)))
-        surface.append(mesh.gridCC[idm[-1], 1])
-    return Utils.mkvc(np.r_[idm]), Utils.mkvc(np.r_[surface])
+def get_Surface(mtrue, A, surfaceInd=None):
+    if surfaceInd is None:
+        surfaceInd = getSurfaceIndex(mesh, mtrue > np.log(1e-8))
+    idm = surfaceInd[getNearestColumn(mesh, A)]
+    return idm, mesh.gridCC[idm, 1]
 
 
 def model_fields(A, B, mtrue, mhalf, mair, mover, whichprimary='overburden'):
 
-    idA, surfaceA = get_Surface(mtrue, A)
-    idB, surfaceB = get_Surface(mtrue, B)
+    surfaceInd = getSurfaceIndex(mesh, mtrue > np.log(1e-8))
+    idA, surfaceA = get_Surface(mtrue, A, surfaceInd)
+    idB, surfaceB = get_Surface(mtrue, B, surfaceInd)
 
     Mx = mesh.gridCC
     # Nx = np.empty(shape =(mesh.nC, 2))
@@ -125,9 +122,9 @@ def model_fields(A, B, mtrue, mhalf, mair, mover, whichprimary='overburden'):
     problem_prim = DC.Problem3D_CC(mesh, sigmaMap=mapping)
     problem_air = DC.Problem3D_CC(mesh, sigmaMap=mapping)
 
-    problem.Solver = SolverLU
-    problem_prim.Solver = SolverLU
-    problem_air.Solver = SolverLU
+    problem.Solver = getDCSolver(system=(__name__, 'total'))
+    problem_prim.Solver = getDCSolver(system=(__name__, 'primary'))
+    problem_air.Solver = getDCSolver(system=(__name__, 'air'))
 
     problem.pair(survey)
     problem_prim.pair(survey_prim)
@@ -244,7 +241,7 @@ def getSensitivity(survey, A, B, M, N, model):
 
     survey = DC.Survey([src])
     problem = DC.Problem3D_CC(mesh, sigmaMap=mapping)
-    problem.Solver = SolverLU
+    problem.Solver = getDCSolver(system=(__name__, 'sensitivity'))
     problem.pair(survey)
     fieldObj = problem.fields(model)
 
@@ -253,148 +250,28 @@ def getSensitivity(survey, A, B, M, N, model):
     return J
 
 
-def calculateRhoA(survey, VM, VN, A, B, M, N):
-
-    # to stabilize division
-    eps = 1e-9
-
-    if(survey == "Dipole-Dipole"):
-        G = 1. / (1./(np.abs(A-M)+eps) - 1./(np.abs(M-B)+eps) - 1./(np.abs(N-A)+eps) + 1./(np.abs(N-B)+eps))
-        rho_a = (VM-VN)*2.*np.pi*G
-    elif(survey == "Pole-Dipole"):
-        G = 1. / (1./(np.abs(A-M)+eps) - 1./(np.abs(N-A)+eps))
-        rho_a = (VM-VN)*2.*np.pi*G
-    elif(survey == "Dipole-Pole"):
-        G = 1. / (1./(np.abs(A-M)+eps) - 1./(np.abs(M-B)+eps))
-        rho_a = (VM)*2.*np.pi*G
-    elif(survey == "Pole-Pole"):
-        G = 1. / (1./(np.abs(A-M)+eps))
-        rho_a = (VM)*2.*np.pi*G
-
-    return rho_a
-
-
-def getPseudoLocs(xr, ntx, nmax, flag="PoleDipole"):
-    xloc = []
-    yloc = []
-    for i in range(ntx):
-        if i < ntx-nmax+1:
-
-            if flag == 'DipoleDipole':
-                txmid = xr[i]+dxr[i]*0.5
-                rxmid = xr[i+1:i+1+nmax]+dxr[i+1:i+1+nmax]*0.5
-
-            elif flag == 'PoleDipole':
-                txmid = xr[i]
-                rxmid = xr[i+1:i+1+nmax]+dxr[i+1:i+1+nmax]*0.5
-
-            elif flag == 'DipolePole':
-                txmid = xr[i]+dxr[i]*0.5
-                rxmid = xr[i+1:i+1+nmax]
-
-            mid = (txmid+rxmid)*0.5
-            xloc.append(mid)
-            yloc.append(np.arange(nmax)+1.)
-        else:
-            if flag == 'DipoleDipole':
-                txmid = xr[i]+dxr[i]*0.5
-                rxmid = xr[i+1:ntx+1]+dxr[i+1:ntx+1]*0.5
-
-            elif flag == 'PoleDipole':
-                txmid = xr[i]
-                rxmid = xr[i+1:ntx+1]+dxr[i+1:ntx+1]*0.5
-
-            elif flag == 'DipolePole':
-                txmid = xr[i]+dxr[i]*0.5
-                rxmid = xr[i+1:ntx+1]
-
-            mid = (txmid+rxmid)*0.5
-            xloc.append(mid)
-            yloc.append(np.arange(mid.size)+1.)
-    xlocvec = np.hstack(xloc)
-    ylocvec = np.hstack(yloc)
-    return np.c_[xlocvec, ylocvec]
+def getSurveyOnSurface(mtrue, flag="PoleDipole", nmax=8):
+    """
+    Survey geometry with the electrodes xr, and the remote electrodes at
+    the mesh edges, draped on the surface of the model mtrue
+    """
+    surfaceInd = getSurfaceIndex(mesh, mtrue > np.log(1e-8))
+    xremote = np.r_[mesh.vectorCCx.min(), mesh.vectorCCx.max()]
+    _, zr = get_Surface(mtrue, xr, surfaceInd)
+    _, zremote = get_Surface(mtrue, xremote, surfaceInd)
+    return getSurveyGeometry(
+        np.c_[xr, zr], flag, nmax,
+        remoteB=np.r_[xremote[0], zremote[0]],
+        remoteN=np.r_[xremote[1], zremote[1]]
+    )
 
 
 def DC2Dsurvey(mtrue, flag="PoleDipole", nmax=8):
 
-    if flag == "PoleDipole":
-        ntx = xr.size-2
-    elif flag == "DipolePole":
-        ntx = xr.size-2
-    elif flag == "DipoleDipole":
-        ntx = xr.size-3
-    else:
-        raise Exception('Not Implemented')
-    xzlocs = getPseudoLocs(xr, ntx, nmax, flag)
-
-    txList = []
-    zloc = -cs/2.
-    for i in range(ntx):
-        if flag == "PoleDipole":
-            A = np.r_[xr[i], zloc]
-            B = np.r_[mesh.vectorCCx.min(), zloc]
-            if i < ntx-nmax+1:
-                Mx = xr[i+1:i+1+nmax]
-                _, Mz = get_Surface(mtrue, Mx)
-                Nx = xr[i+2:i+2+nmax]
-                _, Nz = get_Surface(mtrue, Nx)
-
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
-            else:
-                Mx = xr[i+1:ntx+1]
-                _, Mz = get_Surface(mtrue, Mx)
-                Nx = xr[i+2:i+2+nmax]
-                _, Nz = get_Surface(mtrue, Nx)
-
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
-
-        elif flag == "DipolePole":
-            A = np.r_[xr[i], zloc]
-            B = np.r_[xr[i+1], zloc]
-            if i < ntx-nmax+1:
-                Mx = xr[i+2:i+2+nmax]
-                _, Mz = get_Surface(mtrue, Mx)
-                Nx = np.ones(nmax)*mesh.vectorCCx.max()
-                _, Nz = get_Surface(mtrue, Nx)
-
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
-
-            else:
-                Mx = xr[i+2:ntx+2]
-                _, Mz = get_Surface(mtrue, Mx)
-                Nx = np.ones(ntx-i)*mesh.vectorCCx.max()
-                _, Nz = get_Surface(mtrue, Nx)
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
-
-        elif flag == "DipoleDipole":
-            A = np.r_[xr[i], zloc]
-            B = np.r_[xr[i+1], zloc]
-            if i < ntx-nmax:
-                Mx = xr[i+2:i+2+nmax]
-                _, Mz = get_Surface(mtrue, Mx)
-                Nx = xr[i+3:i+3+nmax]
-                _, Nz = get_Surface(mtrue, Nx)
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
+    geometry = getSurveyOnSurface(mtrue, flag, nmax)
+    xzlocs = geometry['xzlocs']
 
-            else:
-                Mx = xr[i+2:len(xr)-1]
-                _, Mz = get_Surface(mtrue, Mx)
-                Nx = xr[i+3:len(xr)]
-                _, Nz = get_Surface(mtrue, Nx)
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
-
-        rx = DC.Rx.Dipole(M, N)
-        src = DC.Src.Dipole([rx], A, B)
-        txList.append(src)
-
-    survey = DC.Survey(txList)
+    survey = DC.Survey(makeSourceList(geometry))
     problem = DC.Problem3D_CC(mesh, sigmaMap=mapping)
     problem.pair(survey)
 
@@ -403,88 +280,42 @@ def DC2Dsurvey(mtrue, flag="PoleDipole", nmax=8):
 
 def IP2Dsurvey(miptrue, sigmadc, flag="PoleDipole", nmax=8):
 
-    if flag == "PoleDipole":
-        ntx = xr.size-2
-    elif flag == "DipolePole":
-        ntx = xr.size-2
-    elif flag == "DipoleDipole":
-        ntx = xr.size-3
-    else:
-        raise Exception('Not Implemented')
-    xzlocs = getPseudoLocs(xr, ntx, nmax, flag)
+    geometry = getSurveyOnSurface(miptrue, flag, nmax)
+    xzlocs = geometry['xzlocs']
 
-    txList = []
-    zloc = -cs/2.
-    for i in range(ntx):
-        if flag == "PoleDipole":
-            A = np.r_[xr[i], zloc]
-            B = np.r_[mesh.vectorCCx.min(), zloc]
-            if i < ntx-nmax+1:
-                Mx = xr[i+1:i+1+nmax]
-                _, Mz = get_Surface(miptrue, Mx)
-                Nx = xr[i+2:i+2+nmax]
-                _, Nz = get_Surface(miptrue, Nx)
-
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
-            else:
-                Mx = xr[i+1:ntx+1]
-                _, Mz = get_Surface(miptrue, Mx)
-                Nx = xr[i+2:i+2+nmax]
-                _, Nz = get_Surface(miptrue, Nx)
-
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
-
-        elif flag == "DipolePole":
-            A = np.r_[xr[i], zloc]
-            B = np.r_[xr[i+1], zloc]
-            if i < ntx-nmax+1:
-                Mx = xr[i+2:i+2+nmax]
-                _, Mz = get_Surface(miptrue, Mx)
-                Nx = np.ones(nmax)*mesh.vectorCCx.max()
-                _, Nz = get_Surface(miptrue, Nx)
-
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
-
-            else:
-                Mx = xr[i+2:ntx+2]
-                _, Mz = get_Surface(miptrue, Mx)
-                Nx = np.ones(ntx-i)*mesh.vectorCCx.max()
-                _, Nz = get_Surface(miptrue, Nx)
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
-
-        elif flag == "DipoleDipole":
-            A = np.r_[xr[i], zloc]
-            B = np.r_[xr[i+1], zloc]
-            if i < ntx-nmax:
-                Mx = xr[i+2:i+2+nmax]
-                _, Mz = get_Surface(miptrue, Mx)
-                Nx = xr[i+3:i+3+nmax]
-                _, Nz = get_Surface(miptrue, Nx)
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
-
-            else:
-                Mx = xr[i+2:len(xr)-1]
-                _, Mz = get_Surface(miptrue, Mx)
-                Nx = xr[i+3:len(xr)]
-                _, Nz = get_Surface(miptrue, Nx)
-                M = np.c_[Mx, Mz]
-                N = np.c_[Nx, Nz]
-
-        rx = DC.Rx.Dipole(M, N)
-        src = DC.Src.Dipole([rx], A, B)
-        txList.append(src)
-
-    survey = IP.Survey(txList)
+    survey = IP.Survey(makeSourceList(geometry))
     problem = IP.Problem3D_CC(mesh, sigma=sigmadc, etaMap=Maps.IdentityMap(mesh))
     problem.pair(survey)
 
     return survey, xzlocs
 
+
+# linearized IP engine of the last conductivity model and survey
+_linearIP = {}
+
+
+def getLinearIP(miptrue, sigmadc, flag="PoleDipole", nmax=8, active=None):
+    """
+    Linearized IP engine (see LinearIP) for the conductivity sigmadc. The
+    IP sensitivity is only recomputed when the conductivity or the survey
+    change, so sweeping chargeability models costs a matrix-vector product
+    per model.
+    """
+    key = (
+        flag, nmax, hash(np.asarray(sigmadc).tobytes()),
+        hash((miptrue > np.log(1e-8)).tobytes()),
+        None if active is None else hash(np.asarray(active).tobytes())
+    )
+    if _linearIP.get('key') != key:
+        survey, xzlocs = IP2Dsurvey(miptrue, sigmadc, flag, nmax=nmax)
+        survey.prob.Solver = SolverLU
+        _linearIP.clear()
+        _linearIP['key'] = key
+        _linearIP['engine'] = LinearIP(survey.prob, active=active)
+        _linearIP['xzlocs'] = xzlocs
+    return _linearIP['engine'], _linearIP['xzlocs']
+
+
 def PseudoSectionPlotfnc(i, j, survey, flag="PoleDipole"):
     matplotlib.rcParams['font.size'] = 14
     ntx = xr.size-2
@@ -601,14 +432,10 @@ def DipoleDipolefun(i):
 def PseudoSectionWidget(survey, flag):
     if flag == "PoleDipole":
         ntx, nmax = xr.size-2, 8
-        dxr = np.diff(xr)
     elif flag == "DipolePole":
         ntx, nmax = xr.size-1, 7
-        dxr = xr
     elif flag == "DipoleDipole":
         ntx, nmax = xr.size-3, 8
-        dxr = np.diff(xr)
-    xzlocs = getPseudoLocs(dxr, ntx, nmax, flag)
     PseudoSectionPlot = lambda i,j,flag: PseudoSectionPlotfnc(i, j, survey, flag)
     return widgetify(PseudoSectionPlot,
                      i=IntSlider(min=0, max=ntx-1, step=1, value=0),
@@ -657,13 +484,15 @@ def DCIP2Dfwdfun(mesh, mapping,
                                                  a=ellips_a, b=ellips_b, xc=xc,zc=zc)
 
         sigmadc = 1./(mapping*mdctrue)
-        survey, xzlocs = IP2Dsurvey(mtrue, sigmadc, surveyType, nmax=nmax)
+        linearIP, xzlocs = getLinearIP(mtrue, sigmadc, surveyType, nmax=nmax)
+        predict = linearIP.dpred
 
     else:
         survey, xzlocs = DC2Dsurvey(mtrue, surveyType, nmax=nmax)
+        predict = survey.dpred
 
-    dmover = survey.dpred(mover)
-    dpred = survey.dpred(mtrue)
+    dmover = predict(mover)
+    dpred = predict(mtrue)
     xi, yi = np.meshgrid(np.linspace(xr.min(), xr.max(), 120), np.linspace(1., nmax, 100))
 
     # Cheat to compute a geometric factor
@@ -671,18 +500,18 @@ def DCIP2Dfwdfun(mesh, mapping,
     if which == 'IP':
         mtest = 10.*np.ones_like(mtrue)
         mtest[mdctrue == np.log(1e-8)] = 0.
-        dhalf = survey.dpred(mtest)
+        dhalf = predict(mtest)
         appresover = 10.*(dmover/dhalf)
         apprestrue = 10.*(dpred/dhalf)
     else:
-        dmair = survey.dpred(mair)
+        dmair = predict(mair)
         appresover = dmover/dmair/np.exp(ln_sigHalf)
         apprestrue = dpred/dmair/np.exp(ln_sigHalf)
 
-    dtrue = griddata(xzlocs, apprestrue, (xi, yi), method='linear')
+    dtrue = gridPseudoSection(xzlocs, apprestrue, xi, yi)
     dtrue = np.ma.masked_where(np.isnan(dtrue), dtrue)
 
-    dover = griddata(xzlocs, appresover, (xi, yi), method='linear')
+    dover = gridPseudoSection(xzlocs, appresover, xi, yi)
     dover = np.ma.masked_where(np.isnan(dover), dover)
 
     if which == 'IP':
@@ -758,7 +587,7 @@ def DCIP2Dfwdfun(mesh, mapping,
     else:
         if predmis == "Difference":
             mis = (apprestrue-appresover)
-            Mis = griddata(xzlocs, mis, (xi, yi), method='linear')
+            Mis = gridPseudoSection(xzlocs, mis, xi, yi)
             if which == 'IP':
                 diflabel = 'Difference (chg unit)'
             else:
@@ -766,7 +595,7 @@ def DCIP2Dfwdfun(mesh, mapping,
 
         else:
             mis = (apprestrue-appresover)/apprestrue
-            Mis = griddata(xzlocs, mis, (xi, yi), method='linear')
+            Mis = gridPseudoSection(xzlocs, mis, xi, yi)
             diflabel = 'Normalized Difference (%)'
 
         dat3 = ax3.contourf(xi, yi, Mis, 10)
@@ -18,6 +18,7 @@ from ipywidgets import (
 )
 
 from .Base import widgetify
+from .DCSurvey import getGeometricFactor, getApparentResistivity
 
 # Mesh parameters
 npad = 20
@@ -131,20 +132,13 @@ def G(A, B, M, N):
     """
     Geometric factor
     """
-    return (
-        1. / (
-            1./(np.abs(A-M)+eps) -
-            1./(np.abs(M-B)+eps) -
-            1./(np.abs(N-A)+eps) +
-            1./(np.abs(N-B)+eps)
-        )
-    )
+    return getGeometricFactor(A, B, M, N, eps=eps)
 
 def rho_a (VM, VN, A, B, M, N):
     """
     Apparent Resistivity
     """
-    return (VM-VN)*2.*np.pi*G(A, B, M, N)
+    return getApparentResistivity(VM, VN, A, B, M, N, eps=eps)
 
 def solve_2D_potentials(rho1, rho2, h, A, B):
     """
@@ -0,0 +1,128 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import linalg
+from SimPEG import Mesh
+
+# Design of 2D tensor meshes for surface DC surveys.
+#
+# The core cell size follows from the smallest electrode spacing a and the
+# accuracy asked for. The error is largest on the dipole next to a source
+# electrode, and decreases at first order with the cell size h: against the
+# analytic potential of a line source, rho / pi ln(rN / rM), the dipole of
+# length a at a from a pole source is off by about nearSourceError h / a
+# (0.38 h / a measured for h = a / 4 to a / 32), the next dipoles by less.
+# The core spans the electrodes and goes down to the target depth (or a
+# quarter of the line length). The padding grows geometrically until the
+# boundaries, which perturb the dipoles at the end of the line by about
+# L / D at a distance D, are 2 L / accuracy away, half of the error budget
+# (the two errors peak at opposite ends of the line).
+
+# relative error of the dipole next to a source, per h / a
+nearSourceError = 0.4
+
+_solveTimeScale = {}
+
+
+def _getSolveTimeScale(n=20000):
+    """
+        Seconds per n**1.5 of a SuperLU solve of a 2D Laplacian, measured
+        once on this machine
+    """
+    if 'scale' not in _solveTimeScale:
+        nx = int(np.sqrt(n))
+        d = sp.diags([-np.ones(nx), np.ones(nx)], [0, 1], shape=(nx, nx+1))
+        D = sp.hstack([
+            sp.kron(sp.identity(nx), d), sp.kron(d, sp.identity(nx))
+        ])
+        A = (D * D.T).tocsc() + sp.identity(nx**2, format='csc')
+        t0 = time.time()
+        linalg.splu(A).solve(np.ones(nx**2))
+        _solveTimeScale['scale'] = (time.time() - t0) / (nx**2)**1.5
+    return _solveTimeScale['scale']
+
+
+def estimateSolveTime(nC):
+    """
+        Estimated time (s) of a direct (SuperLU) solve on a 2D mesh of nC
+        cells, scaled as nC**1.5 from a small calibration solve
+    """
+    return _getSolveTimeScale() * nC**1.5
+
+
+def _nPadding(cs, growth, distance):
+    """
+        Number of padding cells growing from cs by growth to cover distance
+    """
+    return int(np.ceil(
+        np.log(1. + distance * (growth - 1.) / (cs * growth)) / np.log(growth)
+    ))
+
+
+def designDCMesh(
+    electrodes, targetDepth=None, accuracy=0.01, growth=1.3, verbose=True
+):
+    """
+    Smallest 2D TensorMesh for a surface DC survey that meets accuracy
+
+    :param numpy.array electrodes: electrode x positions (or (nElec, 2)
+                                   locations, the surface being at the
+                                   highest electrode)
+    :param float targetDepth: depth the core has to reach, a quarter of the
+                              line length when None
+    :param float accuracy: relative accuracy of the dipole potential
+                           differences, the dipole next to a source
+                           included
+    :param float growth: growth rate of the padding cells
+    :rtype: tuple
+    :return: the mesh, and a dict with the core cell size, the number of
+             core and padding cells, nC, the expected error next to a
+             source and the estimated solve time (s)
+    """
+    electrodes = np.asarray(electrodes, dtype=float)
+    if electrodes.ndim == 2:
+        x, ztop = np.sort(electrodes[:, 0]), electrodes[:, 1].max()
+    else:
+        x, ztop = np.sort(electrodes), 0.
+    if x.size < 2:
+        raise Exception("at least two electrodes are needed")
+
+    a = np.diff(x)[np.diff(x) > 0].min()
+    L = x[-1] - x[0]
+    if targetDepth is None:
+        targetDepth = 0.25 * L
+
+    # nearSourceError cs / a <= accuracy, on a grid of a / 2**k so that the
+    # electrodes fall on cell boundaries
+    cs = a / 2**max(np.ceil(np.log2(nearSourceError / accuracy)), 0.)
+
+    ncx = int(np.ceil((L + 2. * a) / cs))
+    ncz = int(np.ceil(targetDepth / cs))
+    npad = _nPadding(cs, growth, 2. * L / accuracy)
+
+    hx = [(cs, npad, -growth), (cs, ncx), (cs, npad, growth)]
+    hz = [(cs, npad, -growth), (cs, ncz)]
+    padWidth = (cs * growth * (growth**npad - 1.) / (growth - 1.))
+    x0 = [x[0] - a - padWidth, ztop - ncz * cs - padWidth]
+    mesh = Mesh.TensorMesh([hx, hz], x0=x0)
+
+    info = {
+        'cs': cs, 'ncx': ncx, 'ncz': ncz, 'npad': npad, 'nC': mesh.nC,
+        'error': nearSourceError * cs / a,
+        'solveTime': estimateSolveTime(mesh.nC),
+    }
+    if verbose:
+        print(
+            ">> core cells {} x {} of {:g} m, {} padding cells, nC = {}, "
+            "error next to a source {:.2g}, estimated solve time "
+            "{:.2g} s".format(
+                ncx, ncz, cs, npad, mesh.nC, info['error'], info['solveTime']
+            )
+        )
+    return mesh, info
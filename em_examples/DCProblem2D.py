@@ -0,0 +1,479 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import multiprocessing
+import threading
+import time
+import warnings
+
+import numpy as np
+from scipy.optimize import minimize, nnls
+from scipy.sparse import linalg
+from scipy.special import k0
+from SimPEG.EM.Static import DC
+
+
+def _solveKy(args):
+    """
+        Factorize and solve one wavenumber system in a worker process
+    """
+    A, RHS = args
+    return linalg.splu(A.tocsc()).solve(np.asarray(RHS))
+
+
+class _ThreadFactor(object):
+    """
+        Factorization of one wavenumber system, made and released on a
+        thread of its own. SuperLU (SolverLU) only frees its factors on the
+        thread that allocated them, so factorizations made on a pool and
+        dropped on the main thread were never freed.
+
+        :param Solver: SimPEG solver class
+        :param scipy.sparse.spmatrix A: system matrix
+        :param dict opts: solver options
+        :param threading.Semaphore semaphore: bounds the number of systems
+                                              factorized at once
+        :param numpy.array RHS: right hand side solved on the thread
+    """
+
+    def __init__(self, Solver, A, opts, semaphore, RHS):
+        # the thread only sees state and the events, not self, so that
+        # dropping the last reference to self releases the factorization
+        state = {}
+        ready, release = threading.Event(), threading.Event()
+        self._state, self._ready, self._release = state, ready, release
+
+        def run():
+            try:
+                with semaphore:
+                    state['Ainv'] = Solver(A, **opts)
+                    state['u'] = state['Ainv'] * RHS
+            except Exception as err:
+                state['error'] = err
+            ready.set()
+            release.wait()
+            state.clear()
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+
+    def _get(self, key):
+        self._ready.wait()
+        if 'error' in self._state:
+            raise self._state['error']
+        return self._state[key]
+
+    @property
+    def solution(self):
+        return self._get('u')
+
+    @property
+    def solver(self):
+        return self._get('Ainv')
+
+    def __mul__(self, b):
+        return self._get('Ainv') * b
+
+    def clean(self):
+        self._release.set()
+
+    def __del__(self):
+        self._release.set()
+
+
+def getKyWeights(kys):
+    """
+        Quadrature weights of the trapezoidal rule the 2.5D receivers use
+        to transform the potentials back from the ky domain, such that
+        phi = 1/pi * sum(w * phi_ky)
+
+        :param numpy.array kys: increasing wavenumbers
+        :rtype: numpy.array
+        :return: weights
+    """
+    dky = np.diff(kys)
+    dky = np.r_[dky[0], dky]
+    w = 0.5*dky + 0.5*np.r_[dky[1:], 0.]
+    w[0] += 0.5*dky[0]
+    return w
+
+
+def getKyError(kys, r, weights=None):
+    """
+        Maximum relative error of the inverse ky transform of a point source
+        in a whole space, for which int_0^inf K0(ky r) dky = pi / (2 r)
+
+        :param numpy.array kys: increasing wavenumbers
+        :param numpy.array r: source-receiver distances
+        :param numpy.array weights: quadrature weights, those of the
+                                    trapezoidal rule (getKyWeights) when None
+        :rtype: float
+    """
+    if weights is None:
+        weights = getKyWeights(kys)
+    r = np.atleast_1d(r)
+    phi = k0(np.outer(r, kys)).dot(weights)
+    return np.abs(phi * 2. * r / np.pi - 1.).max()
+
+
+def _fitKyWeights(kys, r):
+    """
+        Non negative least squares weights of the inverse ky transform of a
+        point source at the distances r
+    """
+    A = k0(np.outer(r, kys)) * 2. * r[:, None] / np.pi
+    w, _ = nnls(A, np.ones(r.size), maxiter=50*kys.size)
+    return w
+
+
+_adaptiveKys = {}
+
+
+def getAdaptiveKys(rmin, rmax, tol=1e-2, nkyMax=15, nr=50):
+    """
+        Wavenumbers and quadrature weights for a survey whose
+        source-receiver distances lie in [rmin, rmax].
+
+        For nky = 2, 3, ... the wavenumbers start log spaced over the best
+        range found on a coarse grid, their positions are then optimized
+        (Nelder-Mead on log10(ky)) with the weights fitted by non negative
+        least squares on the whole space transform (see getKyError). The
+        first nky whose error is below tol is returned, or nkyMax with a
+        warning. A few fitted wavenumbers reach the accuracy of many more
+        trapezoidal ones, so this is what reduces the number of solves.
+
+        The results are memoized on (rmin, rmax, tol), since the widgets
+        build a new problem for every update.
+
+        :param float rmin: smallest source-receiver distance
+        :param float rmax: largest source-receiver distance
+        :param float tol: tolerance on the relative error
+        :param int nkyMax: largest number of wavenumbers tried
+        :param int nr: number of distances the error is fitted at
+        :rtype: tuple
+        :return: kys, weights, estimated error
+    """
+    key = (float(rmin), float(rmax), float(tol), nkyMax, nr)
+    if key in _adaptiveKys:
+        kys, w, err = _adaptiveKys[key]
+        return kys.copy(), w.copy(), err
+
+    r = np.logspace(np.log10(rmin), np.log10(rmax), nr)
+    # the first wavenumber is searched in [1e-3, 1]/rmax and the last one
+    # in [0.3, 30]/rmin
+    los = np.log10(1./rmax) + np.linspace(-3., 0., 13)
+    his = np.log10(1./rmin) + np.linspace(-0.5, 1.5, 9)
+
+    def misfit(lk):
+        kys = np.sort(10.**lk)
+        A = k0(np.outer(r, kys)) * 2. * r[:, None] / np.pi
+        return np.sum((A.dot(_fitKyWeights(kys, r)) - 1.)**2)
+
+    for nky in range(2, nkyMax+1):
+        best = None
+        for lo in los:
+            for hi in his:
+                kys = np.logspace(lo, hi, nky)
+                err = getKyError(kys, r, _fitKyWeights(kys, r))
+                if best is None or err < best[0]:
+                    best = (err, kys)
+        err, kys = best
+        if err > tol:
+            opt = minimize(
+                misfit, np.log10(kys), method='Nelder-Mead',
+                options={'maxiter': 4000, 'xatol': 1e-4, 'fatol': 1e-12}
+            )
+            kysOpt = np.sort(10.**opt.x)
+            errOpt = getKyError(kysOpt, r, _fitKyWeights(kysOpt, r))
+            if errOpt < err:
+                err, kys = errOpt, kysOpt
+        if err <= tol:
+            break
+    else:
+        warnings.warn(
+            "tolerance {:.1e} not reached, error with {} "
+            "wavenumbers is {:.1e}".format(tol, nkyMax, err)
+        )
+
+    w = _fitKyWeights(kys, r)
+    _adaptiveKys[key] = (kys, w, err)
+    return kys.copy(), w.copy(), err
+
+
+def getSurveyDistanceRange(survey, hmin=0.):
+    """
+        Smallest and largest distance between the source electrodes and the
+        receiver locations of a survey, the smallest one being floored at
+        hmin (typically the smallest cell width)
+    """
+    srcLocs, rxLocs = [], []
+    for src in survey.srcList:
+        locs = src.loc if isinstance(src.loc, list) else [src.loc]
+        srcLocs += [np.atleast_2d(loc) for loc in locs]
+        for rx in src.rxList:
+            locs = rx.locs if isinstance(rx.locs, list) else [rx.locs]
+            rxLocs += [np.atleast_2d(loc) for loc in locs]
+    srcLocs = np.vstack(srcLocs)
+    rxLocs = np.vstack(rxLocs)
+    dim = min(srcLocs.shape[1], rxLocs.shape[1])
+    r = np.sqrt(
+        ((srcLocs[:, None, :dim] - rxLocs[None, :, :dim])**2).sum(axis=2)
+    )
+    return max(r.min(), hmin), max(r.max(), hmin)
+
+
+class Problem2D_CC(DC.Problem2D_CC):
+    """
+        2.5D cell centred DC problem that solves the independent ky systems
+        on a pool of workers.
+
+        :param str parallel: None (serial, as in SimPEG), 'thread' or
+                             'process'
+        :param int nWorkers: size of the pool, defaults to the number of cores
+        :param float kyTol: when given, the wavenumbers are chosen with
+                            getAdaptiveKys for this tolerance instead of the
+                            fixed SimPEG ones
+        :param tuple kyRange: (rmin, rmax) used by the adaptive wavenumbers,
+                              taken from the survey when None
+
+        The SimPEG receivers always integrate over ky with the trapezoidal
+        rule. When other quadrature weights are set (setKys), the right hand
+        side of each ky system is scaled by weights / trapezoidal weights,
+        so the fields of that ky carry the ratio and the receivers, dpred,
+        Jvec and Jtvec apply the given weights. Only read the ky fields
+        through the receivers.
+
+        With threads the factorizations are kept in Ainv, each on a thread
+        of its own (see _ThreadFactor), so sensitivities still work. With
+        processes every worker factorizes with SuperLU and only returns the
+        solution, so Ainv is not available afterwards.
+    """
+
+    parallel = None
+    nWorkers = None
+    kyTol = None
+    kyRange = None
+    kyWeights = None
+
+    def __init__(
+        self, mesh, parallel=None, nWorkers=None, kyTol=None, kyRange=None,
+        **kwargs
+    ):
+        DC.Problem2D_CC.__init__(self, mesh, **kwargs)
+        self.parallel = parallel
+        self.nWorkers = nWorkers
+        self.kyTol = kyTol
+        self.kyRange = kyRange
+        self.Ainv = [None for i in range(self.nky)]
+
+    def setKys(self, kys, weights=None):
+        """
+            Replace the wavenumbers of the problem, and their quadrature
+            weights (trapezoidal when None)
+        """
+        for Ainv in self.Ainv:
+            if Ainv is not None and hasattr(Ainv, 'clean'):
+                Ainv.clean()
+        self.kys = np.asarray(kys)
+        self.nky = self.kys.size
+        self.nT = self.nky
+        self.Ainv = [None for i in range(self.nky)]
+        self.kyWeights = None if weights is None else np.asarray(weights)
+
+    def getRHS(self, ky):
+        RHS = DC.Problem2D_CC.getRHS(self, ky)
+        if self.kyWeights is None:
+            return RHS
+        iky = np.flatnonzero(self.kys == ky)[0]
+        return RHS * (self.kyWeights[iky] / getKyWeights(self.kys)[iky])
+
+    def setAdaptiveKys(self):
+        """
+            Choose the wavenumbers for kyTol from the survey geometry
+        """
+        if self.kyRange is None:
+            hmin = min(h.min() for h in self.mesh.h)
+            rmin, rmax = getSurveyDistanceRange(self.survey, hmin)
+        else:
+            rmin, rmax = self.kyRange
+        kys, w, err = getAdaptiveKys(rmin, rmax, self.kyTol)
+        self.kyError = err
+        if not np.array_equal(kys, self.kys):
+            self.setKys(kys, w)
+
+    def _kySolver(self, iky):
+        """
+            Solver of the wavenumber system iky: the wavenumber is added to
+            the system of a SolverPCG (see DCSolvers), so that the warm
+            starts of the systems do not mix
+        """
+        system = getattr(self.Solver, 'system', None)
+        if system is None:
+            return self.Solver
+        return type(
+            str(self.Solver.__name__), (self.Solver,),
+            {'system': (system, float(self.kys[iky]))}
+        )
+
+    def fields(self, m):
+        if self.kyTol is not None:
+            self.setAdaptiveKys()
+
+        perKySolver = getattr(self.Solver, 'system', None) is not None
+        if self.parallel is None and not perKySolver:
+            return DC.Problem2D_CC.fields(self, m)
+
+        if m is not None:
+            self.model = m
+
+        for Ainv in self.Ainv:
+            if Ainv is not None and hasattr(Ainv, 'clean'):
+                Ainv.clean()
+        self.Ainv = [None for i in range(self.nky)]
+
+        f = self.fieldsPair(self.mesh, self.survey)
+        Srcs = self.survey.srcList
+
+        if self.parallel is None:
+            for iky, ky in enumerate(self.kys):
+                self.Ainv[iky] = self._kySolver(iky)(
+                    self.getA(ky), **self.solverOpts
+                )
+                f[Srcs, self._solutionType, iky] = (
+                    self.Ainv[iky] * self.getRHS(ky)
+                )
+            return f
+
+        # the systems are assembled serially, only the factorizations and
+        # solves go to the pool
+        As = [self.getA(ky) for ky in self.kys]
+        RHSs = [self.getRHS(ky) for ky in self.kys]
+        nWorkers = self.nWorkers or multiprocessing.cpu_count()
+
+        if self.parallel == 'thread':
+            semaphore = threading.Semaphore(nWorkers)
+            self.Ainv = [
+                _ThreadFactor(
+                    self._kySolver(iky), As[iky], self.solverOpts, semaphore,
+                    RHSs[iky]
+                )
+                for iky in range(self.nky)
+            ]
+            for iky, Ainv in enumerate(self.Ainv):
+                f[Srcs, self._solutionType, iky] = Ainv.solution
+
+        elif self.parallel == 'process':
+            pool = multiprocessing.Pool(nWorkers)
+            try:
+                out = pool.map(_solveKy, list(zip(As, RHSs)))
+            finally:
+                pool.close()
+            for iky, u in enumerate(out):
+                f[Srcs, self._solutionType, iky] = u
+
+        else:
+            raise Exception("parallel should be None, 'thread' or 'process'")
+
+        return f
+
+
+def benchmarkKySolves(problem, m, nWorkers=None, parallel='thread'):
+    """
+        Time problem.fields(m) serially and on pools of increasing size and
+        print the speedup against the number of workers.
+
+        :param Problem2D_CC problem: paired problem
+        :param numpy.array m: model
+        :param list nWorkers: pool sizes, defaults to 1, 2, 4, ... up to the
+                              number of cores
+        :rtype: dict
+        :return: wall time (s) for each pool size, 0 being the serial run
+    """
+    if nWorkers is None:
+        ncpu = multiprocessing.cpu_count()
+        nWorkers = [2**i for i in range(int(np.log2(ncpu)) + 1)]
+
+    parallel0, nWorkers0 = problem.parallel, problem.nWorkers
+    times = {}
+    try:
+        for n in [0] + list(nWorkers):
+            problem.parallel = None if n == 0 else parallel
+            problem.nWorkers = n
+            t0 = time.time()
+            problem.fields(m)
+            times[n] = time.time() - t0
+    finally:
+        problem.parallel, problem.nWorkers = parallel0, nWorkers0
+
+    print("{:>8s} {:>10s} {:>8s}".format("workers", "time (s)", "speedup"))
+    for n in sorted(times):
+        print("{:>8s} {:10.3f} {:8.2f}".format(
+            "serial" if n == 0 else str(n), times[n], times[0]/times[n]
+        ))
+    return times
+
+
+def compareKySchemes(problem, m, kyTol=1e-2, kyRange=None, kysRef=None):
+    """
+        Compare the adaptive wavenumbers against the fixed SimPEG ones on
+        the survey paired with problem, and print the number of solves,
+        the wall time of survey.dpred(m) and the relative error of the data
+        against a reference scheme.
+
+        :param Problem2D_CC problem: paired problem
+        :param numpy.array m: model
+        :param float kyTol: tolerance of the adaptive scheme
+        :param tuple kyRange: (rmin, rmax), taken from the survey when None
+        :param numpy.array kysRef: wavenumbers of a dense trapezoidal
+                                   reference, solved 20 at a time; the
+                                   errors are taken against the fixed scheme
+                                   when None
+        :rtype: dict
+        :return: nky, time (s) and data of each scheme
+    """
+    kys0, w0 = problem.kys, problem.kyWeights
+    kyTol0, kyRange0 = problem.kyTol, problem.kyRange
+    schemes = [
+        ('fixed', None, DC.Problem2D_CC.kys),
+        ('adaptive', kyTol, None),
+    ]
+    if kysRef is not None:
+        schemes.append(('reference', None, kysRef))
+    out = {}
+    try:
+        for name, tol, kys in schemes:
+            problem.kyTol, problem.kyRange = tol, kyRange
+            t0 = time.time()
+            if name == 'reference':
+                # each chunk carries its share of the weights of the whole
+                # rule, so that the factorizations do not all stay in memory
+                w = getKyWeights(kys)
+                d = 0.
+                for i in range(0, kys.size, 20):
+                    problem.setKys(kys[i:i+20], w[i:i+20])
+                    d = d + problem.survey.dpred(m)
+            else:
+                if kys is not None:
+                    problem.setKys(kys)
+                d = problem.survey.dpred(m)
+            out[name] = {
+                'nky': problem.nky if kys is None else kys.size,
+                'time': time.time() - t0, 'dpred': d
+            }
+    finally:
+        problem.kyTol, problem.kyRange = kyTol0, kyRange0
+        problem.setKys(kys0, w0)
+
+    d0 = out['fixed' if kysRef is None else 'reference']['dpred']
+    print("{:>10s} {:>6s} {:>10s} {:>12s}".format(
+        "scheme", "nky", "time (s)", "max rel err"
+    ))
+    for name, _, _ in schemes:
+        err = np.abs(out[name]['dpred'] - d0).max() / np.abs(d0).max()
+        print("{:>10s} {:6d} {:10.3f} {:12.2e}".format(
+            name, out[name]['nky'], out[name]['time'], err
+        ))
+    return out
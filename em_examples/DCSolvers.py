@@ -0,0 +1,313 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import threading
+import time
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import linalg
+from SimPEG import Mesh, Maps, SolverLU
+from SimPEG.EM.Static import DC
+
+# Solver backends of the DC widgets.
+#
+# The widgets ask getDCSolver() for the solver class they give to their
+# problems (SolverLU unless setDCSolver chose another backend). SolverPCG
+# has the interface of the SimPEG solvers, Ainv = Solver(A) and
+# x = Ainv * b, but solves iteratively, so its memory use grows with the
+# number of non-zeros of A instead of those of its LU factors.
+#
+# On the 2D meshes of benchmarkDCSolvers (up to 336k cells) SolverLU is the
+# fastest: at 336k cells it takes 4.6 s for 474 MB of factors, PCG 6.7 s for
+# 306 MB of incomplete factors and PCG-Jacobi 35 s for 3 MB. Jacobi does not
+# converge on the strongly graded meshes of the widgets (cells of 0.5 m to
+# 16 km), where PCG does in about 10 iterations.
+
+
+# last solutions of SolverPCG, by (system, size of the system, right hand
+# side column), most recently used last: the widgets build a new problem and
+# solver on each callback, the store outlives them. The lock guards it for
+# the threads of a parallel problem.
+_lastSolutions = OrderedDict()
+_lastSolutionsLock = threading.Lock()
+maxLastSolutions = 64
+
+
+def clearLastSolutions():
+    """
+        Forget the last solutions the SolverPCG warm starts use
+    """
+    with _lastSolutionsLock:
+        _lastSolutions.clear()
+
+
+class SolverPCG(object):
+    """
+        Preconditioned iterative solver with the SimPEG solver interface
+
+        Symmetric systems with a diagonal of constant sign (the DC
+        operators) are solved with conjugate gradients, after a change of
+        sign if they are negative definite; other systems with BiCGSTAB,
+        which goes on with the Jacobi preconditioner when it does not
+        converge with the incomplete LU.
+
+        :param scipy.sparse.spmatrix A: system matrix
+        :param str precond: 'ilu' (incomplete LU) or 'jacobi'
+        :param float tol: relative tolerance on the residual
+        :param int maxiter: maximum number of iterations
+        :param bool warmStart: start the first solve from the last
+                               solution of the same system and right hand
+                               side column
+        :param system: identity of the system, e.g. (module, problem) for a
+                       widget, to which Problem2D_CC adds the wavenumber:
+                       the first solve of a solver (the fields of a model)
+                       starts from that of the previous solver of the same
+                       system. No warm start when None.
+        :param float dropTol: drop tolerance of the incomplete factorization
+    """
+
+    precond = 'ilu'
+    tol = 1e-8
+    maxiter = None
+    warmStart = True
+    system = None
+    dropTol = 1e-4
+    fillFactor = 20.
+
+    def __init__(self, A, **kwargs):
+        for key, value in kwargs.items():
+            if not hasattr(self, key):
+                raise Exception("SolverPCG has no option {}".format(key))
+            setattr(self, key, value)
+
+        # sorted, so that the iterations do not depend on the order of the
+        # entries of the caller's matrix
+        A = sp.csr_matrix(A).sorted_indices()
+        d = A.diagonal()
+        self.sign = -1. if (d < 0).all() else 1.
+        self.A = self.sign * A
+        symmetric = (
+            abs(A - A.T).max() <= 1e-12 * abs(A).max()
+        )
+        if symmetric and (self.sign * d > 0).all():
+            self.method = linalg.cg
+        else:
+            self.method = linalg.bicgstab
+
+        n = A.shape[0]
+        if self.precond == 'jacobi':
+            dinv = 1. / self.A.diagonal()
+            self.M = linalg.LinearOperator((n, n), matvec=lambda x: dinv * x)
+            self.nbytes = dinv.nbytes
+        elif self.precond == 'ilu' and self.method is linalg.cg:
+            # incomplete L D L^T without pivoting, CG needs a symmetric
+            # preconditioner
+            ilu = linalg.spilu(
+                self.A.tocsc(), drop_tol=self.dropTol,
+                fill_factor=self.fillFactor, permc_spec='NATURAL',
+                diag_pivot_thresh=0.
+            )
+            L = ilu.L.tocsr()
+            LT = L.T.tocsr()
+            D = ilu.U.diagonal()
+
+            def ldlt(r):
+                y = linalg.spsolve_triangular(
+                    L, r, lower=True, unit_diagonal=True
+                )
+                return linalg.spsolve_triangular(
+                    LT, y / D, lower=False, unit_diagonal=True
+                )
+
+            self.M = linalg.LinearOperator((n, n), matvec=ldlt)
+            self.nbytes = 12 * L.nnz + D.nbytes
+        elif self.precond == 'ilu':
+            ilu = linalg.spilu(
+                self.A.tocsc(), drop_tol=self.dropTol,
+                fill_factor=self.fillFactor
+            )
+            self.M = linalg.LinearOperator((n, n), matvec=ilu.solve)
+            self.nbytes = 12 * (ilu.L.nnz + ilu.U.nnz)
+        else:
+            raise Exception("precond should be 'ilu' or 'jacobi'")
+        self.nIterations = []
+        # only the first solve, the fields, is kept for the next solver:
+        # the later ones (sensitivities) have other right hand sides
+        self._fieldsSolved = False
+
+    def _iterate(self, b, x0, M):
+        niter = [0]
+
+        def count(xk):
+            niter[0] += 1
+
+        try:
+            x, info = self.method(
+                self.A, b, x0=x0, M=M, rtol=self.tol, maxiter=self.maxiter,
+                callback=count
+            )
+        except TypeError:
+            # scipy < 1.12
+            x, info = self.method(
+                self.A, b, x0=x0, M=M, tol=self.tol, maxiter=self.maxiter,
+                callback=count
+            )
+        return x, info, niter[0]
+
+    def _solve(self, b, icol, keep):
+        key = (self.system, self.A.shape[0], icol)
+        x0 = None
+        if keep:
+            with _lastSolutionsLock:
+                x0 = _lastSolutions.get(key)
+
+        x, info, niter = self._iterate(self.sign * b, x0, self.M)
+        if info != 0 and self.precond == 'ilu':
+            # BiCGSTAB breaks down with the incomplete LU of the large DC
+            # operators (which are not symmetric on a non uniform mesh),
+            # go on from its iterate with the Jacobi preconditioner
+            dinv = 1. / self.A.diagonal()
+            n = self.A.shape[0]
+            x, info, more = self._iterate(
+                self.sign * b, x,
+                linalg.LinearOperator((n, n), matvec=lambda x: dinv * x)
+            )
+            niter += more
+        if info != 0:
+            warnings.warn(
+                "SolverPCG did not converge to {:.1e} ({} iterations)".format(
+                    self.tol, niter
+                )
+            )
+        self.nIterations.append(niter)
+        if keep:
+            with _lastSolutionsLock:
+                _lastSolutions.pop(key, None)
+                _lastSolutions[key] = x
+                while len(_lastSolutions) > maxLastSolutions:
+                    _lastSolutions.popitem(last=False)
+        return x
+
+    def __mul__(self, b):
+        b = np.asarray(b)
+        keep = (
+            self.warmStart and self.system is not None and
+            not self._fieldsSolved
+        )
+        self._fieldsSolved = True
+        if b.ndim == 1:
+            return self._solve(b, 0, keep)
+        return np.column_stack(
+            [self._solve(b[:, i], i, keep) for i in range(b.shape[1])]
+        )
+
+    def clean(self):
+        self.M = None
+
+
+solverBackends = ['LU', 'PCG', 'PCG-Jacobi']
+
+_dcSolver = {'name': 'LU', 'opts': {}}
+
+
+def setDCSolver(name='LU', **opts):
+    """
+        Choose the solver of the DC widgets
+
+        :param str name: 'LU' (SuperLU, the default), 'PCG' (conjugate
+                         gradients with an incomplete LU preconditioner) or
+                         'PCG-Jacobi'
+        :param opts: options of SolverPCG (tol, maxiter, warmStart, ...)
+    """
+    if name not in solverBackends:
+        raise Exception(
+            "name should be one of {}".format(", ".join(solverBackends))
+        )
+    _dcSolver['name'] = name
+    _dcSolver['opts'] = opts
+
+
+def getDCSolver(name=None, system=None, **opts):
+    """
+        Solver class for a DC problem, problem.Solver = getDCSolver()
+
+        The backend chosen with setDCSolver is returned when name is None.
+        system identifies the system of the problem for the warm starts of
+        SolverPCG, e.g. getDCSolver(system=(__name__, 'total')) in a widget.
+    """
+    if name is None:
+        name, opts = _dcSolver['name'], dict(_dcSolver['opts'], **opts)
+    if system is not None:
+        opts = dict(opts, system=system)
+    if name == 'LU':
+        return SolverLU
+    if name == 'PCG-Jacobi':
+        opts = dict(opts, precond='jacobi')
+    elif name != 'PCG':
+        raise Exception(
+            "name should be one of {}".format(", ".join(solverBackends))
+        )
+    return type(str('SolverPCG'), (SolverPCG,), opts)
+
+
+def benchmarkDCSolvers(ncs=(50, 100, 200, 400), solvers=None, npad=10):
+    """
+        Time and memory of the DC solvers on 2D meshes of increasing size
+
+        A pole source on a halfspace is solved on an ncs x ncs/2 core mesh
+        with npad padding cells. The memory is that of the factors (LU) or
+        of the preconditioner (PCG), and the error is relative to SolverLU.
+
+        :param list ncs: numbers of core cells along x
+        :param list solvers: backends, defaults to all of solverBackends
+        :rtype: list
+        :return: one dict per mesh and solver
+    """
+    if solvers is None:
+        solvers = solverBackends
+    print("{:>8s} {:>12s} {:>10s} {:>12s} {:>10s}".format(
+        "nC", "solver", "time (s)", "memory (MB)", "rel error"
+    ))
+    results = []
+    for nc in ncs:
+        cs = 80. / nc
+        hx = [(cs, npad, -1.3), (cs, nc), (cs, npad, 1.3)]
+        hy = [(cs, npad, -1.3), (cs, nc//2)]
+        mesh = Mesh.TensorMesh([hx, hy], "CN")
+        rx = DC.Rx.Pole(mesh.gridCC)
+        src = DC.Src.Pole([rx], np.r_[0., 0.])
+
+        phiLU = None
+        for name in solvers:
+            survey = DC.Survey([src])
+            problem = DC.Problem3D_CC(mesh, sigmaMap=Maps.ExpMap(mesh))
+            problem.Solver = getDCSolver(name)
+            problem.pair(survey)
+            m = np.log(1e-2) * np.ones(mesh.nC)
+
+            t0 = time.time()
+            phi = survey.dpred(m)
+            elapsed = time.time() - t0
+
+            if name == 'LU':
+                lu = linalg.splu(sp.csc_matrix(problem.getA()))
+                nbytes = 12 * (lu.L.nnz + lu.U.nnz)
+                phiLU = phi
+            else:
+                nbytes = problem.Ainv.nbytes
+            error = np.nan if phiLU is None else (
+                np.linalg.norm(phi - phiLU) / np.linalg.norm(phiLU)
+            )
+            results.append({
+                'nC': mesh.nC, 'solver': name, 'time': elapsed,
+                'memory': nbytes / 1e6, 'error': error
+            })
+            print("{:8d} {:>12s} {:10.3f} {:12.2f} {:10.1e}".format(
+                mesh.nC, name, elapsed, nbytes / 1e6, error
+            ))
+    return results
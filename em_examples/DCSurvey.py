@@ -0,0 +1,298 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import numpy as np
+from scipy import sparse
+from scipy.spatial import Delaunay
+from SimPEG.EM.Static import DC
+
+# Vectorized generation of surface DC surveys along a line of electrodes.
+#
+# A survey is described by four integer arrays A, B, M, N indexing into the
+# electrode positions, one entry per datum; -1 stands for a remote electrode
+# (the B of a pole source or the N of a pole receiver). Data are ordered by
+# source, then by n-spacing.
+
+surveyTypes = [
+    'DipoleDipole', 'PoleDipole', 'DipolePole', 'PolePole',
+    'Wenner', 'Schlumberger'
+]
+
+
+def getSurveyIndices(nElec, surveyType="DipoleDipole", nmax=8):
+    """
+    A, B, M, N electrode indices of all the data of a survey
+
+    :param int nElec: number of electrodes on the line
+    :param str surveyType: one of 'DipoleDipole', 'PoleDipole', 'DipolePole',
+                           'PolePole', 'Wenner', 'Schlumberger'
+    :param int nmax: maximum n-spacing
+    :rtype: tuple
+    :return: A, B, M, N index arrays (-1 for a remote electrode) and n-spacing
+    """
+    i, n = np.meshgrid(
+        np.arange(nElec), np.arange(1, nmax+1), indexing='ij'
+    )
+    remote = -np.ones_like(i)
+
+    if surveyType == 'DipoleDipole':
+        A, B, M, N = i, i+1, i+1+n, i+2+n
+    elif surveyType == 'PoleDipole':
+        A, B, M, N = i, remote, i+n, i+n+1
+    elif surveyType == 'DipolePole':
+        A, B, M, N = i, i+1, i+1+n, remote
+    elif surveyType == 'PolePole':
+        # M skips the electrode next to A, as in the pole-pole widgets
+        A, B, M, N = i, remote, i+1+n, remote
+    elif surveyType == 'Wenner':
+        A, B, M, N = i, i+3*n, i+n, i+2*n
+    elif surveyType == 'Schlumberger':
+        A, B, M, N = i, i+2*n+1, i+n, i+n+1
+    else:
+        raise Exception(
+            "surveyType should be one of {}".format(", ".join(surveyTypes))
+        )
+
+    valid = np.maximum(np.maximum(A, B), np.maximum(M, N)) < nElec
+    return A[valid], B[valid], M[valid], N[valid], n[valid]
+
+
+def _electrodeLocs(electrodes, ind, remoteLoc):
+    locs = electrodes[np.maximum(ind, 0)]
+    if remoteLoc is None:
+        locs[ind < 0] = np.inf
+    else:
+        locs[ind < 0] = remoteLoc
+    return locs
+
+
+def _asLocations(loc):
+    """
+    Electrode locations as an (n, dim) array, 1D arrays (and scalars) being
+    x positions, None a remote electrode
+    """
+    if loc is None:
+        return None
+    loc = np.asarray(loc, dtype=float)
+    if loc.ndim < 2:
+        loc = loc.reshape((-1, 1))
+    return loc
+
+
+def getGeometricFactor(locA, locB, locM, locN, eps=1e-9):
+    """
+    Halfspace geometric factor G of a set of four electrode arrays, such
+    that rho_a = 2 pi G (VM - VN) / I.
+
+    Locations are (nD, dim) arrays, of any dimension (e.g. 3D electrodes on
+    topography), or 1D arrays of x positions; a single location broadcasts
+    against the others. Remote electrodes are given as None or infinite
+    locations and their terms drop out.
+
+    :param numpy.array locA: locations of the A electrodes
+    :param numpy.array locB: locations of the B electrodes
+    :param numpy.array locM: locations of the M electrodes
+    :param numpy.array locN: locations of the N electrodes
+    :param float eps: stabilizes the division for coincident electrodes
+    :rtype: numpy.array
+    :return: geometric factors, a float if all the inputs are scalars
+    """
+    scalar = all(
+        loc is None or np.ndim(loc) == 0 for loc in [locA, locB, locM, locN]
+    )
+
+    def invDist(loc1, loc2):
+        if loc1 is None or loc2 is None:
+            return 0.
+        with np.errstate(invalid='ignore'):
+            r = np.sqrt(((loc1 - loc2)**2).sum(axis=1))
+        r[~np.isfinite(r)] = np.inf
+        return 1. / (r + eps)
+
+    locA, locB, locM, locN = [
+        _asLocations(loc) for loc in [locA, locB, locM, locN]
+    ]
+    G = 1. / (
+        invDist(locA, locM) - invDist(locB, locM) -
+        invDist(locA, locN) + invDist(locB, locN)
+    )
+    return G[0] if scalar else G
+
+
+def getApparentResistivity(VM, VN, locA, locB, locM, locN, eps=1e-9):
+    """
+    Apparent resistivities 2 pi G (VM - VN) of a set of four electrode
+    arrays, for a unit current (see getGeometricFactor for the locations).
+    VN is ignored when N is a remote (None) electrode.
+    """
+    if locN is None:
+        VN = 0.
+    G = getGeometricFactor(locA, locB, locM, locN, eps=eps)
+    return (np.asarray(VM) - np.asarray(VN)) * 2. * np.pi * G
+
+
+# electrodes used by the array types of the DC widgets
+_widgetArrays = {
+    'Dipole-Dipole': (True, True),
+    'Pole-Dipole': (False, True),
+    'Dipole-Pole': (True, False),
+    'Pole-Pole': (False, False),
+}
+
+
+def calculateRhoA(survey, VM, VN, A, B, M, N):
+    """
+    Apparent resistivity for the array types of the DC widgets
+    ('Dipole-Dipole', 'Pole-Dipole', 'Dipole-Pole', 'Pole-Pole'), the
+    electrode positions A, B, M, N being x positions (scalars or arrays)
+    """
+    if survey not in _widgetArrays:
+        raise Exception(
+            "survey should be one of {}".format(", ".join(_widgetArrays))
+        )
+    hasB, hasN = _widgetArrays[survey]
+    return getApparentResistivity(
+        VM, VN, A, B if hasB else None, M, N if hasN else None
+    )
+
+
+def getSurveyGeometry(
+    electrodes, surveyType="DipoleDipole", nmax=8, remoteB=None, remoteN=None
+):
+    """
+    Electrode indices, pseudo-locations and geometric factors of a survey,
+    computed in one pass
+
+    The pseudo-location of a datum is halfway between the midpoints of its
+    transmitter (A, B) and receiver (M, N) electrodes, as the pseudo-section
+    widgets draw it, remote electrodes left out. (The getPseudoLocs of the
+    widgets took the receiver one electrode before M for the dipole-dipole,
+    dipole-pole and pole-pole arrays, half a spacing short of its data.)
+
+    :param numpy.array electrodes: (nElec, dim) electrode locations, or the
+                                   electrode x positions
+    :param str surveyType: see getSurveyIndices
+    :param int nmax: maximum n-spacing
+    :param numpy.array remoteB: location of the remote current electrode,
+                                infinite when None
+    :param numpy.array remoteN: location of the remote potential electrode,
+                                infinite when None
+    :rtype: dict
+    :return: A, B, M, N indices, n-spacing, pseudo-locations (x, n) and
+             geometric factors G
+    """
+    electrodes = np.asarray(electrodes, dtype=float)
+    if electrodes.ndim == 1:
+        electrodes = electrodes[:, None]
+
+    A, B, M, N, n = getSurveyIndices(electrodes.shape[0], surveyType, nmax)
+
+    locA = electrodes[A]
+    locB = _electrodeLocs(electrodes, B, remoteB)
+    locM = electrodes[M]
+    locN = _electrodeLocs(electrodes, N, remoteN)
+
+    x = electrodes[:, 0]
+    txmid = np.where(B < 0, x[A], 0.5*(x[A] + x[np.maximum(B, 0)]))
+    rxmid = np.where(N < 0, x[M], 0.5*(x[M] + x[np.maximum(N, 0)]))
+
+    G = getGeometricFactor(locA, locB, locM, locN)
+
+    return {
+        'A': A, 'B': B, 'M': M, 'N': N, 'n': n,
+        'locA': locA, 'locB': locB, 'locM': locM, 'locN': locN,
+        'xzlocs': np.c_[0.5*(txmid + rxmid), n.astype(float)],
+        'G': G,
+    }
+
+
+def makeSourceList(geometry, poles=False):
+    """
+    SimPEG sources for a survey geometry from getSurveyGeometry
+
+    The data are split into sources where the (A, B) pair changes, and each
+    source gets a single receiver holding all of its M, N locations.
+
+    :param dict geometry: output of getSurveyGeometry
+    :param bool poles: use DC.Src.Pole / DC.Rx.Pole for remote electrodes
+                       instead of dipoles to the remote locations
+    """
+    A, B, N = geometry['A'], geometry['B'], geometry['N']
+    locA, locB = geometry['locA'], geometry['locB']
+    locM, locN = geometry['locM'], geometry['locN']
+
+    newSrc = np.r_[True, (np.diff(A) != 0) | (np.diff(B) != 0)]
+    bounds = np.r_[np.where(newSrc)[0], A.size]
+
+    srcList = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if poles and N[start] < 0:
+            rx = DC.Rx.Pole(locM[start:end])
+        else:
+            rx = DC.Rx.Dipole(locM[start:end], locN[start:end])
+        if poles and B[start] < 0:
+            src = DC.Src.Pole([rx], locA[start])
+        else:
+            src = DC.Src.Dipole([rx], locA[start], locB[start])
+        srcList.append(src)
+    return srcList
+
+
+class PseudoSectionGrid(object):
+    """
+    Linear interpolation of data at pseudo-locations onto a regular grid,
+    as griddata(xzlocs, d, (xi, yi), method='linear') does, but with the
+    Delaunay triangulation and the barycentric weights computed once.
+    Gridding a new set of data is then a sparse matrix-vector product.
+
+    :param numpy.array xzlocs: (nD, 2) pseudo-locations
+    :param numpy.array xi: x of the grid points
+    :param numpy.array yi: y of the grid points, same shape as xi
+    """
+
+    def __init__(self, xzlocs, xi, yi):
+        self.shape = xi.shape
+        pts = np.c_[xi.ravel(), yi.ravel()]
+        tri = Delaunay(xzlocs)
+        simplex = tri.find_simplex(pts)
+        self.inside = simplex >= 0
+
+        T = tri.transform[simplex[self.inside]]
+        b = np.einsum('ijk,ik->ij', T[:, :2], pts[self.inside] - T[:, 2])
+        bary = np.c_[b, 1. - b.sum(axis=1)]
+        rows = np.repeat(np.where(self.inside)[0], 3)
+        cols = tri.simplices[simplex[self.inside]].ravel()
+        self.W = sparse.csr_matrix(
+            (bary.ravel(), (rows, cols)), shape=(pts.shape[0], len(xzlocs))
+        )
+
+    def __call__(self, d):
+        """
+        Data d gridded, NaN outside of the convex hull of the
+        pseudo-locations
+        """
+        out = self.W * np.asarray(d, dtype=float)
+        out[~self.inside] = np.nan
+        return out.reshape(self.shape)
+
+
+_pseudoSectionGrids = {}
+
+
+def gridPseudoSection(xzlocs, d, xi, yi):
+    """
+    Grid the data d at the pseudo-locations xzlocs onto (xi, yi), reusing
+    the interpolation weights of the last few surveys and grids
+    """
+    xzlocs = np.asarray(xzlocs, dtype=float)
+    key = (
+        xzlocs.shape, hash(xzlocs.tobytes()),
+        xi.shape, hash(np.asarray(xi).tobytes()), hash(np.asarray(yi).tobytes())
+    )
+    if key not in _pseudoSectionGrids:
+        if len(_pseudoSectionGrids) >= 8:
+            _pseudoSectionGrids.clear()
+        _pseudoSectionGrids[key] = PseudoSectionGrid(xzlocs, xi, yi)
+    return _pseudoSectionGrids[key](d)
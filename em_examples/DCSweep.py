@@ -0,0 +1,237 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+
+import numpy as np
+
+# Parametric sweeps of the DC forward models of the widgets.
+#
+# Every combination of the swept parameters is run on a pool of worker
+# processes. A worker imports the widget module once, so its mesh (and the
+# operators SimPEG caches on it) is built once per worker and reused by all
+# the runs that worker gets. Results are written as they arrive to .npy
+# arrays in a store directory, next to a mask of the runs done, so an
+# interrupted sweep picks up where it stopped when run again.
+
+# forward models that can be swept: module, function, positions of the
+# total and primary (halfspace) fields in the returned tuple and name of
+# the halfspace conductivity argument
+sweepModels = {
+    'cylinder': ('DC_cylinder', 'cylinder_fields', 3, 4, 'sighalf'),
+    'plate': ('DCWidgetPlate2_5D', 'plate_fields', 4, 3, 'sighalf'),
+    'layer': ('DCWidgetResLayer2_5D', 'model_fields', 4, 3, 'sigHalf'),
+    'plate2D': ('DCWidgetPlate_2D', 'plate_fields', 4, 3, 'sighalf'),
+    'layer2D': ('DCWidgetResLayer2D', 'model_fields', 4, 3, 'sigHalf'),
+}
+
+
+def getSweepParameters(**params):
+    """
+    All the combinations of the given parameter arrays
+
+    :rtype: tuple
+    :return: parameter names and (nRun, nParam) array of values
+    """
+    names = sorted(params)
+    values = np.array(
+        list(itertools.product(*[np.atleast_1d(params[n]) for n in names])),
+        dtype=float
+    )
+    return names, values.reshape((-1, len(names)))
+
+
+def _getModule(model):
+    if model not in sweepModels:
+        raise Exception(
+            "model should be one of {}".format(", ".join(sorted(sweepModels)))
+        )
+    return importlib.import_module('.' + sweepModels[model][0], __package__)
+
+
+def _surfaceData(model, kwargs, out):
+    """
+        Potentials of the total field at the electrodes of the widget and
+        apparent resistivities of consecutive electrode pairs
+
+        As in the widgets, the apparent resistivity is the halfspace
+        resistivity times the ratio of the total to the primary potential
+        differences. The 3D geometric factor would not hold for the 2D
+        (line source) models.
+    """
+    module = _getModule(model)
+    mesh, xr = module.mesh, module.xr
+    src = out[2]
+    surface = np.arange(mesh.nCx) + (mesh.nCy - 1) * mesh.nCx
+
+    def electrodePotentials(field):
+        phi = field['phi'] if isinstance(field, dict) else field[src, 'phi']
+        phi = np.asarray(phi).ravel()[surface]
+        return np.interp(xr, mesh.vectorCCx, phi)
+
+    V = electrodePotentials(out[sweepModels[model][2]])
+    Vprim = electrodePotentials(out[sweepModels[model][3]])
+    rhohalf = 1. / kwargs[sweepModels[model][4]]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rhoa = rhohalf * np.diff(V) / np.diff(Vprim)
+    return V, rhoa
+
+
+def _runOne(args):
+    """
+        Run one forward model, in a worker process
+    """
+    model, i, kwargs = args
+    module = _getModule(model)
+    fwd = getattr(module, sweepModels[model][1])
+    out = fwd(**kwargs)
+    V, rhoa = _surfaceData(model, kwargs, out)
+    return i, V, rhoa
+
+
+def _openStore(store, model, names, values, fixed, nElec):
+    # round trip through json so that it compares with a loaded one
+    meta = json.loads(json.dumps(
+        {'model': model, 'names': names, 'fixed': fixed, 'nElec': nElec},
+        default=lambda x: np.asarray(x).tolist()
+    ))
+    paramFile = os.path.join(store, 'params.npy')
+    metaFile = os.path.join(store, 'meta.json')
+    open_memmap = np.lib.format.open_memmap
+
+    nRun = values.shape[0]
+    shapes = {
+        'done': ((nRun,), bool),
+        'V': ((nRun, nElec), np.float32),
+        'rhoa': ((nRun, nElec - 1), np.float32),
+    }
+    arrayFiles = dict(
+        (name, os.path.join(store, name + '.npy')) for name in shapes
+    )
+
+    if os.path.exists(metaFile):
+        with open(metaFile) as f:
+            meta0 = json.load(f)
+        if meta0 != meta or not np.array_equal(
+            np.load(paramFile), values
+        ):
+            raise Exception(
+                "{} holds a different sweep, use a new store".format(store)
+            )
+        # an array lost since would leave done out of step with the data,
+        # all the runs are then done again
+        resume = all(os.path.exists(f) for f in arrayFiles.values())
+    else:
+        if not os.path.isdir(store):
+            os.makedirs(store)
+        resume = False
+
+    arrays = {}
+    for name, (shape, dtype) in shapes.items():
+        arrays[name] = open_memmap(
+            arrayFiles[name], mode='r+' if resume else 'w+', dtype=dtype,
+            shape=shape
+        )
+
+    # the sweep is written last, so that a store interrupted while it is
+    # created is started again rather than resumed without its arrays
+    if not os.path.exists(metaFile):
+        np.save(paramFile, values)
+        with open(metaFile + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.rename(metaFile + '.tmp', metaFile)
+    return arrays
+
+
+def runSweep(model, store, params, fixed=None, nWorkers=None, verbose=True):
+    """
+    Run a forward model for all the combinations of params and stream the
+    surface potentials and apparent resistivities to store
+
+    :param str model: one of sweepModels ('cylinder', 'plate', 'layer',
+                      'plate2D', 'layer2D')
+    :param str store: directory of the results, an existing store of the
+                      same sweep is resumed
+    :param dict params: arrays of values of the swept arguments of the
+                        forward function, e.g. {'r': ..., 'zc': ...}
+    :param dict fixed: the other arguments of the forward function, A and B
+                       included (B=[] for a pole source)
+    :param int nWorkers: number of processes, defaults to the number of
+                         cores; 0 runs in the current process
+    :rtype: dict
+    :return: parameter names and values, and the memory mapped done, V
+             (electrode potentials) and rhoa (apparent resistivities of
+             consecutive electrode pairs) arrays
+    """
+    fixed = dict(fixed or {})
+    if 'A' not in fixed or 'B' not in fixed:
+        raise Exception("fixed should give the electrodes A and B")
+
+    names, values = getSweepParameters(**params)
+    nElec = _getModule(model).xr.size
+    arrays = _openStore(store, model, names, values, fixed, nElec)
+    done = arrays['done']
+
+    todo = [
+        (model, i, dict(fixed, **dict(zip(names, values[i]))))
+        for i in np.where(~done)[0]
+    ]
+    if verbose:
+        print(">> {} runs, {} left".format(values.shape[0], len(todo)))
+
+    if nWorkers is None:
+        nWorkers = multiprocessing.cpu_count()
+
+    if nWorkers == 0:
+        results = (_runOne(args) for args in todo)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(nWorkers)
+        results = pool.imap_unordered(_runOne, todo)
+
+    try:
+        for n, (i, V, rhoa) in enumerate(results):
+            arrays['V'][i] = V
+            arrays['rhoa'][i] = rhoa
+            arrays['V'].flush()
+            arrays['rhoa'].flush()
+            # only flagged once its results are on disk
+            done[i] = True
+            done.flush()
+            if verbose:
+                print("\r>> {}/{}".format(n + 1, len(todo)), end='')
+    except BaseException:
+        if pool is not None:
+            pool.terminate()
+        raise
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    if verbose and todo:
+        print()
+
+    out = {'names': names, 'params': values}
+    out.update(arrays)
+    return out
+
+
+def loadSweep(store):
+    """
+    Results of a sweep written by runSweep
+    """
+    with open(os.path.join(store, 'meta.json')) as f:
+        meta = json.load(f)
+    out = {
+        'names': meta['names'],
+        'params': np.load(os.path.join(store, 'params.npy')),
+    }
+    for name in ['done', 'V', 'rhoa']:
+        out[name] = np.load(os.path.join(store, name + '.npy'), mmap_mode='r')
+    return out
@@ -2,7 +2,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-from SimPEG import Mesh, Maps, SolverLU, Utils
+from SimPEG import Mesh, Maps, Utils
 from SimPEG.Utils import ExtractCoreMesh
 import numpy as np
 from SimPEG.EM.Static import DC
@@ -10,7 +10,6 @@ import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.pylab as pylab
 from matplotlib.ticker import LogFormatter
-from matplotlib.path import Path
 import matplotlib.patches as patches
 from scipy.constants import epsilon_0
 from scipy.ndimage.measurements import center_of_mass
@@ -21,6 +20,13 @@ import warnings
 # ignore warnings: only use this once you are sure things are working
 warnings.filterwarnings('ignore')
 from .Base import widgetify
+from .DCSolvers import getDCSolver
+from .DCSurvey import calculateRhoA
+from .DCProblem2D import Problem2D_CC
+from .ModelBuilder import getIndicesPlate
+
+from . import _set_rcParams
+_set_rcParams()
 
 # Mesh, mapping can be globals global
 npad = 15
@@ -47,7 +53,7 @@ indy = (mesh.gridFy[:, 0] >= xmin) & (mesh.gridFy[:, 0] <= xmax) \
 indF = np.concatenate((indx, indy))
 
 
-def plate_fields(A, B, dx, dz, xc, zc, rotAng, sigplate, sighalf):
+def plate_fields(A, B, dx, dz, xc, zc, rotAng, sigplate, sighalf, kyTol=None):
     # Create halfspace model
     mhalf = np.log(sighalf * np.ones([mesh.nC, ]))
     # mhalf = sighalf*np.ones([mesh.nC,])
@@ -69,11 +75,20 @@ def plate_fields(A, B, dx, dz, xc, zc, rotAng, sigplate, sighalf):
     # survey_prim = DC.Survey([src])
     survey_prim = DC.Survey_ky([src])
     #problem = DC.Problem3D_CC(mesh, sigmaMap = mapping)
-    problem = DC.Problem2D_CC(mesh, sigmaMap=mapping)
+    # kyTol switches to adaptive wavenumbers chosen for the core region,
+    # the cells next to an electrode need wavenumbers well above 1/cs
+    kyRange = (cs/8., np.sqrt((xmax-xmin)**2 + (ymax-ymin)**2))
+    problem = Problem2D_CC(
+        mesh, sigmaMap=mapping, parallel='thread', kyTol=kyTol,
+        kyRange=kyRange
+    )
     # problem_prim = DC.Problem3D_CC(mesh, sigmaMap = mapping)
-    problem_prim = DC.Problem2D_CC(mesh, sigmaMap=mapping)
-    problem.Solver = SolverLU
-    problem_prim.Solver = SolverLU
+    problem_prim = Problem2D_CC(
+        mesh, sigmaMap=mapping, parallel='thread', kyTol=kyTol,
+        kyRange=kyRange
+    )
+    problem.Solver = getDCSolver(system=(__name__, 'total'))
+    problem_prim.Solver = getDCSolver(system=(__name__, 'primary'))
     problem.pair(survey)
     problem_prim.pair(survey_prim)
 
@@ -113,40 +128,8 @@ def getPlateCorners(xc, zc, dx, dz, rotAng):
 
 
 def createPlateMod(xc, zc, dx, dz, rotAng, sigplate, sighalf):
-    # use matplotlib paths to find CC inside of polygon
-    plateCorners = getPlateCorners(xc, zc, dx, dz, rotAng)
-
-    verts = [
-        (plateCorners[0, :]),  # left, top
-        (plateCorners[1, :]),  # right, top
-        (plateCorners[3, :]),  # right, bottom
-        (plateCorners[2, :]),  # left, bottom
-        (plateCorners[0, :]),  # left, top (closes polygon)
-    ]
-
-    codes = [Path.MOVETO,
-             Path.LINETO,
-             Path.LINETO,
-             Path.LINETO,
-             Path.CLOSEPOLY,
-             ]
-
-    path = Path(verts, codes)
-    CCLocs = mesh.gridCC
-    insideInd = np.where(path.contains_points(CCLocs))
-
-    # Check selected cell centers by plotting
-    # print insideInd
-    # fig = plt.figure()
-    # ax = fig.add_subplot(111)
-    # patch = patches.PathPatch(path, facecolor='none', lw=2)
-    # ax.add_patch(patch)
-    # plt.scatter(CCLocs[insideInd,0],CCLocs[insideInd,1])
-    # ax.set_xlim(-10,10)
-    # ax.set_ylim(-20,0)
-    # plt.axes().set_aspect('equal')
-    # plt.show()
 
+    insideInd = getIndicesPlate(mesh, xc, zc, dx, dz, rotAng)
     mtrue = sighalf * np.ones([mesh.nC, ])
     mtrue[insideInd] = sigplate
     mtrue = np.log(mtrue)
@@ -175,37 +158,10 @@ def get_Surface_Potentials(survey, src, field_obj):
 
 
 def sumPlateCharges(xc, zc, dx, dz, rotAng, qSecondary):
-    # plateCorners = getPlateCorners(xc,zc,dx,dz,rotAng)
-    chargeRegionCorners = getPlateCorners(xc, zc, dx + 1., dz + 1., rotAng)
-
-    # plateVerts = [
-    #     (plateCorners[0,:]), # left, top
-    #     (plateCorners[1,:]), # right, top
-    #     (plateCorners[3,:]), # right, bottom
-    #     (plateCorners[2,:]), # left, bottom
-    #     (plateCorners[0,:]), # left, top (closes polygon)
-    #     ]
-
-    chargeRegionVerts = [
-        (chargeRegionCorners[0, :]),  # left, top
-        (chargeRegionCorners[1, :]),  # right, top
-        (chargeRegionCorners[3, :]),  # right, bottom
-        (chargeRegionCorners[2, :]),  # left, bottom
-        (chargeRegionCorners[0, :]),  # left, top (closes polygon)
-    ]
-
-    codes = [Path.MOVETO,
-             Path.LINETO,
-             Path.LINETO,
-             Path.LINETO,
-             Path.CLOSEPOLY,
-             ]
-
-    # platePath = Path(plateVerts, codes)
-    chargeRegionPath = Path(chargeRegionVerts, codes)
     CCLocs = mesh.gridCC
-    # plateInsideInd = np.where(platePath.contains_points(CCLocs))
-    chargeRegionInsideInd = np.where(chargeRegionPath.contains_points(CCLocs))
+    chargeRegionInsideInd = getIndicesPlate(
+        mesh, xc, zc, dx + 1., dz + 1., rotAng
+    )
 
     plateChargeLocs = CCLocs[chargeRegionInsideInd]
     plateCharge = qSecondary[chargeRegionInsideInd]
@@ -265,8 +221,8 @@ def getSensitivity(survey, A, B, M, N, model):
         src = DC.Src.Pole([rx], np.r_[A, 0.])
 
     survey = DC.Survey_ky([src])
-    problem = DC.Problem2D_CC(mesh, sigmaMap=mapping)
-    problem.Solver = SolverLU
+    problem = Problem2D_CC(mesh, sigmaMap=mapping, parallel='thread')
+    problem.Solver = getDCSolver(system=(__name__, 'sensitivity'))
     problem.pair(survey)
     fieldObj = problem.fields(model)
 
@@ -275,27 +231,6 @@ def getSensitivity(survey, A, B, M, N, model):
     return J
 
 
-def calculateRhoA(survey, VM, VN, A, B, M, N):
-
-    eps = 1e-9  # to stabilize division
-
-    if(survey == "Dipole-Dipole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(M - B) + eps) -
-                  1. / (np.abs(N - A) + eps) + 1. / (np.abs(N - B) + eps))
-        rho_a = (VM - VN) * 2. * np.pi * G
-    elif(survey == "Pole-Dipole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(N - A) + eps))
-        rho_a = (VM - VN) * 2. * np.pi * G
-    elif(survey == "Dipole-Pole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(M - B) + eps))
-        rho_a = (VM) * 2. * np.pi * G
-    elif(survey == "Pole-Pole"):
-        G = 1. / (1. / (np.abs(A - M) + eps))
-        rho_a = (VM) * 2. * np.pi * G
-
-    return rho_a
-
-
 def PLOT(survey, A, B, M, N, dx, dz, xc, zc, rotAng, rhohalf, rhoplate, Field, Type, Scale):
 
     labelsize = 16.
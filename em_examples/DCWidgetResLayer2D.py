@@ -2,7 +2,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-from SimPEG import Mesh, Maps, SolverLU, Utils
+from SimPEG import Mesh, Maps, Utils
 from SimPEG.Utils import ExtractCoreMesh
 import numpy as np
 from SimPEG.EM.Static import DC
@@ -10,7 +10,6 @@ import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.pylab as pylab
 from matplotlib.ticker import LogFormatter
-from matplotlib.path import Path
 import matplotlib.patches as patches
 from scipy.constants import epsilon_0
 import copy
@@ -18,6 +17,12 @@ import copy
 from ipywidgets import interact, IntSlider, FloatSlider, FloatText, ToggleButtons
 
 from .Base import widgetify
+from .DCSolvers import getDCSolver
+from .DCSurvey import calculateRhoA
+from .ModelBuilder import getIndicesCircle, getIndicesLayer
+
+from . import _set_rcParams
+_set_rcParams()
 
 # Mesh, sigmaMap can be globals global
 npad = 15
@@ -66,8 +71,8 @@ def model_fields(A, B, zcLayer, dzLayer, xc, zc, r, sigLayer, sigTarget, sigHalf
 
     problem = DC.Problem3D_CC(mesh, sigmaMap=sigmaMap)
     problem_prim = DC.Problem3D_CC(mesh, sigmaMap=sigmaMap)
-    problem.Solver = SolverLU
-    problem_prim.Solver = SolverLU
+    problem.Solver = getDCSolver(system=(__name__, 'total'))
+    problem_prim.Solver = getDCSolver(system=(__name__, 'primary'))
     problem.pair(survey)
     problem_prim.pair(survey_prim)
 
@@ -80,25 +85,8 @@ def model_fields(A, B, zcLayer, dzLayer, xc, zc, r, sigLayer, sigTarget, sigHalf
 
 def addLayer2Mod(zcLayer, dzLayer, modd, sigLayer):
 
-    CCLocs = mesh.gridCC
     mod = copy.copy(modd)
-
-    zmax = zcLayer + dzLayer / 2.
-    zmin = zcLayer - dzLayer / 2.
-
-    belowInd = np.where(CCLocs[:, 1] <= zmax)[0]
-    aboveInd = np.where(CCLocs[:, 1] >= zmin)[0]
-    layerInds = list(set(belowInd).intersection(aboveInd))
-
-    # # Check selected cell centers by plotting
-    # fig = plt.figure()
-    # ax = fig.add_subplot(111)
-    # plt.scatter(CCLocs[layerInds,0],CCLocs[layerInds,1])
-    # ax.set_xlim(-40,40)
-    # ax.set_ylim(-35,0)
-    # plt.axes().set_aspect('equal')
-    # plt.show()
-
+    layerInds = getIndicesLayer(mesh, zcLayer, dzLayer)
     mod[layerInds] = sigLayer
     return mod
 
@@ -126,38 +114,8 @@ def getCylinderPoints(xc, zc, r):
 
 def addCylinder2Mod(xc, zc, r, modd, sigCylinder):
 
-    # Get points for cylinder outline
-    cylinderPoints = getCylinderPoints(xc, zc, r)
     mod = copy.copy(modd)
-
-    verts = []
-    codes = []
-    for ii in range(0, cylinderPoints.shape[0]):
-        verts.append(cylinderPoints[ii, :])
-
-        if(ii == 0):
-            codes.append(Path.MOVETO)
-        elif(ii == cylinderPoints.shape[0] - 1):
-            codes.append(Path.CLOSEPOLY)
-        else:
-            codes.append(Path.LINETO)
-
-    path = Path(verts, codes)
-    CCLocs = mesh.gridCC
-    insideInd = np.where(path.contains_points(CCLocs))
-
-    # #Check selected cell centers by plotting
-    # # print insideInd
-    # fig = plt.figure()
-    # ax = fig.add_subplot(111)
-    # patch = patches.PathPatch(path, facecolor='none', lw=2)
-    # ax.add_patch(patch)
-    # plt.scatter(CCLocs[insideInd,0],CCLocs[insideInd,1])
-    # ax.set_xlim(-40,40)
-    # ax.set_ylim(-35,0)
-    # plt.axes().set_aspect('equal')
-    # plt.show()
-
+    insideInd = getIndicesCircle(mesh, xc, zc, r)
     mod[insideInd] = sigCylinder
     return mod
 
@@ -234,15 +192,8 @@ def get_Surface_Potentials(survey, src, field_obj):
 
 
 def sumCylinderCharges(xc, zc, r, qSecondary):
-    chargeRegionVerts = getCylinderPoints(xc, zc, r + 0.5)
-
-    codes = chargeRegionVerts.shape[0] * [Path.LINETO]
-    codes[0] = Path.MOVETO
-    codes[-1] = Path.CLOSEPOLY
-
-    chargeRegionPath = Path(chargeRegionVerts, codes)
     CCLocs = mesh.gridCC
-    chargeRegionInsideInd = np.where(chargeRegionPath.contains_points(CCLocs))
+    chargeRegionInsideInd = getIndicesCircle(mesh, xc, zc, r + 0.5)
 
     plateChargeLocs = CCLocs[chargeRegionInsideInd]
     plateCharge = qSecondary[chargeRegionInsideInd]
@@ -301,7 +252,7 @@ def getSensitivity(survey, A, B, M, N, model):
 
     survey = DC.Survey([src])
     problem = DC.Problem3D_CC(mesh, sigmaMap=sigmaMap)
-    problem.Solver = SolverLU
+    problem.Solver = getDCSolver(system=(__name__, 'sensitivity'))
     problem.pair(survey)
     fieldObj = problem.fields(model)
 
@@ -310,26 +261,6 @@ def getSensitivity(survey, A, B, M, N, model):
     return J
 
 
-def calculateRhoA(survey, VM, VN, A, B, M, N):
-
-    eps = 1e-9  # to stabilize division
-
-    if(survey == "Dipole-Dipole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(M - B) + eps) -
-                  1. / (np.abs(N - A) + eps) + 1. / (np.abs(N - B) + eps))
-        rho_a = (VM - VN) * 2. * np.pi * G
-    elif(survey == "Pole-Dipole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(N - A) + eps))
-        rho_a = (VM - VN) * 2. * np.pi * G
-    elif(survey == "Dipole-Pole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(M - B) + eps))
-        rho_a = (VM) * 2. * np.pi * G
-    elif(survey == "Pole-Pole"):
-        G = 1. / (1. / (np.abs(A - M) + eps))
-        rho_a = (VM) * 2. * np.pi * G
-
-    return rho_a
-
 # Inline functions for computing apparent resistivity
 # eps = 1e-9 #to stabilize division
 # G = lambda A, B, M, N: 1. / ( 1./(np.abs(A-M)+eps) - 1./(np.abs(M-B)+eps) - 1./(np.abs(N-A)+eps) + 1./(np.abs(N-B)+eps) )
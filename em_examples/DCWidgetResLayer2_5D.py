@@ -2,7 +2,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-from SimPEG import Mesh, Maps, SolverLU, Utils
+from SimPEG import Mesh, Maps, Utils
 from SimPEG.Utils import ExtractCoreMesh
 import numpy as np
 from SimPEG.EM.Static import DC
@@ -10,7 +10,6 @@ import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.pylab as pylab
 from matplotlib.ticker import LogFormatter
-from matplotlib.path import Path
 import matplotlib.patches as patches
 from scipy.constants import epsilon_0
 import copy
@@ -18,6 +17,13 @@ import copy
 from ipywidgets import interact, IntSlider, FloatSlider, FloatText, ToggleButtons
 
 from .Base import widgetify
+from .DCSolvers import getDCSolver
+from .DCSurvey import calculateRhoA
+from .DCProblem2D import Problem2D_CC
+from .ModelBuilder import getIndicesCircle, getIndicesLayer, getIndicesPlate
+
+from . import _set_rcParams
+_set_rcParams()
 
 # Mesh, sigmaMap can be globals global
 npad = 15
@@ -46,7 +52,7 @@ indy = (mesh.gridFy[:, 0] >= xmin) & (mesh.gridFy[:, 0] <= xmax) \
 indF = np.concatenate((indx, indy))
 
 
-def model_fields(A, B, zcLayer, dzLayer, xc, zc, r, sigLayer, sigTarget, sigHalf):
+def model_fields(A, B, zcLayer, dzLayer, xc, zc, r, sigLayer, sigTarget, sigHalf, kyTol=None):
     # Create halfspace model
     halfspaceMod = sigHalf * np.ones([mesh.nC, ])
     mhalf = np.log(halfspaceMod)
@@ -73,11 +79,20 @@ def model_fields(A, B, zcLayer, dzLayer, xc, zc, r, sigLayer, sigTarget, sigHalf
     # survey_prim = DC.Survey([src])
     survey_prim = DC.Survey_ky([src])
     #problem = DC.Problem3D_CC(mesh, sigmaMap = mapping)
-    problem = DC.Problem2D_CC(mesh, sigmaMap=mapping)
+    # kyTol switches to adaptive wavenumbers chosen for the core region,
+    # the cells next to an electrode need wavenumbers well above 1/cs
+    kyRange = (cs/8., np.sqrt((xmax-xmin)**2 + (ymax-ymin)**2))
+    problem = Problem2D_CC(
+        mesh, sigmaMap=mapping, parallel='thread', kyTol=kyTol,
+        kyRange=kyRange
+    )
     # problem_prim = DC.Problem3D_CC(mesh, sigmaMap = mapping)
-    problem_prim = DC.Problem2D_CC(mesh, sigmaMap=mapping)
-    problem.Solver = SolverLU
-    problem_prim.Solver = SolverLU
+    problem_prim = Problem2D_CC(
+        mesh, sigmaMap=mapping, parallel='thread', kyTol=kyTol,
+        kyRange=kyRange
+    )
+    problem.Solver = getDCSolver(system=(__name__, 'total'))
+    problem_prim.Solver = getDCSolver(system=(__name__, 'primary'))
     problem.pair(survey)
     problem_prim.pair(survey_prim)
 
@@ -103,24 +118,7 @@ def model_fields(A, B, zcLayer, dzLayer, xc, zc, r, sigLayer, sigTarget, sigHalf
 
 def addLayer2Mod(zcLayer, dzLayer, mod, sigLayer):
 
-    CCLocs = mesh.gridCC
-
-    zmax = zcLayer + dzLayer / 2.
-    zmin = zcLayer - dzLayer / 2.
-
-    belowInd = np.where(CCLocs[:, 1] <= zmax)[0]
-    aboveInd = np.where(CCLocs[:, 1] >= zmin)[0]
-    layerInds = list(set(belowInd).intersection(aboveInd))
-
-    # # Check selected cell centers by plotting
-    # fig = plt.figure()
-    # ax = fig.add_subplot(111)
-    # plt.scatter(CCLocs[layerInds,0],CCLocs[layerInds,1])
-    # ax.set_xlim(-40,40)
-    # ax.set_ylim(-35,0)
-    # plt.axes().set_aspect('equal')
-    # plt.show()
-
+    layerInds = getIndicesLayer(mesh, zcLayer, dzLayer)
     mod[layerInds] = sigLayer
     return mod
 
@@ -143,38 +141,8 @@ def getCylinderPoints(xc, zc, r):
 
 def addCylinder2Mod(xc, zc, r, modd, sigCylinder):
 
-    # Get points for cylinder outline
-    cylinderPoints = getCylinderPoints(xc, zc, r)
     mod = copy.copy(modd)
-
-    verts = []
-    codes = []
-    for ii in range(0, cylinderPoints.shape[0]):
-        verts.append(cylinderPoints[ii, :])
-
-        if(ii == 0):
-            codes.append(Path.MOVETO)
-        elif(ii == cylinderPoints.shape[0] - 1):
-            codes.append(Path.CLOSEPOLY)
-        else:
-            codes.append(Path.LINETO)
-
-    path = Path(verts, codes)
-    CCLocs = mesh.gridCC
-    insideInd = np.where(path.contains_points(CCLocs))
-
-    # #Check selected cell centers by plotting
-    # # print insideInd
-    # fig = plt.figure()
-    # ax = fig.add_subplot(111)
-    # patch = patches.PathPatch(path, facecolor='none', lw=2)
-    # ax.add_patch(patch)
-    # plt.scatter(CCLocs[insideInd,0],CCLocs[insideInd,1])
-    # ax.set_xlim(-40,40)
-    # ax.set_ylim(-35,0)
-    # plt.axes().set_aspect('equal')
-    # plt.show()
-
+    insideInd = getIndicesCircle(mesh, xc, zc, r)
     mod[insideInd] = sigCylinder
     return mod
 
@@ -195,41 +163,9 @@ def getPlateCorners(xc, zc, dx, dz, rotAng):
 
 
 def addPlate2Mod(xc, zc, dx, dz, rotAng, modd, sigPlate):
-    # use matplotlib paths to find CC inside of polygon
-    plateCorners = getPlateCorners(xc, zc, dx, dz, rotAng)
-    mod = copy.copy(modd)
-
-    verts = [
-        (plateCorners[0, :]),  # left, top
-        (plateCorners[1, :]),  # right, top
-        (plateCorners[3, :]),  # right, bottom
-        (plateCorners[2, :]),  # left, bottom
-        (plateCorners[0, :]),  # left, top (closes polygon)
-    ]
-
-    codes = [Path.MOVETO,
-             Path.LINETO,
-             Path.LINETO,
-             Path.LINETO,
-             Path.CLOSEPOLY,
-             ]
-
-    path = Path(verts, codes)
-    CCLocs = mesh.gridCC
-    insideInd = np.where(path.contains_points(CCLocs))
-
-    # Check selected cell centers by plotting
-    # print insideInd
-    # fig = plt.figure()
-    # ax = fig.add_subplot(111)
-    # patch = patches.PathPatch(path, facecolor='none', lw=2)
-    # ax.add_patch(patch)
-    # plt.scatter(CCLocs[insideInd,0],CCLocs[insideInd,1])
-    # ax.set_xlim(-10,10)
-    # ax.set_ylim(-20,0)
-    # plt.axes().set_aspect('equal')
-    # plt.show()
 
+    mod = copy.copy(modd)
+    insideInd = getIndicesPlate(mesh, xc, zc, dx, dz, rotAng)
     mod[insideInd] = sigPlate
     return mod
 
@@ -261,15 +197,8 @@ def get_Surface_Potentials(survey, src, field_obj):
 #rho_a = lambda VM,VN, A,B,M,N: (VM-VN)*2.*np.pi*G(A,B,M,N)
 
 def sumCylinderCharges(xc, zc, r, qSecondary):
-    chargeRegionVerts = getCylinderPoints(xc, zc, r + 0.5)
-
-    codes = chargeRegionVerts.shape[0] * [Path.LINETO]
-    codes[0] = Path.MOVETO
-    codes[-1] = Path.CLOSEPOLY
-
-    chargeRegionPath = Path(chargeRegionVerts, codes)
     CCLocs = mesh.gridCC
-    chargeRegionInsideInd = np.where(chargeRegionPath.contains_points(CCLocs))
+    chargeRegionInsideInd = getIndicesCircle(mesh, xc, zc, r + 0.5)
 
     plateChargeLocs = CCLocs[chargeRegionInsideInd]
     plateCharge = qSecondary[chargeRegionInsideInd]
@@ -329,8 +258,8 @@ def getSensitivity(survey, A, B, M, N, model):
         src = DC.Src.Pole([rx], np.r_[A, 0.])
 
     survey = DC.Survey_ky([src])
-    problem = DC.Problem2D_CC(mesh, sigmaMap=mapping)
-    problem.Solver = SolverLU
+    problem = Problem2D_CC(mesh, sigmaMap=mapping, parallel='thread')
+    problem.Solver = getDCSolver(system=(__name__, 'sensitivity'))
     problem.pair(survey)
     fieldObj = problem.fields(model)
 
@@ -339,27 +268,6 @@ def getSensitivity(survey, A, B, M, N, model):
     return J
 
 
-def calculateRhoA(survey, VM, VN, A, B, M, N):
-
-    eps = 1e-9  # to stabilize division
-
-    if(survey == "Dipole-Dipole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(M - B) + eps) -
-                  1. / (np.abs(N - A) + eps) + 1. / (np.abs(N - B) + eps))
-        rho_a = (VM - VN) * 2. * np.pi * G
-    elif(survey == "Pole-Dipole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(N - A) + eps))
-        rho_a = (VM - VN) * 2. * np.pi * G
-    elif(survey == "Dipole-Pole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(M - B) + eps))
-        rho_a = (VM) * 2. * np.pi * G
-    elif(survey == "Pole-Pole"):
-        G = 1. / (1. / (np.abs(A - M) + eps))
-        rho_a = (VM) * 2. * np.pi * G
-
-    return rho_a
-
-
 def PLOT(survey, A, B, M, N, zcLayer, dzLayer, xc, zc, r, rhohalf, rholayer, rhoTarget, Field, Type, Scale):
 
     labelsize = 16.
@@ -2,7 +2,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-from SimPEG import Mesh, Maps, SolverLU, Utils
+from SimPEG import Mesh, Maps, Utils
 from SimPEG.Utils import ExtractCoreMesh
 import numpy as np
 from SimPEG.EM.Static import DC
@@ -18,6 +18,13 @@ import copy
 from ipywidgets import interact, interact_manual, IntSlider, FloatSlider, FloatText, ToggleButtons, fixed, Widget
 
 from .Base import widgetify
+from .DCSolvers import getDCSolver
+from .DCSurvey import calculateRhoA
+from .DCProblem2D import Problem2D_CC
+from .ModelBuilder import getSurfaceIndex, getNearestColumn
+
+from . import _set_rcParams
+_set_rcParams()
 
 # Mesh, sigmaMap can be globals global
 npad = 12
@@ -69,22 +76,17 @@ def findnearest(A):
     idx = np.abs(mesh.gridCC[:, 0, None]-A).argmin(axis=0)
     return mesh.gridCC[idx, 0]
 
-def get_Surface(mtrue, A):
-    active = (mtrue > (np.log(1e-8)))
-    nearpoint = findnearest(A)
-    columns = mesh.gridCC[:, 0, None] == nearpoint
-    ind = np.logical_and(columns.T, active).T
-    idm = []
-    surface = []
-    for i in range(ind.shape[1]):
-        idm.append(np.where(np.all(mesh.gridCC == np.r_[nearpoint[i], np.max(mesh.gridCC[ind[:, i], 1])], axis=1)))
-        surface.append(mesh.gridCC[idm[-1], 1])
-    return Utils.mkvc(np.r_[idm]), Utils.mkvc(np.r_[surface])
+def get_Surface(mtrue, A, surfaceInd=None):
+    if surfaceInd is None:
+        surfaceInd = getSurfaceIndex(mesh, mtrue > np.log(1e-8))
+    idm = surfaceInd[getNearestColumn(mesh, A)]
+    return idm, mesh.gridCC[idm, 1]
 
 def model_fields(A, B, mtrue, mhalf, mair, mover, whichprimary='air'):
 
-    idA, surfaceA = get_Surface(mtrue, A)
-    idB, surfaceB = get_Surface(mtrue, B)
+    surfaceInd = getSurfaceIndex(mesh, mtrue > np.log(1e-8))
+    idA, surfaceA = get_Surface(mtrue, A, surfaceInd)
+    idB, surfaceB = get_Surface(mtrue, B, surfaceInd)
 
     Mx = mesh.gridCC
     # Nx = np.empty(shape =(mesh.nC, 2))
@@ -101,14 +103,14 @@ def model_fields(A, B, mtrue, mhalf, mair, mover, whichprimary='air'):
     survey_prim = DC.Survey_ky([src])
     survey_air = DC.Survey_ky([src])
     #problem = DC.Problem3D_CC(mesh, sigmaMap = mapping)
-    problem = DC.Problem2D_CC(mesh, sigmaMap=mapping)
+    problem = Problem2D_CC(mesh, sigmaMap=mapping, parallel='thread')
     # problem_prim = DC.Problem3D_CC(mesh, sigmaMap = mapping)
-    problem_prim = DC.Problem2D_CC(mesh, sigmaMap=mapping)
-    problem_air = DC.Problem2D_CC(mesh, sigmaMap=mapping)
+    problem_prim = Problem2D_CC(mesh, sigmaMap=mapping, parallel='thread')
+    problem_air = Problem2D_CC(mesh, sigmaMap=mapping, parallel='thread')
 
-    problem.Solver = SolverLU
-    problem_prim.Solver = SolverLU
-    problem_air.Solver = SolverLU
+    problem.Solver = getDCSolver(system=(__name__, 'total'))
+    problem_prim.Solver = getDCSolver(system=(__name__, 'primary'))
+    problem_air.Solver = getDCSolver(system=(__name__, 'air'))
 
     problem.pair(survey)
     problem_prim.pair(survey_prim)
@@ -221,8 +223,8 @@ def getSensitivity(survey, A, B, M, N, model):
         src = DC.Src.Pole([rx], np.r_[A, 0.])
 
     survey = DC.Survey_ky([src])
-    problem = DC.Problem2D_CC(mesh, sigmaMap=mapping)
-    problem.Solver = SolverLU
+    problem = Problem2D_CC(mesh, sigmaMap=mapping, parallel='thread')
+    problem.Solver = getDCSolver(system=(__name__, 'sensitivity'))
     problem.pair(survey)
     fieldObj = problem.fields(model)
 
@@ -230,26 +232,6 @@ def getSensitivity(survey, A, B, M, N, model):
 
     return J
 
-def calculateRhoA(survey, VM, VN, A, B, M, N):
-
-    #to stabilize division
-    eps = 1e-9
-
-    if(survey == "Dipole-Dipole"):
-        G = 1. / (1./(np.abs(A-M)+eps) - 1./(np.abs(M-B)+eps) - 1./(np.abs(N-A)+eps) + 1./(np.abs(N-B)+eps))
-        rho_a = (VM-VN)*2.*np.pi*G
-    elif(survey == "Pole-Dipole"):
-        G = 1. / (1./(np.abs(A-M)+eps) - 1./(np.abs(N-A)+eps))
-        rho_a = (VM-VN)*2.*np.pi*G
-    elif(survey == "Dipole-Pole"):
-        G = 1. / (1./(np.abs(A-M)+eps) - 1./(np.abs(M-B)+eps))
-        rho_a = (VM)*2.*np.pi*G
-    elif(survey == "Pole-Pole"):
-        G = 1. / (1./(np.abs(A-M)+eps))
-        rho_a = (VM)*2.*np.pi*G
-
-    return rho_a
-
 def PLOT(survey, A, B, M, N, rhohalf, rholayer, rhoTarget, overburden_thick, overburden_wide,
          target_thick, target_wide, whichprimary,
                  ellips_a, ellips_b, xc, zc, Field, Type, Scale):
@@ -579,10 +561,11 @@ def PLOT(survey, A, B, M, N, rhohalf, rholayer, rhoTarget, overburden_thick, ove
     ax[1].set_xlabel('x (m)', fontsize=labelsize)
     ax[1].set_ylabel('z (m)', fontsize=labelsize)
 
-    _, surfaceA = get_Surface(mtrue, A)
-    _, surfaceB = get_Surface(mtrue, B)
-    _, surfaceM = get_Surface(mtrue, M)
-    _, surfaceN = get_Surface(mtrue, N)
+    surfaceInd = getSurfaceIndex(mesh, mtrue > np.log(1e-8))
+    _, surfaceA = get_Surface(mtrue, A, surfaceInd)
+    _, surfaceB = get_Surface(mtrue, B, surfaceInd)
+    _, surfaceM = get_Surface(mtrue, M, surfaceInd)
+    _, surfaceN = get_Surface(mtrue, N, surfaceInd)
 
     if(survey == "Dipole-Dipole"):
 
@@ -4,25 +4,43 @@ from __future__ import unicode_literals
 
 from SimPEG import Mesh, Maps, SolverLU, Utils
 import numpy as np
+import scipy.sparse as sp
 from SimPEG.EM.Static import DC
 import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib.ticker import LogFormatter
 from matplotlib.path import Path
 import matplotlib.patches as patches
-from scipy.interpolate import griddata, LinearNDInterpolator
+from scipy.interpolate import LinearNDInterpolator
 import warnings
+import weakref
 from ipywidgets import (
     interactive, IntSlider, FloatSlider, FloatText, ToggleButtons, VBox
     )
 
 from .Base import widgetify
+from .DCSurvey import (
+    getSurveyGeometry, makeSourceList, gridPseudoSection
+)
 from SimPEG.Maps import IdentityMap
+
+from . import _set_rcParams
+_set_rcParams()
+
 # only use this if you are sure things are working
 warnings.filterwarnings('ignore')
 
 
 class ParametricCircleLayerMap(IdentityMap):
+    """
+        Conductivity of a circle in a two layered earth
+
+        m = [sig1, sig2, sig3, x, zc, r, zh]: conductivities (log
+        conductivities if logSigma) of the top layer, of the bottom layer
+        and of the circle of centre (x, zc) and radius r, the interface
+        being at the depth zh. The boundaries are smoothed with
+        arctan(slope * distance), which makes the map differentiable.
+    """
 
     slope = 1e-1
 
@@ -39,16 +57,52 @@ class ParametricCircleLayerMap(IdentityMap):
     def nP(self):
         return 7
 
-    def _transform(self, m):
+    def _step(self, t):
+        return np.arctan(self.slope * t) / np.pi + 0.5
+
+    def _stepDeriv(self, t):
         a = self.slope
+        return a / (np.pi * (1. + (a * t)**2))
+
+    def _parts(self, m):
         sig1, sig2, sig3, x, zc, r, zh = m[0], m[1], m[2], m[3], m[4], m[5], m[6]
         if self.logSigma:
             sig1, sig2, sig3 = np.exp(sig1), np.exp(sig2), np.exp(sig3)
-        sigma = np.ones(mesh.nC) * sig1
-        sigma[mesh.gridCC[:,1]<zh] = sig2
-        blkind = Utils.ModelBuilder.getIndicesSphere(np.r_[x, zc], r, mesh.gridCC)
-        sigma[blkind]=sig3
-        return sigma
+        X = self.mesh.gridCC[:, 0]
+        Z = self.mesh.gridCC[:, 1]
+        dist = np.sqrt((X - x)**2 + (Z - zc)**2)
+        # 1 in the top layer, 1 in the circle
+        fLayer = self._step(Z - zh)
+        fCircle = self._step(r - dist)
+        background = sig2 + (sig1 - sig2) * fLayer
+        return sig1, sig2, sig3, X, Z, dist, fLayer, fCircle, background
+
+    def _transform(self, m):
+        _, _, sig3, _, _, _, _, fCircle, background = self._parts(m)
+        return background + (sig3 - background) * fCircle
+
+    def deriv(self, m, v=None):
+        sig1, sig2, sig3, X, Z, dist, fLayer, fCircle, background = (
+            self._parts(m)
+        )
+        x, zc, r, zh = m[3], m[4], m[5], m[6]
+        dCircle = self._stepDeriv(r - dist)
+        dist = dist + 1e-12 * self.mesh.hx.min()
+
+        g1 = fLayer * (1. - fCircle)
+        g2 = (1. - fLayer) * (1. - fCircle)
+        g3 = fCircle
+        if self.logSigma:
+            g1, g2, g3 = g1 * sig1, g2 * sig2, g3 * sig3
+        gx = (sig3 - background) * dCircle * (X - x) / dist
+        gzc = (sig3 - background) * dCircle * (Z - zc) / dist
+        gr = (sig3 - background) * dCircle
+        gzh = -(sig1 - sig2) * (1. - fCircle) * self._stepDeriv(Z - zh)
+
+        G = sp.csr_matrix(np.c_[g1, g2, g3, gx, gzc, gr, gzh])
+        if v is not None:
+            return G * v
+        return G
 
 
 # Mesh, mapping can be globals
@@ -76,74 +130,36 @@ indy = (mesh.gridFy[:, 0] >= xmin) & (mesh.gridFy[:, 0] <= xmax) \
 indF = np.concatenate((indx, indy))
 
 
-def DC2Dsurvey(flag="PolePole"):
+# surveys (and their synthetic data) by (flag, nmax), and the data of a unit
+# conductivity halfspace by survey
+_surveys = {}
+_unitHalfspaceData = weakref.WeakKeyDictionary()
+
+
+def DC2Dsurvey(flag="PolePole", nmax=8):
     """
     Function that define a surface DC survey
-    :param str flag: Survey Type 'PoleDipole', 'DipoleDipole', 'DipolePole', 'PolePole'
+    :param str flag: Survey Type 'PoleDipole', 'DipoleDipole', 'DipolePole',
+                     'PolePole', 'Wenner', 'Schlumberger'
+    :param int nmax: maximum n-spacing
+
+    The survey and its synthetic data only depend on flag and nmax and are
+    computed once.
     """
-    if flag == "PoleDipole":
-        ntx, nmax = xr.size-2, 8
-    elif flag == "DipolePole":
-        ntx, nmax = xr.size-2, 8
-    elif flag == "DipoleDipole":
-        ntx, nmax = xr.size-3, 8
-    elif flag == "PolePole":
-        ntx, nmax = xr.size-2, 8
-    else:
-        raise Exception('Not Implemented')
-    xzlocs = getPseudoLocs(xr, ntx, nmax, flag)
+    if (flag, nmax) not in _surveys:
+        _surveys[(flag, nmax)] = _DC2Dsurvey(flag, nmax)
+    return _surveys[(flag, nmax)]
 
-    txList = []
-    zloc = -2.5
-    for i in range(ntx):
-        if flag == "PoleDipole":
-            A = np.r_[xr[i], zloc]
-            B = np.r_[mesh.vectorCCx.min(), zloc]
-            if i < ntx-nmax+1:
-                M = np.c_[xr[i+1:i+1+nmax], np.ones(nmax)*zloc]
-                N = np.c_[xr[i+2:i+2+nmax], np.ones(nmax)*zloc]
-            else:
-                M = np.c_[xr[i+1:ntx+1], np.ones(ntx-i)*zloc]
-                N = np.c_[xr[i+2:i+2+nmax], np.ones(ntx-i)*zloc]
-        elif flag == "DipolePole":
-            A = np.r_[xr[i], zloc]
-            B = np.r_[xr[i+1], zloc]
-            if i < ntx-nmax+1:
-                M = np.c_[xr[i+2:i+2+nmax], np.ones(nmax)*zloc]
-                N = np.c_[np.ones(nmax)*mesh.vectorCCx.max(),
-                          np.ones(nmax)*zloc]
-            else:
-                M = np.c_[xr[i+2:ntx+2], np.ones(ntx-i)*zloc]
-                N = np.c_[np.ones(ntx-i)*mesh.vectorCCx.max(),
-                          np.ones(ntx-i)*zloc]
-        elif flag == "DipoleDipole":
-            A = np.r_[xr[i], zloc]
-            B = np.r_[xr[i+1], zloc]
-            if i < ntx-nmax:
-                M = np.c_[xr[i+2:i+2+nmax],
-                          np.ones(len(xr[i+2:i+2+nmax]))*zloc]
-                N = np.c_[xr[i+3:i+3+nmax],
-                          np.ones(len(xr[i+3:i+3+nmax]))*zloc]
-            else:
-                M = np.c_[xr[i+2:len(xr)-1],
-                          np.ones(len(xr[i+2:len(xr)-1]))*zloc]
-                N = np.c_[xr[i+3:len(xr)], np.ones(len(xr[i+3:len(xr)]))*zloc]
-        elif flag == "PolePole":
-            A = np.r_[xr[i], zloc]
-            B = np.r_[mesh.vectorCCx.min(), zloc]
-
-            if i < ntx-nmax+1:
-                M = np.c_[xr[i+2:i+2+nmax], np.ones(nmax)*zloc]
-                N = np.c_[np.ones(nmax)*mesh.vectorCCx.max(),
-                          np.ones(nmax)*zloc]
-            else:
-                M = np.c_[xr[i+2:ntx+2], np.ones(ntx-i)*zloc]
-                N = np.c_[np.ones(ntx-i)*mesh.vectorCCx.max(),
-                          np.ones(ntx-i)*zloc]
 
-        rx = DC.Rx.Dipole(M, N)
-        src = DC.Src.Dipole([rx], A, B)
-        txList.append(src)
+def _DC2Dsurvey(flag, nmax):
+    zloc = -2.5
+    geometry = getSurveyGeometry(
+        np.c_[xr, np.ones_like(xr)*zloc], flag, nmax,
+        remoteB=np.r_[mesh.vectorCCx.min(), zloc],
+        remoteN=np.r_[mesh.vectorCCx.max(), zloc]
+    )
+    xzlocs = geometry['xzlocs']
+    txList = makeSourceList(geometry)
 
     survey = DC.Survey(txList)
     problem = DC.Problem3D_CC(mesh, sigmaMap=mapping)
@@ -407,6 +423,105 @@ def MidpointPseudoSectionWidget():
         i=IntSlider(min=0, max=ntx-1, step=1, value=0))
 
 
+def invertCircleLayer(
+    survey, dobs, m0, std=None, slope=None, maxIter=10, tol=1e-3,
+    verbose=True
+):
+    """
+    Damped Gauss-Newton inversion of the 7 parameters of the circle and
+    layer model (see ParametricCircleLayerMap)
+
+    Each iteration builds the nD x 7 sensitivity with 7 calls to
+    problem.Jvec, reusing the factorization of the forward solve, and
+    then solves a 7 x 7 system; the Marquardt damping is decreased after a
+    successful step and increased otherwise.
+
+    :param SimPEG.Survey survey: survey paired with a problem using a
+                                 ParametricCircleLayerMap
+    :param numpy.array dobs: observed data
+    :param numpy.array m0: starting model
+    :param numpy.array std: standard deviations of the data, 5% plus a
+                            floor when None
+    :param float slope: slope of the map during the inversion, the inverse
+                        of the smallest cell width when None
+    :param int maxIter: maximum number of iterations
+    :param float tol: stop when the misfit decreases by less than tol
+    :rtype: tuple
+    :return: recovered model and misfit at every iteration
+    """
+    prob = survey.prob
+    mapping = prob.sigmaMap
+    if std is None:
+        std = 0.05 * np.abs(dobs) + 1e-3 * np.abs(dobs).max()
+    W = 1. / std
+    rmin = prob.mesh.hx.min()
+
+    slope0 = mapping.slope
+    mapping.slope = 1. / rmin if slope is None else slope
+
+    def misfit(m):
+        f = prob.fields(m)
+        d = survey.dpred(m, f=f)
+        return 0.5 * np.sum((W * (d - dobs))**2), d, f
+
+    try:
+        m = np.asarray(m0, dtype=float).copy()
+        phi, d, f = misfit(m)
+        history = [phi]
+        damping = 1e-2
+        if verbose:
+            print(">> iteration 0, misfit {:.3e}".format(phi))
+
+        for it in range(maxIter):
+            WJ = W[:, None] * np.vstack(
+                [prob.Jvec(m, v, f=f) for v in np.eye(m.size)]
+            ).T
+            H = WJ.T.dot(WJ)
+            g = WJ.T.dot(W * (d - dobs))
+            diagH = H.diagonal() + 1e-12 * H.diagonal().max()
+
+            while damping < 1e8:
+                dm = np.linalg.solve(H + damping * np.diag(diagH), -g)
+                mNew = m + dm
+                mNew[5] = max(mNew[5], rmin)
+                phiNew, dNew, fNew = misfit(mNew)
+                if phiNew < phi:
+                    damping /= 10.
+                    break
+                damping *= 10.
+            else:
+                break
+
+            decrease = (phi - phiNew) / phi
+            m, phi, d, f = mNew, phiNew, dNew, fNew
+            history.append(phi)
+            if verbose:
+                print(">> iteration {}, misfit {:.3e}".format(it + 1, phi))
+            if decrease < tol:
+                break
+    finally:
+        mapping.slope = slope0
+
+    return m, history
+
+
+def halfspaceData(survey, sighalf):
+    """
+    Data of a halfspace of conductivity sighalf
+
+    The potentials of a halfspace scale with its resistivity, so the data
+    of a unit conductivity halfspace are computed once per survey and
+    scaled.
+
+    :param SimPEG.Survey survey: survey object
+    :param float sighalf: conductivity of the half-space
+    """
+    if survey not in _unitHalfspaceData:
+        m0 = np.r_[0., 0., 0., 0., 0., 1., 0.]
+        _unitHalfspaceData[survey] = survey.dpred(m0)
+    return _unitHalfspaceData[survey] / sighalf
+
+
 def DC2Dfwdfun(mesh, survey, mapping, xr, xzlocs, rhohalf, rhoblk, xc, yc, r,
                dobs, uncert, predmis, nmax=8, plotFlag=None):
     """
@@ -435,8 +550,7 @@ def DC2Dfwdfun(mesh, survey, mapping, xr, xzlocs, rhohalf, rhoblk, xc, yc, r,
     sighalf, sigblk = 1./rhohalf, 1./rhoblk
     siglayer = 1e-3
     zh = -5
-    m0 = np.r_[np.log(sighalf), np.log(sighalf), np.log(sighalf), xc, yc, r, zh]
-    dini = survey.dpred(m0)
+    dini = halfspaceData(survey, sighalf)
     mtrue = np.r_[np.log(sighalf), np.log(siglayer), np.log(sigblk), xc, yc, r, zh]
     dpred = survey.dpred(mtrue)
     xi, yi = np.meshgrid(np.linspace(xr.min(), xr.max(), 120),
@@ -447,9 +561,7 @@ def DC2Dfwdfun(mesh, survey, mapping, xr, xzlocs, rhohalf, rhoblk, xc, yc, r,
     appres = dpred/dini/sighalf
     appresobs = dobs/dini/sighalf
     std = np.std(appres)
-    pred = griddata(
-        xzlocs, appres, (xi, yi), method='linear'
-    )
+    pred = gridPseudoSection(xzlocs, appres, xi, yi)
 
     if plotFlag is not None:
         fig = plt.figure(figsize=(12, 6))
@@ -487,8 +599,7 @@ def DC2Dfwdfun(mesh, survey, mapping, xr, xzlocs, rhohalf, rhoblk, xc, yc, r,
         ax2.set_xlabel("Distance (m)")
 
     else:
-        obs = griddata(xzlocs, appresobs, (xi, yi),
-                       method='linear')
+        obs = gridPseudoSection(xzlocs, appresobs, xi, yi)
         fig = plt.figure(figsize=(12, 9))
         ax1 = plt.subplot(311)
         dat1 = mesh.plotImage(np.log10(1./(mapping*mtrue)), ax=ax1,
@@ -530,8 +641,7 @@ def DC2Dfwdfun(mesh, survey, mapping, xr, xzlocs, rhohalf, rhoblk, xc, yc, r,
             ax3.text(-38, 7, "Predicted")
         elif predmis == "mis":
             mis = (appresobs-appres)/(appresobs) * 100
-            Mis = griddata(xzlocs, mis, (xi, yi),
-                           method='linear')
+            Mis = gridPseudoSection(xzlocs, mis, xi, yi)
             dat3 = ax3.contourf(xi, yi, Mis, 10)
             ax3.contour(xi, yi, Mis, 10, colors='k', alpha=0.5)
             ax3.plot(xzlocs[:, 0], xzlocs[:, 1], 'k.', ms=3)
@@ -2,7 +2,7 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-from SimPEG import Mesh, Maps, SolverLU, Utils
+from SimPEG import Mesh, Maps, Utils
 import SimPEG.Utils as Utils
 from SimPEG.Utils import ExtractCoreMesh
 import numpy as np
@@ -11,13 +11,18 @@ import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.pylab as pylab
 from matplotlib.ticker import LogFormatter
-from matplotlib.path import Path
 import matplotlib.patches as patches
 import warnings
 
 from ipywidgets import interact, IntSlider, FloatSlider, FloatText, ToggleButtons
 
 from .Base import widgetify
+from .DCSolvers import getDCSolver
+from .DCSurvey import calculateRhoA
+from .ModelBuilder import getIndicesCircle
+
+from . import _set_rcParams
+_set_rcParams()
 
 # ignore warnings: only use this once you are sure things are working
 warnings.filterwarnings('ignore')
@@ -71,8 +76,8 @@ def cylinder_fields(A, B, r, sigcyl, sighalf, xc=0., zc=-20.):
     #problem = DC.Problem2D_CC(mesh, sigmaMap = sigmaMap)
     problem = DC.Problem3D_CC(mesh, sigmaMap=sigmaMap)
     problem_prim = DC.Problem3D_CC(mesh, sigmaMap=sigmaMap)
-    problem.Solver = SolverLU
-    problem_prim.Solver = SolverLU
+    problem.Solver = getDCSolver(system=(__name__, 'total'))
+    problem_prim.Solver = getDCSolver(system=(__name__, 'primary'))
     problem.pair(survey)
     problem_prim.pair(survey_prim)
 
@@ -134,15 +139,8 @@ def get_Surface_Potentials(survey, src, field_obj):
 
 
 def sumCylinderCharges(xc, zc, r, qSecondary):
-    chargeRegionVerts = getCylinderPoints(xc, zc, r + 0.5)
-
-    codes = chargeRegionVerts.shape[0] * [Path.LINETO]
-    codes[0] = Path.MOVETO
-    codes[-1] = Path.CLOSEPOLY
-
-    chargeRegionPath = Path(chargeRegionVerts, codes)
     CCLocs = mesh.gridCC
-    chargeRegionInsideInd = np.where(chargeRegionPath.contains_points(CCLocs))
+    chargeRegionInsideInd = getIndicesCircle(mesh, xc, zc, r + 0.5)
 
     plateChargeLocs = CCLocs[chargeRegionInsideInd]
     plateCharge = qSecondary[chargeRegionInsideInd]
@@ -206,7 +204,7 @@ def getSensitivity(survey, A, B, M, N, model):
 
     Srv = DC.Survey([src])
     problem = DC.Problem3D_CC(mesh, sigmaMap=sigmaMap)
-    problem.Solver = SolverLU
+    problem.Solver = getDCSolver(system=(__name__, 'sensitivity'))
     problem.pair(Srv)
     fieldObj = problem.fields(model)
 
@@ -215,27 +213,6 @@ def getSensitivity(survey, A, B, M, N, model):
     return J
 
 
-def calculateRhoA(survey, VM, VN, A, B, M, N):
-
-    eps = 1e-9  # to stabilize division
-
-    if(survey == "Dipole-Dipole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(M - B) + eps) -
-                  1. / (np.abs(N - A) + eps) + 1. / (np.abs(N - B) + eps))
-        rho_a = (VM - VN) * 2. * np.pi * G
-    elif(survey == "Pole-Dipole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(N - A) + eps))
-        rho_a = (VM - VN) * 2. * np.pi * G
-    elif(survey == "Dipole-Pole"):
-        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(M - B) + eps))
-        rho_a = (VM) * 2. * np.pi * G
-    elif(survey == "Pole-Pole"):
-        G = 1. / (1. / (np.abs(A - M) + eps))
-        rho_a = (VM) * 2. * np.pi * G
-
-    return rho_a
-
-
 def plot_Surface_Potentials(survey, A, B, M, N, r, xc, zc, rhohalf, rhocyl, Field, Type, Scale):
 
     labelsize = 16.
@@ -5,6 +5,8 @@ from __future__ import unicode_literals
 import numpy as np
 from scipy import special
 
+from .ChunkedKernels import evalInChunks
+
 
 deg2rad = lambda deg: deg/180.*np.pi
 rad2deg = lambda rad: rad*180./np.pi
@@ -54,35 +56,39 @@ def DCSpherePointCurrent(
 
     # Center of the sphere should be aligned in txloc in y-direction
     yc = txloc[1]
-    xyz = np.c_[rxloc[:,0]-xc, rxloc[:,1]-yc, rxloc[:,2]]
-    r = np.sqrt( (xyz**2).sum(axis=1) )
-
     x0 = abs(txloc[0]-xc)
 
-    costheta = xyz[:,0]/r * (txloc[0]-xc)/x0
-    phi = np.zeros_like(r)
-    R = (r**2+x0**2.-2.*r*x0*costheta)**0.5
-    # primary potential in a whole space
-    prim = rho*1./(4*np.pi*R)
-
-    if flag =="prim":
-        return prim
-
-    sphind = r < radius
-    out = np.zeros_like(r)
-    for n in range(order):
-        An, Bn = AnBnfun(n, radius, x0, rho, rho1)
-        dumout = An*r[~sphind]**(-n-1.)*Pleg[n](costheta[~sphind])
-        out[~sphind] += dumout
-        dumin = Bn*r[sphind]**(n)*Pleg[n](costheta[sphind])
-        out[sphind] += dumin
-
-    out[~sphind] += prim[~sphind]
-
-    if flag == "sec":
-        return out-prim
-    elif flag == "total":
-        return out
+    def potential(start, stop):
+        rx = rxloc[start:stop]
+        xyz = np.c_[rx[:,0]-xc, rx[:,1]-yc, rx[:,2]]
+        r = np.sqrt( (xyz**2).sum(axis=1) )
+
+        costheta = xyz[:,0]/r * (txloc[0]-xc)/x0
+        R = (r**2+x0**2.-2.*r*x0*costheta)**0.5
+        # primary potential in a whole space
+        prim = rho*1./(4*np.pi*R)
+
+        if flag =="prim":
+            return prim
+
+        sphind = r < radius
+        out = np.zeros_like(r)
+        for n in range(order):
+            An, Bn = AnBnfun(n, radius, x0, rho, rho1)
+            dumout = An*r[~sphind]**(-n-1.)*Pleg[n](costheta[~sphind])
+            out[~sphind] += dumout
+            dumin = Bn*r[sphind]**(n)*Pleg[n](costheta[sphind])
+            out[sphind] += dumin
+
+        out[~sphind] += prim[~sphind]
+
+        if flag == "sec":
+            return out-prim
+        elif flag == "total":
+            return out
+
+    # in blocks of receivers on the thread pool
+    return evalInChunks(potential, rxloc.shape[0])
 
 # if __name__ == '__main__':
 #TODO add an exmple run
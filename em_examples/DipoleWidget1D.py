@@ -3,12 +3,9 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 
 import numpy as np
-from SimPEG import EM
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
-import matplotlib
 import matplotlib.gridspec as gridspec
-matplotlib.rcParams['font.size'] = 12
 import warnings
 warnings.filterwarnings("ignore")
 
@@ -16,6 +13,10 @@ from ipywidgets import *
 
 from .Base import widgetify
 from .View import DataView
+from .FDEMDipolarfields import E_from_ElectricDipoleWholeSpace
+
+from . import _set_rcParams
+_set_rcParams()
 
 def linefun(x1, x2, y1, y2, nx,tol=1e-3):
     dx = x2-x1
@@ -85,7 +86,7 @@ class DipoleWidget1D(object):
                 obsLoc=np.c_[np.r_[0.],absloc,coordloc]
                 self.dataview.set_xyz(np.r_[0.],x,y,normal=normal) # set plane and locations ...
 
-            self.dataview.eval_loc(srcLoc,obsLoc, sigvec, fvec, orientation, normal, EM.Analytics.E_from_ElectricDipoleWholeSpace) # evaluate
+            self.dataview.eval_loc(srcLoc,obsLoc, sigvec, fvec, orientation, normal, E_from_ElectricDipoleWholeSpace) # evaluate
 
             fig = plt.figure(figsize=(6.5*3, 5))
             ax0 = plt.subplot(121)
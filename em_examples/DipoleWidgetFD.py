@@ -2,21 +2,25 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import copy
+
 import numpy as np
 from SimPEG import EM
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
-import matplotlib
 import matplotlib.gridspec as gridspec
-matplotlib.rcParams['font.size'] = 12
 import warnings
 warnings.filterwarnings("ignore")
 from ipywidgets import *
+from IPython.display import display
 
-from .View import DataView
+from .View import DataView, progressiveLevels
 from .Base import widgetify
 from .FDEMDipolarfields import *
 
+from . import _set_rcParams
+_set_rcParams()
+
 
 def linefun(x1, x2, y1, y2, nx,tol=1e-3):
     dx = x2-x1
@@ -51,7 +55,7 @@ class DipoleWidgetFD(object):
     def __init__(self):
         self.dataview = DataView()
 
-    def SetDataview(self, srcLoc, sig, f, orientation, normal, functype, na=100, nb=100, loc=0.):
+    def SetDataview(self, srcLoc, sig, f, orientation, normal, functype, na=100, nb=100, loc=0., precision="double"):
 
         self.srcLoc = srcLoc
         self.sig = sig
@@ -59,7 +63,7 @@ class DipoleWidgetFD(object):
         self.normal = normal
         self.SetGrid(normal, loc, na, nb)
         self.functype = functype
-        self.dataview.set_xyz(self.x, self.y, self.z, normal=normal) # set plane and locations ...
+        self.dataview.set_xyz(self.x, self.y, self.z, normal=normal, precision=precision) # set plane and locations ...
 
         if self.functype == "E_from_ED":
             self.func = E_from_ElectricDipoleWholeSpace
@@ -97,7 +101,7 @@ class DipoleWidgetFD(object):
             self.y = np.linspace(self.ymin, self.ymax, nb)
             self.z = np.r_[loc]
 
-    def Dipole2Dviz(self, x1, y1, x2, y2, npts2D, npts, sig, f, srcLoc=np.r_[0., 0., 0.], orientation="x", component="real", view="x", normal="Z", functype="E_from_ED", loc=0., scale="log", dx=50., plot1D=False, plotTxProfile=False):
+    def Dipole2Dviz(self, x1, y1, x2, y2, npts2D, npts, sig, f, srcLoc=np.r_[0., 0., 0.], orientation="x", component="real", view="x", normal="Z", functype="E_from_ED", loc=0., scale="log", dx=50., plot1D=False, plotTxProfile=False, precision="double", progressive=False, show=True):
         nx, ny = npts2D, npts2D
         x, y = linefun(x1, x2, y1, y2, npts)
         if scale == "log":
@@ -107,7 +111,20 @@ class DipoleWidgetFD(object):
         else:
             raise NotImplementedError()
 
-        self.SetDataview(srcLoc, sig, f, orientation, normal, functype, na=nx, nb=ny, loc=loc)
+        if progressive:
+            # a coarse figure now, refined in the background
+            def draw(n):
+                return self.Dipole2Dviz(x1, y1, x2, y2, n, npts, sig, f, srcLoc=srcLoc, orientation=orientation, component=component, view=view, normal=normal, functype=functype, loc=loc, scale=scale, dx=dx, plot1D=plot1D, plotTxProfile=plotTxProfile, precision=precision, show=False)
+
+            def evaluate(n):
+                worker = copy.copy(self)
+                worker.dataview = self.dataview.worker()
+                worker.SetDataview(srcLoc, sig, f, orientation, normal, functype, na=n, nb=n, loc=loc, precision=precision)
+
+            self.dataview.draw_progressive(progressiveLevels(npts2D), draw, evaluate)
+            return
+
+        self.SetDataview(srcLoc, sig, f, orientation, normal, functype, na=nx, nb=ny, loc=loc, precision=precision)
         # plot1D = False
         # plotTxProfile = False
         if normal =="X" or normal=="x":
@@ -125,21 +142,29 @@ class DipoleWidgetFD(object):
             xyz_line = np.c_[x, y, np.ones_like(x)*self.z]
             self.dataview.xyz_line =  xyz_line
 
-        fig = plt.figure(figsize=(18*1.5,3.4*1.5))
-        gs1 = gridspec.GridSpec(2, 7)
-        gs1.update(left=0.05, right=0.48, wspace=0.05)
-        ax1 = plt.subplot(gs1[:2, :3])
-        ax1.axis("equal")
+        # kept from the previous call with the same layout in persistent
+        # mode, and updated in place
+        figure = self.dataview.figure_state("Dipole2Dviz", (normal, scale, plot1D, plotTxProfile))
+        reused = "figure" in figure
+        if not reused:
+            figure["figure"] = plt.figure(figsize=(18*1.5,3.4*1.5))
+            gs1 = gridspec.GridSpec(2, 7)
+            gs1.update(left=0.05, right=0.48, wspace=0.05)
+            figure["ax1"] = plt.subplot(gs1[:2, :3])
+            figure["ax1"].axis("equal")
+            if plot1D:
+                figure["ax2"] = plt.subplot(gs1[:, 4:6])
+        ax1 = figure["ax1"]
 
         ax1, dat1 = self.dataview.plot2D_FD(ax=ax1, component=component,view=view, colorbar=False, logamp=logamp)
         vmin, vmax = dat1.cvalues.min(), dat1.cvalues.max()
         if scale == "log":
-            cb = plt.colorbar(dat1, ax=ax1, ticks=np.linspace(vmin, vmax, 5), format="$10^{%.1f}$")
+            cb = self.dataview.colorbar(ax1, dat1, np.linspace(vmin, vmax, 5), "$10^{%.1f}$")
         elif scale == "linear":
-            cb = plt.colorbar(dat1, ax=ax1, ticks=np.linspace(vmin, vmax, 5), format="%.1e")
+            cb = self.dataview.colorbar(ax1, dat1, np.linspace(vmin, vmax, 5), "%.1e")
 
-        ax1.text(x[0], y[0], 'A', fontsize = 16, color='w')
-        ax1.text(x[-1], y[-1]-5, 'B', fontsize = 16, color='w')
+        self.dataview.text(ax1, "A", x[0], y[0], 'A', fontsize = 16, color='w')
+        self.dataview.text(ax1, "B", x[-1], y[-1]-5, 'B', fontsize = 16, color='w')
         tempstr = functype.split("_")
         if view == "vec":
             tname = "Vector "
@@ -179,10 +204,10 @@ class DipoleWidgetFD(object):
 
 
         if plotTxProfile:
-            ax1.plot(np.r_[-20., 80.],np.zeros(2), 'b-', lw=1)
+            self.dataview.plot_line(ax1, "Tx", np.r_[-20., 80.],np.zeros(2), 'b-', autoscale=False, lw=1)
         if plot1D:
-            ax1.plot(x,y, 'r.', ms=4)
-            ax2 = plt.subplot(gs1[:, 4:6])
+            self.dataview.plot_line(ax1, "Rx", x, y, 'r.', autoscale=False, ms=4)
+            ax2 = figure["ax2"]
             val_line_x, val_line_y, val_line_z = self.dataview.eval(xyz_line, srcLoc, np.r_[sig], np.r_[f], orientation, self.func)
 
             if view =="X" or view =="x":
@@ -216,19 +241,19 @@ class DipoleWidgetFD(object):
             if scale == "log":
                 temp = val_line.copy()*np.nan
                 temp[val_line>0.] = val_line[val_line>0.]
-                ax2.plot(temp, distance, 'k.-')
+                self.dataview.plot_line(ax2, "positive", temp, distance, 'k.-')
                 temp = val_line.copy()*np.nan
                 temp[val_line<0.] = -val_line[val_line<0.]
-                ax2.plot(temp, distance, 'k.--')
+                self.dataview.plot_line(ax2, "negative", temp, distance, 'k.--')
                 ax2.set_xlim(abs(val_line).min(), abs(val_line).max())
                 ax2.set_xscale(scale)
 
             elif scale == "linear":
-                ax2.plot(val_line, distance, 'k.-')
+                self.dataview.plot_line(ax2, "line", val_line, distance, 'k.-')
                 ax2.set_xlim(val_line.min(), val_line.max())
                 ax2.set_xscale(scale)
                 xticks = np.linspace(val_line.min(), val_line.max(), 3)
-                plt.plot(np.r_[0., 0.], np.r_[distance.min(), distance.max()], 'k-', lw=2)
+                self.dataview.plot_line(ax2, "zero", np.r_[0., 0.], np.r_[distance.min(), distance.max()], 'k-', lw=2)
                 ax2.xaxis.set_ticks(xticks)
                 ax2.xaxis.set_major_formatter(ticker.FormatStrFormatter("%.0e"))
 
@@ -263,12 +288,22 @@ class DipoleWidgetFD(object):
             # ax2.text(distance.max()*0.97, val_line.max(), 'B', fontsize = 16)
             # ax2.legend((component, ), bbox_to_anchor=(0.5, -0.3))
             ax2.grid(True)
-        plt.show()
+        if not show:
+            return figure["figure"]
+        if reused:
+            # the inline backend closed the figure once it showed it
+            figure["figure"].canvas.draw_idle()
+            display(figure["figure"])
+        else:
+            plt.show()
         pass
 
     def InteractiveDipoleBH(self, nRx=20, npts2D=50, scale="log", offset_plane=50.,\
                             X1=-20, X2=80, Y1=-50, Y2=50, Z1=-50, Z2=50, \
-                            plane="YZ", SrcType="ED", fieldvalue="E", compvalue="z"):
+                            plane="YZ", SrcType="ED", fieldvalue="E", compvalue="z", progressive=False):
+
+        # update the figure in place on the callbacks that keep its layout
+        self.dataview.set_persistent()
 
         # x1, x2, y1, y2 = offset_rx, offset_rx, Z1, Z2
         self.xmin, self.xmax = X1, X2
@@ -313,7 +348,7 @@ class DipoleWidgetFD(object):
             elif SrcType == "MD":
                 Field = Field+"_from_MD"
 
-            return self.Dipole2Dviz(x1, y1, x2, y2, npts2D, nRx, sig, f, srcLoc=np.r_[0., 0., 0.], orientation="z", component=ComplexNumber, view=Component, normal=normal, functype=Field, loc=Offset, scale=Scale)
+            return self.Dipole2Dviz(x1, y1, x2, y2, npts2D, nRx, sig, f, srcLoc=np.r_[0., 0., 0.], orientation="z", component=ComplexNumber, view=Component, normal=normal, functype=Field, loc=Offset, scale=Scale, progressive=progressive)
 
         out = widgetify(foo
                         ,Field=widgets.ToggleButtons(options=["E", "H", "J"], value=fieldvalue) \
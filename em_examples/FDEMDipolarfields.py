@@ -8,11 +8,15 @@ from scipy.constants import mu_0, pi, epsilon_0
 from scipy.special import erf
 from SimPEG import Utils
 
+from . import KernelBackends
+from .ChunkedKernels import broadcastKernel
+
 omega = lambda f: 2.*np.pi*f
 # TODO:
 # r = lambda dx, dy, dz: np.sqrt( dx**2. + dy**2. + dz**2.)
 # k = lambda f, mu, epsilon, sig: np.sqrt( omega(f)**2. *mu*epsilon -1j*omega(f)*mu*sig )
 
+@broadcastKernel(geometry=True)
 def E_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1., orientation='X', kappa=0., epsr=1., t=0.):
 
     """
@@ -20,47 +24,14 @@ def E_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1.,
         TODO:
             Add description of parameters
     """
-    mu = mu_0*(1+kappa)
-    epsilon = epsilon_0*epsr
-    sig_hat = sig + 1j*omega(f)*epsilon
-
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & f.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single frequency can be specified.")
-
-    dx = XYZ[:,0]-srcLoc[0]
-    dy = XYZ[:,1]-srcLoc[1]
-    dz = XYZ[:,2]-srcLoc[2]
 
-    r  = np.sqrt( dx**2. + dy**2. + dz**2.)
-    # k  = np.sqrt( -1j*2.*np.pi*f*mu*sig )
-    k  = np.sqrt( omega(f)**2. *mu*epsilon -1j*omega(f)*mu*sig )
-
-    front = current * length / (4.*np.pi*sig_hat* r**3) * np.exp(-1j*k*r)
-    mid   = -k**2 * r**2 + 3*1j*k*r + 3
-
-    if orientation.upper() == 'X':
-        Ex = front*((dx**2 / r**2)*mid + (k**2 * r**2 -1j*k*r-1.))
-        Ey = front*(dx*dy  / r**2)*mid
-        Ez = front*(dx*dz  / r**2)*mid
-        return Ex, Ey, Ez
-
-    elif orientation.upper() == 'Y':
-        #  x--> y, y--> z, z-->x
-        Ey = front*((dy**2 / r**2)*mid + (k**2 * r**2 -1j*k*r-1.))
-        Ez = front*(dy*dz  / r**2)*mid
-        Ex = front*(dy*dx  / r**2)*mid
-        return Ex, Ey, Ez
-
-    elif orientation.upper() == 'Z':
-        # x --> z, y --> x, z --> y
-        Ez = front*((dz**2 / r**2)*mid + (k**2 * r**2 -1j*k*r-1.))
-        Ex = front*(dz*dx  / r**2)*mid
-        Ey = front*(dz*dy  / r**2)*mid
-        return Ex, Ey, Ez
+    return ElectricDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['E'], current=current, length=length,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['E']
 
 
+@broadcastKernel(geometry=True)
 def E_galvanic_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -68,47 +39,14 @@ def E_galvanic_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., le
         TODO:
             Add description of parameters
     """
-    mu = mu_0*(1+kappa)
-    epsilon = epsilon_0*epsr
-    sig_hat = sig + 1j*omega(f)*epsilon
-
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & f.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single frequency can be specified.")
-
-    dx = XYZ[:,0]-srcLoc[0]
-    dy = XYZ[:,1]-srcLoc[1]
-    dz = XYZ[:,2]-srcLoc[2]
-
-    r  = np.sqrt( dx**2. + dy**2. + dz**2.)
-    # k  = np.sqrt( -1j*2.*np.pi*f*mu*sig )
-    k  = np.sqrt( omega(f)**2. *mu*epsilon -1j*omega(f)*mu*sig )
 
-    front = current * length / (4.*np.pi*sig_hat* r**3) * np.exp(-1j*k*r)
-    mid   = -k**2 * r**2 + 3*1j*k*r + 3
-
-    if orientation.upper() == 'X':
-        Ex_galvanic = front*((dx**2 / r**2)*mid + (-1j*k*r-1.))
-        Ey_galvanic = front*(dx*dy  / r**2)*mid
-        Ez_galvanic = front*(dx*dz  / r**2)*mid
-        return Ex_galvanic, Ey_galvanic, Ez_galvanic
-
-    elif orientation.upper() == 'Y':
-        #  x--> y, y--> z, z-->x
-        Ey_galvanic = front*((dy**2 / r**2)*mid + (-1j*k*r-1.))
-        Ez_galvanic = front*(dy*dz  / r**2)*mid
-        Ex_galvanic = front*(dy*dx  / r**2)*mid
-        return Ex_galvanic, Ey_galvanic, Ez_galvanic
-
-    elif orientation.upper() == 'Z':
-        # x --> z, y --> x, z --> y
-        Ez_galvanic = front*((dz**2 / r**2)*mid + (-1j*k*r-1.))
-        Ex_galvanic = front*(dz*dx  / r**2)*mid
-        Ey_galvanic = front*(dz*dy  / r**2)*mid
-        return Ex_galvanic, Ey_galvanic, Ez_galvanic
+    return ElectricDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['E_galvanic'], current=current, length=length,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['E_galvanic']
 
 
+@broadcastKernel(geometry=True)
 def E_inductive_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -116,46 +54,14 @@ def E_inductive_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., l
         TODO:
             Add description of parameters
     """
-    mu = mu_0*(1+kappa)
-    epsilon = epsilon_0*epsr
-    sig_hat = sig + 1j*omega(f)*epsilon
-
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & f.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single frequency can be specified.")
-
-    dx = XYZ[:,0]-srcLoc[0]
-    dy = XYZ[:,1]-srcLoc[1]
-    dz = XYZ[:,2]-srcLoc[2]
-
-    r  = np.sqrt( dx**2. + dy**2. + dz**2.)
-    # k  = np.sqrt( -1j*2.*np.pi*f*mu*sig )
-    k  = np.sqrt( omega(f)**2. *mu*epsilon -1j*omega(f)*mu*sig )
-
-    front = current * length / (4.*np.pi*sig_hat* r**3) * np.exp(-1j*k*r)
-
-    if orientation.upper() == 'X':
-        Ex_inductive = front*(k**2 * r**2)
-        Ey_inductive = np.zeros_like(Ex_inductive)
-        Ez_inductive = np.zeros_like(Ex_inductive)
-        return Ex_inductive, Ey_inductive, Ez_inductive
 
-    elif orientation.upper() == 'Y':
-        #  x--> y, y--> z, z-->x
-        Ey_inductive = front*(k**2 * r**2)
-        Ez_inductive = np.zeros_like(Ey_inductive)
-        Ex_inductive = np.zeros_like(Ey_inductive)
-        return Ex_inductive, Ey_inductive, Ez_inductive
-
-    elif orientation.upper() == 'Z':
-        # x --> z, y --> x, z --> y
-        Ez_inductive = front*(k**2 * r**2)
-        Ex_inductive = np.zeros_like(Ez_inductive)
-        Ey_inductive = np.zeros_like(Ez_inductive)
-        return Ex_inductive, Ey_inductive, Ez_inductive
+    return ElectricDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['E_inductive'], current=current, length=length,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['E_inductive']
 
 
+@broadcastKernel(geometry=True)
 def J_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -164,13 +70,13 @@ def J_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1.,
             Add description of parameters
     """
 
-    Ex, Ey, Ez = E_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=current, length=length, orientation=orientation, kappa=kappa, epsr=epsr)
-    Jx = sig*Ex
-    Jy = sig*Ey
-    Jz = sig*Ez
-    return Jx, Jy, Jz
+    return ElectricDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['J'], current=current, length=length,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['J']
 
 
+@broadcastKernel(geometry=True)
 def J_galvanic_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -179,13 +85,13 @@ def J_galvanic_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., le
             Add description of parameters
     """
 
-    Ex_galvanic, Ey_galvanic, Ez_galvanic = E_galvanic_from_ElectricDipoleWholeSpaced(XYZ, srcLoc, sig, f, current=current, length=length, orientation=orientation, kappa=kappa, epsr=epsr)
-    Jx_galvanic = sig*Ex_galvanic
-    Jy_galvanic = sig*Ey_galvanic
-    Jz_galvanic = sig*Ez_galvanic
-    return Jx_galvanic, Jy_galvanic, Jz_galvanic
+    return ElectricDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['J_galvanic'], current=current, length=length,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['J_galvanic']
 
 
+@broadcastKernel(geometry=True)
 def J_inductive_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -194,13 +100,13 @@ def J_inductive_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., l
             Add description of parameters
     """
 
-    Ex_inductive, Ey_inductive, Ez_inductive = E_inductive_from_ElectricDipoleWholeSpaced(XYZ, srcLoc, sig, f, current=current, length=length, orientation=orientation, kappa=kappa, epsr=epsr)
-    Jx_inductive = sig*Ex_inductive
-    Jy_inductive = sig*Ey_inductive
-    Jz_inductive = sig*Ez_inductive
-    return Jx_inductive, Jy_inductive, Jz_inductive
+    return ElectricDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['J_inductive'], current=current, length=length,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['J_inductive']
 
 
+@broadcastKernel(geometry=True)
 def H_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -208,42 +114,14 @@ def H_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1.,
         TODO:
             Add description of parameters
     """
-    mu = mu_0*(1+kappa)
-    epsilon = epsilon_0*epsr
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & f.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single frequency can be specified.")
-
-    dx = XYZ[:, 0]-srcLoc[0]
-    dy = XYZ[:, 1]-srcLoc[1]
-    dz = XYZ[:, 2]-srcLoc[2]
-
-    r = np.sqrt(dx**2. + dy**2. + dz**2.)
-    # k  = np.sqrt( -1j*2.*np.pi*f*mu*sig )
-    k = np.sqrt(omega(f)**2. * mu*epsilon - 1j*omega(f)*mu*sig)
 
-    front = current * length / (4.*np.pi*(r)**2) * (1j*k*r + 1) * np.exp(-1j*k*r)
-
-    if orientation.upper() == 'X':
-        Hy = front*(-dz / r)
-        Hz = front*(dy / r)
-        Hx = np.zeros_like(Hy)
-        return Hx, Hy, Hz
-
-    elif orientation.upper() == 'Y':
-        Hx = front*(dz / r)
-        Hz = front*(-dx / r)
-        Hy = np.zeros_like(Hx)
-        return Hx, Hy, Hz
-
-    elif orientation.upper() == 'Z':
-        Hx = front*(-dy / r)
-        Hy = front*(dx / r)
-        Hz = np.zeros_like(Hx)
-        return Hx, Hy, Hz
+    return ElectricDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['H'], current=current, length=length,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['H']
 
 
+@broadcastKernel(geometry=True)
 def B_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -251,15 +129,14 @@ def B_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1.,
         TODO:
             Add description of parameters
     """
-    mu = mu_0*(1+kappa)
 
-    Hx, Hy, Hz = H_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=current, length=length, orientation=orientation, kappa=kappa, epsr=epsr)
-    Bx = mu*Hx
-    By = mu*Hy
-    Bz = mu*Hz
-    return Bx, By, Bz
+    return ElectricDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['B'], current=current, length=length,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['B']
 
 
+@broadcastKernel(geometry=True)
 def A_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -267,41 +144,14 @@ def A_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., length=1.,
         TODO:
             Add description of parameters
     """
-    mu = mu_0*(1+kappa)
-    epsilon = epsilon_0*epsr
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & f.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single frequency can be specified.")
-
-    dx = XYZ[:,0]-srcLoc[0]
-    dy = XYZ[:,1]-srcLoc[1]
-    dz = XYZ[:,2]-srcLoc[2]
-
-    r  = np.sqrt( dx**2. + dy**2. + dz**2.)
-    k  = np.sqrt( omega(f)**2. *mu*epsilon -1j*omega(f)*mu*sig )
-
-    front = current * length / (4.*np.pi*r)
-
-    if orientation.upper() == 'X':
-        Ax = front*np.exp(-1j*k*r)
-        Ay = np.zeros_like(Ax)
-        Az = np.zeros_like(Ax)
-        return Ax, Ay, Az
 
-    elif orientation.upper() == 'Y':
-        Ay = front*np.exp(-1j*k*r)
-        Ax = np.zeros_like(Ay)
-        Az = np.zeros_like(Ay)
-        return Ax, Ay, Az
-
-    elif orientation.upper() == 'Z':
-        Az = front*np.exp(-1j*k*r)
-        Ax = np.zeros_like(Ay)
-        Ay = np.zeros_like(Ay)
-        return Ax, Ay, Az
+    return ElectricDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['A'], current=current, length=length,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['A']
 
 
+@broadcastKernel(geometry=True)
 def E_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., loopArea=1., orientation='X', kappa=0., epsr=1., t=0.):
 
     """
@@ -309,44 +159,14 @@ def E_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., loopArea=1.
         TODO:
             Add description of parameters
     """
-    mu = mu_0 * (1+kappa)
-    epsilon = epsilon_0 * epsr
-    m = current * loopArea
-
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & f.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single frequency can be specified.")
-
-    dx = XYZ[:,0]-srcLoc[0]
-    dy = XYZ[:,1]-srcLoc[1]
-    dz = XYZ[:,2]-srcLoc[2]
-
-    r  = np.sqrt( dx**2. + dy**2. + dz**2.)
-    # k  = np.sqrt( -1j*2.*np.pi*f*mu*sig )
-    k  = np.sqrt( omega(f)**2. *mu*epsilon -1j*omega(f)*mu*sig )
-
-    front = ((1j * omega(f) * mu * m) / (4.* np.pi * r**2)) * (1j * k * r + 1) * np.exp(-1j*k*r)
 
-    if orientation.upper() == 'X':
-        Ey = front * (dz / r)
-        Ez = front * (-dy / r)
-        Ex = np.zeros_like(Ey)
-        return Ex, Ey, Ez
-
-    elif orientation.upper() == 'Y':
-        Ex = front * (-dz / r)
-        Ez = front * (dx / r)
-        Ey = np.zeros_like(Ex)
-        return Ex, Ey, Ez
-
-    elif orientation.upper() == 'Z':
-        Ex = front * (dy / r)
-        Ey = front * (-dx / r)
-        Ez = np.zeros_like(Ex)
-        return Ex, Ey, Ez
+    return MagneticDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['E'], current=current, loopArea=loopArea,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['E']
 
 
+@broadcastKernel(geometry=True)
 def J_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., loopArea=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -355,13 +175,13 @@ def J_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., loopArea=1.
             Add description of parameters
     """
 
-    Ex, Ey, Ez = E_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=current, loopArea=loopArea, orientation=orientation, kappa=kappa, epsr=epsr)
-    Jx = sig * Ex
-    Jy = sig * Ey
-    Jz = sig * Ez
-    return Jx, Jy, Jz
+    return MagneticDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['J'], current=current, loopArea=loopArea,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['J']
 
 
+@broadcastKernel(geometry=True)
 def H_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., loopArea=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -369,47 +189,14 @@ def H_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., loopArea=1.
         TODO:
             Add description of parameters
     """
-    mu = mu_0 * (1+kappa)
-    epsilon = epsilon_0 * epsr
-    m = current * loopArea
-
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & f.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single frequency can be specified.")
-
-    dx = XYZ[:, 0]-srcLoc[0]
-    dy = XYZ[:, 1]-srcLoc[1]
-    dz = XYZ[:, 2]-srcLoc[2]
 
-    r = np.sqrt(dx**2. + dy**2. + dz**2.)
-    # k  = np.sqrt( -1j*2.*np.pi*f*mu*sig )
-    k = np.sqrt(omega(f)**2. * mu*epsilon - 1j*omega(f)*mu*sig)
-
-    front = m / (4.*np.pi*(r)**3) * np.exp(-1j*k*r)
-    mid   = -k**2 * r**2 + 3*1j*k*r + 3
-
-    if orientation.upper() == 'X':
-        Hx = front*((dx**2 / r**2)*mid + (k**2 * r**2 - 1j*k*r - 1.))
-        Hy = front*(dx*dy  / r**2)*mid
-        Hz = front*(dx*dz  / r**2)*mid
-        return Hx, Hy, Hz
-
-    elif orientation.upper() == 'Y':
-        #  x--> y, y--> z, z-->x
-        Hy = front * ((dy**2 / r**2)*mid + (k**2 * r**2 - 1j*k*r - 1.))
-        Hz = front * (dy*dz  / r**2)*mid
-        Hx = front * (dy*dx  / r**2)*mid
-        return Hx, Hy, Hz
-
-    elif orientation.upper() == 'Z':
-        # x --> z, y --> x, z --> y
-        Hz = front*((dz**2 / r**2)*mid + (k**2 * r**2 - 1j*k*r - 1.))
-        Hx = front*(dz*dx  / r**2)*mid
-        Hy = front*(dz*dy  / r**2)*mid
-        return Hx, Hy, Hz
+    return MagneticDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['H'], current=current, loopArea=loopArea,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['H']
 
 
+@broadcastKernel(geometry=True)
 def B_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., loopArea=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -417,15 +204,14 @@ def B_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., loopArea=1.
         TODO:
             Add description of parameters
     """
-    mu = mu_0 * (1+kappa)
 
-    Hx, Hy, Hz = H_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=current, loopArea=loopArea, orientation=orientation, kappa=kappa, epsr=epsr)
-    Bx = mu * Hx
-    By = mu * Hy
-    Bz = mu * Hz
-    return Bx, By, Bz
+    return MagneticDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['B'], current=current, loopArea=loopArea,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['B']
 
 
+@broadcastKernel(geometry=True)
 def F_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., loopArea=1., orientation='X', kappa=1., epsr=1., t=0.):
 
     """
@@ -433,41 +219,292 @@ def F_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, f, current=1., loopArea=1.
         TODO:
             Add description of parameters
     """
-    mu = mu_0 * (1+kappa)
-    epsilon = epsilon_0*epsr
-    m = current * loopArea
 
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & f.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single frequency can be specified.")
+    return MagneticDipoleWholeSpaceFields(
+        XYZ, srcLoc, sig, f, ['F'], current=current, loopArea=loopArea,
+        orientation=orientation, kappa=kappa, epsr=epsr
+    )['F']
+
+
+# Fused kernels: every field asked for is computed in one call, J from E
+# and B from H without recomputing them, and the galvanic and inductive
+# parts of E together. The dipole terms are evaluated by KernelBackends
+# (a compiled loop with numba or numexpr, NumPy otherwise); the
+# *_from_*DipoleWholeSpace functions above return one field of these.
+
+electricDipoleFields = [
+    'E', 'E_galvanic', 'E_inductive', 'J', 'J_galvanic', 'J_inductive', 'H',
+    'B', 'A'
+]
+magneticDipoleFields = ['E', 'J', 'H', 'B', 'F']
+
 
-    dx = XYZ[:,0]-srcLoc[0]
-    dy = XYZ[:,1]-srcLoc[1]
-    dz = XYZ[:,2]-srcLoc[2]
+def _orientationIndex(orientation):
+    if orientation.upper() not in ['X', 'Y', 'Z']:
+        raise Exception("orientation should be 'X', 'Y' or 'Z'")
+    return 'XYZ'.index(orientation.upper())
 
-    r  = np.sqrt( dx**2. + dy**2. + dz**2.)
-    k  = np.sqrt( omega(f)**2. *mu*epsilon -1j*omega(f)*mu*sig )
 
-    front = (1j * omega(f) * mu * m) / (4.* np.pi * r)
+def _checkFields(fields, available):
+    if np.isscalar(fields):
+        fields = [fields]
+    for name in fields:
+        if name not in available:
+            raise Exception(
+                "fields should be in {}".format(", ".join(available))
+            )
+    return list(fields)
 
-    if orientation.upper() == 'X':
-        Fx = front*np.exp(-1j*k*r)
-        Fy = np.zeros_like(Fx)
-        Fz = np.zeros_like(Fx)
-        return Fx, Fy, Fz
 
-    elif orientation.upper() == 'Y':
-        Fy = front*np.exp(-1j*k*r)
-        Fx = np.zeros_like(Fy)
-        Fz = np.zeros_like(Fy)
-        return Fx, Fy, Fz
+def _geometry(XYZ, srcLoc):
+    """
+        Offsets of the recievers XYZ, an array, an AxisGrid or a
+        DipoleGeometry prepared for srcLoc
+    """
+    if not isinstance(
+        XYZ, (KernelBackends.DipoleGeometry, KernelBackends.AxisGrid)
+    ):
+        XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
+    return KernelBackends.dipoleGeometry(XYZ, srcLoc)
+
+
+def _potential(g, k, scale):
+    """
+        scale exp(-ikr) / r
+    """
+    out = KernelBackends.cexp(g.r * (-1j*k))
+    out *= scale
+    out /= g.r
+    return out
 
-    elif orientation.upper() == 'Z':
-        Fz = front*np.exp(-1j*k*r)
-        Fx = np.zeros_like(Fy)
-        Fy = np.zeros_like(Fy)
-        return Fx, Fy, Fz
 
+def _along(io, value):
+    out = [np.zeros_like(value), np.zeros_like(value), np.zeros_like(value)]
+    out[io] = value
+    return out
 
 
+def _scaled(comps, factor, inplace):
+    if inplace:
+        for c in comps:
+            c *= factor
+        return comps
+    return [factor * c for c in comps]
+
+
+@broadcastKernel(geometry=True)
+def ElectricDipoleWholeSpaceFields(XYZ, srcLoc, sig, f, fields=('E',), current=1., length=1., orientation='X', kappa=0., epsr=1.):
+    """
+        Computing several fields of an electrical dipole in a wholespace at
+        once
+
+        :param numpy.array XYZ: reciever locations, or a DipoleGeometry
+                                prepared for srcLoc
+        :param numpy.array srcLoc: [x,y,z] location of the dipole
+        :param numpy.array sig: conductivities (S/m) of the wholespace
+        :param numpy.array f: frequencies (Hz)
+        :param list fields: fields to compute, any of electricDipoleFields
+                            (E, E_galvanic, E_inductive, J, J_galvanic,
+                            J_inductive, H, B, A)
+        :param float current: current (A)
+        :param float length: length of the dipole (m)
+        :param str orientation: 'X', 'Y' or 'Z'
+        :param float kappa: magnetic susceptiblity
+        :param float epsr: relative permitivitty
+        :rtype: dict
+        :return: the (x, y, z) components of each field, broadcast over
+                 the locations, frequencies and conductivities as
+                 (nloc, nfreq, nsig) arrays (see ChunkedKernels)
+    """
+    fields = _checkFields(fields, electricDipoleFields)
+    io = _orientationIndex(orientation)
+    mu = mu_0*(1+kappa)
+    epsilon = epsilon_0*epsr
+    sig_hat = sig + 1j*omega(f)*epsilon
+    k = KernelBackends.csqrt(omega(f)**2. * mu*epsilon - 1j*omega(f)*mu*sig)
+
+    g = _geometry(XYZ, srcLoc)
+    out = {}
+
+    galvanic = 'E_galvanic' in fields or 'J_galvanic' in fields
+    inductive = 'E_inductive' in fields or 'J_inductive' in fields
+    total = 'E' in fields or 'J' in fields
+    if galvanic or inductive or total:
+        Gx, Gy, Gz, Einductive = KernelBackends.fdemDyadic(
+            g, k, current * length / (4.*np.pi*sig_hat), io
+        )
+        Egalvanic = [Gx, Gy, Gz]
+        if total:
+            E = [c.copy() for c in Egalvanic] if galvanic else Egalvanic
+            E[io] += Einductive
+            if 'E' in fields:
+                out['E'] = tuple(E)
+            if 'J' in fields:
+                out['J'] = tuple(_scaled(E, sig, 'E' not in fields))
+        if galvanic:
+            if 'E_galvanic' in fields:
+                out['E_galvanic'] = tuple(Egalvanic)
+            if 'J_galvanic' in fields:
+                out['J_galvanic'] = tuple(
+                    _scaled(Egalvanic, sig, 'E_galvanic' not in fields)
+                )
+        if inductive:
+            Einductive = _along(io, Einductive)
+            if 'E_inductive' in fields:
+                out['E_inductive'] = tuple(Einductive)
+            if 'J_inductive' in fields:
+                out['J_inductive'] = tuple(
+                    _scaled(Einductive, sig, 'E_inductive' not in fields)
+                )
+
+    if 'H' in fields or 'B' in fields:
+        H = list(KernelBackends.fdemCurl(
+            g, k, current * length / (4.*np.pi), io
+        ))
+        if 'H' in fields:
+            out['H'] = tuple(H)
+        if 'B' in fields:
+            out['B'] = tuple(_scaled(H, mu, 'H' not in fields))
+
+    if 'A' in fields:
+        A = _potential(g, k, current * length / (4.*np.pi))
+        out['A'] = tuple(_along(io, A))
+
+    return out
+
+
+@broadcastKernel(geometry=True)
+def MagneticDipoleWholeSpaceFields(XYZ, srcLoc, sig, f, fields=('H',), current=1., loopArea=1., orientation='X', kappa=0., epsr=1.):
+    """
+        Computing several fields of a magnetic dipole in a wholespace at
+        once
+
+        :param numpy.array XYZ: reciever locations, or a DipoleGeometry
+                                prepared for srcLoc
+        :param numpy.array srcLoc: [x,y,z] location of the dipole
+        :param numpy.array sig: conductivities (S/m) of the wholespace
+        :param numpy.array f: frequencies (Hz)
+        :param list fields: fields to compute, any of magneticDipoleFields
+                            (E, J, H, B, F)
+        :param float current: current (A)
+        :param float loopArea: area of the loop (m^2)
+        :param str orientation: 'X', 'Y' or 'Z'
+        :param float kappa: magnetic susceptiblity
+        :param float epsr: relative permitivitty
+        :rtype: dict
+        :return: the (x, y, z) components of each field, broadcast over
+                 the locations, frequencies and conductivities as
+                 (nloc, nfreq, nsig) arrays (see ChunkedKernels)
+    """
+    fields = _checkFields(fields, magneticDipoleFields)
+    io = _orientationIndex(orientation)
+    mu = mu_0*(1+kappa)
+    epsilon = epsilon_0*epsr
+    m = current * loopArea
+    k = KernelBackends.csqrt(omega(f)**2. * mu*epsilon - 1j*omega(f)*mu*sig)
+
+    g = _geometry(XYZ, srcLoc)
+    out = {}
+
+    if 'E' in fields or 'J' in fields:
+        # (r x e) = -(e x r)
+        E = list(KernelBackends.fdemCurl(
+            g, k, -1j * omega(f) * mu * m / (4.*np.pi), io
+        ))
+        if 'E' in fields:
+            out['E'] = tuple(E)
+        if 'J' in fields:
+            out['J'] = tuple(_scaled(E, sig, 'E' not in fields))
+
+    if 'H' in fields or 'B' in fields:
+        Hx, Hy, Hz, Hinductive = KernelBackends.fdemDyadic(
+            g, k, m / (4.*np.pi), io
+        )
+        H = [Hx, Hy, Hz]
+        H[io] += Hinductive
+        if 'H' in fields:
+            out['H'] = tuple(H)
+        if 'B' in fields:
+            out['B'] = tuple(_scaled(H, mu, 'H' not in fields))
+
+    if 'F' in fields:
+        F = _potential(g, k, 1j * omega(f) * mu * m / (4.*np.pi))
+        out['F'] = tuple(_along(io, F))
+
+    return out
+
+
+def benchmarkDipoleFields(n=100000, f=1e3, sig=1e-2, nrepeat=5):
+    """
+        Time of the fused kernels against one *_from_*DipoleWholeSpace call
+        per field, for all the fields of each dipole at n random locations
+
+        :rtype: dict
+        :return: best times (s) of the separate calls and fused kernels,
+                 and the largest relative difference between their fields
+    """
+    import time
+
+    XYZ = np.random.RandomState(0).randn(n, 3) * 100.
+    srcLoc = np.r_[0., 0., 0.]
+    f = np.r_[f]
+    separate = {
+        'electric': {
+            'E': E_from_ElectricDipoleWholeSpace,
+            'E_galvanic': E_galvanic_from_ElectricDipoleWholeSpace,
+            'E_inductive': E_inductive_from_ElectricDipoleWholeSpace,
+            'J': J_from_ElectricDipoleWholeSpace,
+            'J_galvanic': J_galvanic_from_ElectricDipoleWholeSpace,
+            'J_inductive': J_inductive_from_ElectricDipoleWholeSpace,
+            'H': H_from_ElectricDipoleWholeSpace,
+            'B': B_from_ElectricDipoleWholeSpace,
+            'A': A_from_ElectricDipoleWholeSpace,
+        },
+        'magnetic': {
+            'E': E_from_MagneticDipoleWholeSpace,
+            'J': J_from_MagneticDipoleWholeSpace,
+            'H': H_from_MagneticDipoleWholeSpace,
+            'B': B_from_MagneticDipoleWholeSpace,
+            'F': F_from_MagneticDipoleWholeSpace,
+        },
+    }
+    fused = {
+        'electric': ElectricDipoleWholeSpaceFields,
+        'magnetic': MagneticDipoleWholeSpaceFields,
+    }
+
+    def best(fun):
+        times = []
+        for _ in range(nrepeat):
+            t0 = time.time()
+            out = fun()
+            times.append(time.time() - t0)
+        return min(times), out
+
+    results = {}
+    for dipole in ['electric', 'magnetic']:
+        funcs = separate[dipole]
+        # same kappa for all, the separate functions differ in their default
+        tSeparate, outSeparate = best(lambda: dict(
+            (name, fun(XYZ, srcLoc, sig, f, kappa=0.))
+            for name, fun in funcs.items()
+        ))
+        tFused, outFused = best(lambda: fused[dipole](
+            XYZ, srcLoc, sig, f, fields=list(funcs), kappa=0.
+        ))
+        error = max(
+            np.abs(np.r_[outFused[name]] - np.r_[outSeparate[name]]).max() /
+            np.abs(np.r_[outSeparate[name]]).max()
+            for name in funcs
+        )
+        results[dipole] = {
+            'separate': tSeparate, 'fused': tFused, 'error': error
+        }
+        print(
+            "{} dipole, {} fields at {} locations: separate {:.3f} s, "
+            "fused {:.3f} s ({:.1f}x), max rel. difference {:.1e}".format(
+                dipole, len(funcs), n, tSeparate, tFused,
+                tSeparate / tFused, error
+            )
+        )
+    return results
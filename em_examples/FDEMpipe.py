@@ -7,6 +7,10 @@ warnings.filterwarnings('ignore')
 
 from ipywidgets import interactive, IntSlider, widget, FloatText, FloatSlider, Checkbox
 
+if __package__:
+    from . import _set_rcParams
+    _set_rcParams()
+
 
 def fempipeWidget(alpha, pipedepth):
     respEW, respNS, X, Y = fempipe(alpha, pipedepth)
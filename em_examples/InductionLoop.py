@@ -12,6 +12,8 @@ import numpy as np
 import scipy.special as sp
 import matplotlib.pyplot as plt
 from matplotlib.ticker import ScalarFormatter, FormatStrFormatter
+from . import _set_rcParams
+_set_rcParams()
 
 
 
@@ -8,6 +8,12 @@ from matplotlib.ticker import ScalarFormatter, FormatStrFormatter
 from matplotlib.path import Path
 import matplotlib.patches as patches
 
+from .ChunkedKernels import evalElementwise
+from .KernelBackends import sphereField
+
+from . import _set_rcParams
+_set_rcParams()
+
 
 ##############################################
 #   PLOTTING FUNCTIONS FOR WIDGETS
@@ -463,14 +469,17 @@ class SphereFEM():
         mx = 4*np.pi*a**3*chi*Hpx/3
         my = 4*np.pi*a**3*chi*Hpy/3
         mz = 4*np.pi*a**3*chi*Hpz/3
-        R = np.sqrt((X-x0)**2 + (Y-y0)**2 + (Z-z0)**2)
 
-        Hx = (1/(4*np.pi))*(3*(X-x0)*(mx*(X-x0) + my*(Y-y0) + mz*(Z-z0))/R**5 - mx/R**3)
-        Hy = (1/(4*np.pi))*(3*(Y-y0)*(mx*(X-x0) + my*(Y-y0) + mz*(Z-z0))/R**5 - my/R**3)
-        Hz = (1/(4*np.pi))*(3*(Z-z0)*(mx*(X-x0) + my*(Y-y0) + mz*(Z-z0))/R**5 - mz/R**3)
-        Habs = np.sqrt(np.real(Hx)**2 + np.real(Hy)**2 + np.real(Hz)**2) + 1j*np.sqrt(np.imag(Hx)**2 + np.imag(Hy)**2 + np.imag(Hz)**2)
+        def response(X, Y, Z, mx, my, mz):
+            Hx, Hy, Hz = sphereField(
+                X-x0, Y-y0, Z-z0, mx, my, mz, 1/(4*np.pi)
+            )
+            Habs = np.sqrt(np.real(Hx)**2 + np.real(Hy)**2 + np.real(Hz)**2) + 1j*np.sqrt(np.imag(Hx)**2 + np.imag(Hy)**2 + np.imag(Hz)**2)
+
+            return Hx, Hy, Hz, Habs
 
-        return Hx, Hy, Hz, Habs
+        # in blocks of receivers (or frequencies) on the thread pool
+        return evalElementwise(response, X, Y, Z, mx, my, mz)
 
 
 
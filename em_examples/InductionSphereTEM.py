@@ -9,6 +9,12 @@ from matplotlib.ticker import ScalarFormatter, FormatStrFormatter
 from matplotlib.path import Path
 import matplotlib.patches as patches
 
+from .ChunkedKernels import evalElementwise
+from .KernelBackends import sphereField
+
+from . import _set_rcParams
+_set_rcParams()
+
 
 ##############################################
 #   PLOTTING FUNCTIONS FOR WIDGETS
@@ -564,14 +570,17 @@ class SphereTEM():
         mx = 4*np.pi*a**3*chi*Hpx/3
         my = 4*np.pi*a**3*chi*Hpy/3
         mz = 4*np.pi*a**3*chi*Hpz/3
-        R = np.sqrt((X-x0)**2 + (Y-y0)**2 + (Z-z0)**2)
 
-        Bx = (1e-9)*(3*(X-x0)*(mx*(X-x0) + my*(Y-y0) + mz*(Z-z0))/R**5 - mx/R**3)
-        By = (1e-9)*(3*(Y-y0)*(mx*(X-x0) + my*(Y-y0) + mz*(Z-z0))/R**5 - my/R**3)
-        Bz = (1e-9)*(3*(Z-z0)*(mx*(X-x0) + my*(Y-y0) + mz*(Z-z0))/R**5 - mz/R**3)
-        Babs = np.sqrt(Bx**2 + By**2 + Bz**2)
+        def response(X, Y, Z, mx, my, mz):
+            Bx, By, Bz = sphereField(
+                X-x0, Y-y0, Z-z0, mx, my, mz, 1e-9
+            )
+            Babs = np.sqrt(Bx**2 + By**2 + Bz**2)
+
+            return Bx, By, Bz, Babs
 
-        return Bx, By, Bz, Babs
+        # in blocks of receivers (or times) on the thread pool
+        return evalElementwise(response, X, Y, Z, mx, my, mz)
 
 
 
@@ -0,0 +1,774 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import cmath
+import math
+import time
+
+import numpy as np
+from scipy.special import erf
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+# Compiled backends of the elementwise dipole and sphere formulas.
+#
+# With NumPy every operation of a formula makes a temporary array the size
+# of the receivers. The numba backend compiles each formula into a single
+# loop over the receivers (releasing the GIL, so that the ChunkedKernels
+# threads run in parallel); the numexpr backend evaluates each output in
+# one blocked pass. The backend is numba, else numexpr, else NumPy,
+# depending on what is installed; numexpr has no erf, so the TDEM formulas
+# fall back to NumPy with it.
+#
+# The dipole kernels take a DipoleGeometry: the offsets from the source to
+# the receivers and, computed on first use, their distances r, 1 / r^3 and
+# the products d_i d_j / r^2. These only depend on the receivers and the
+# source, so a geometry prepared once for a grid (DataView) is passed to
+# the kernels for every conductivity, frequency or time, which then only
+# evaluate the exp / erf terms. The sphere kernel takes the offsets. The
+# array arguments of the kernels broadcast against each other.
+#
+# A grid of receivers is given as an AxisGrid, the sparse axis vectors of
+# numpy.meshgrid(sparse=True): the geometry ravels each offset straight from
+# its axis, and the (n, 3) locations are only built a block at a time (see
+# ChunkedKernels.broadcastKernel), or on request for the functions taking
+# arbitrary points.
+
+kernelBackends = ['numpy', 'numexpr', 'numba']
+
+_backend = {
+    'name': (
+        'numba' if numba is not None else
+        'numexpr' if numexpr is not None else 'numpy'
+    )
+}
+
+
+def setKernelBackend(name):
+    """
+        Backend of the dipole and sphere kernels: 'numpy', 'numexpr' or
+        'numba'
+    """
+    if name not in kernelBackends:
+        raise Exception(
+            "name should be one of {}".format(", ".join(kernelBackends))
+        )
+    if (
+        (name == 'numba' and numba is None) or
+        (name == 'numexpr' and numexpr is None)
+    ):
+        raise Exception("{} is not installed".format(name))
+    _backend['name'] = name
+
+
+def getKernelBackend():
+    return _backend['name']
+
+
+def availableKernelBackends():
+    return [
+        name for name, module in zip(kernelBackends, [np, numexpr, numba])
+        if module is not None
+    ]
+
+
+def _prepare(*arrays):
+    """
+        Broadcast the arrays against each other, as contiguous 1D arrays
+    """
+    arrays = [np.asarray(a) for a in arrays]
+    shape = np.broadcast(*arrays).shape
+    flat = [
+        np.ascontiguousarray(np.broadcast_to(a, shape)).reshape(-1)
+        for a in arrays
+    ]
+    return shape, flat
+
+
+class AxisGrid(object):
+    """
+        Receivers on a grid, given by three coordinates broadcasting to the
+        grid shape: the axis vectors of numpy.meshgrid(sparse=True) and a
+        scalar for the coordinate normal to a plane. The receivers are
+        ordered as the raveled grid.
+
+        :param numpy.array x: x coordinates
+        :param numpy.array y: y coordinates
+        :param numpy.array z: z coordinates
+    """
+
+    def __init__(self, x, y, z):
+        self.axes = [np.asarray(a, dtype=float) for a in [x, y, z]]
+        self.shape = np.broadcast(*self.axes).shape
+
+    @property
+    def n(self):
+        return int(np.prod(self.shape))
+
+    def coordinate(self, i, offset=0.):
+        """
+            Coordinate i (0, 1, 2 for x, y, z) of the receivers, minus
+            offset, as a 1D array
+        """
+        return np.broadcast_to(self.axes[i] - offset, self.shape).ravel()
+
+    @property
+    def XYZ(self):
+        """
+            (n, 3) reciever locations, for the functions taking arbitrary
+            points
+        """
+        out = np.empty((self.n, 3))
+        for i, a in enumerate(self.axes):
+            out.reshape(self.shape + (3,))[..., i] = a
+        return out
+
+    def take(self, start, stop, repeats=1, dtype=float):
+        """
+            (m, 3) locations of the receivers start to stop, each repeated
+        """
+        out = np.empty((stop - start, 3), dtype=dtype)
+        for i, a in enumerate(self.axes):
+            out[:, i] = np.broadcast_to(a, self.shape).flat[start:stop]
+        if repeats != 1:
+            out = np.repeat(out, repeats, axis=0)
+        return out
+
+
+class DipoleGeometry(object):
+    """
+        Offsets d = XYZ - srcLoc of the receivers, with their distance r,
+        1 / r^3 and the products d_i d_j / r^2 computed on first use
+
+        The names of the terms the kernels ask for, on the geometry or on
+        the blocks and casts taken from it, are kept in usedTerms, so that
+        only those are prepared (see View.DataView).
+
+        :param numpy.array XYZ: (n, 3) reciever locations, or an AxisGrid
+        :param numpy.array srcLoc: [x,y,z] location of the dipole
+    """
+
+    def __init__(self, XYZ, srcLoc):
+        self.srcLoc = np.asarray(srcLoc)
+        if isinstance(XYZ, AxisGrid):
+            self._arrays = dict(
+                (name, XYZ.coordinate(i, self.srcLoc[i]))
+                for i, name in enumerate(['dx', 'dy', 'dz'])
+            )
+        else:
+            XYZ = np.asarray(XYZ)
+            self._arrays = dict(
+                (name, XYZ[:, i] - self.srcLoc[i])
+                for i, name in enumerate(['dx', 'dy', 'dz'])
+            )
+        self._casts = {}
+        self._used = set()
+
+    @classmethod
+    def _fromArrays(cls, srcLoc, arrays, used=None):
+        geometry = cls.__new__(cls)
+        geometry.srcLoc = srcLoc
+        geometry._arrays = arrays
+        geometry._casts = {}
+        geometry._used = set() if used is None else used
+        return geometry
+
+    @classmethod
+    def fromTerms(cls, srcLoc, names, arrays):
+        """
+            Geometry of the terms names (see terms), e.g. kept in a cache
+        """
+        return cls._fromArrays(np.asarray(srcLoc), dict(zip(names, arrays)))
+
+    @property
+    def n(self):
+        return self._arrays['dx'].size
+
+    @property
+    def dx(self):
+        return self._arrays['dx']
+
+    @property
+    def dy(self):
+        return self._arrays['dy']
+
+    @property
+    def dz(self):
+        return self._arrays['dz']
+
+    @property
+    def XYZ(self):
+        return np.c_[self.dx, self.dy, self.dz] + self.srcLoc
+
+    @property
+    def usedTerms(self):
+        """
+            Names of the terms the kernels used, offsets included
+        """
+        return ('dx', 'dy', 'dz') + tuple(sorted(self._used))
+
+    @property
+    def r(self):
+        self._used.add('r')
+        if 'r' not in self._arrays:
+            self._arrays['r'] = np.sqrt(
+                self.dx**2 + self.dy**2 + self.dz**2
+            )
+        return self._arrays['r']
+
+    @property
+    def r3inv(self):
+        self._used.add('r3inv')
+        if 'r3inv' not in self._arrays:
+            r = self.r
+            self._arrays['r3inv'] = 1. / (r * r * r)
+        return self._arrays['r3inv']
+
+    def _dyadTerm(self, i, j):
+        i, j = min(i, j), max(i, j)
+        name = 'd' + 'xyz'[i] + 'xyz'[j]
+        self._used.add(name)
+        if name not in self._arrays:
+            d = [self.dx, self.dy, self.dz]
+            r = self.r
+            self._arrays[name] = d[i] * d[j] / (r * r)
+        return self._arrays[name]
+
+    def dyad(self, io):
+        """
+            d_io d_j / r^2, for j = x, y, z
+        """
+        return [self._dyadTerm(io, j) for j in range(3)]
+
+    def prepare(self, names=None):
+        """
+            Compute the terms names now (see usedTerms), all those of the
+            three orientations when None, to reuse them in every evaluation
+        """
+        if names is None:
+            self.r3inv
+            for io in range(3):
+                self.dyad(io)
+            return self
+        for name in names:
+            if name in ('r', 'r3inv'):
+                getattr(self, name)
+            elif name not in ('dx', 'dy', 'dz'):
+                self._dyadTerm('xyz'.index(name[1]), 'xyz'.index(name[2]))
+        return self
+
+    def terms(self, names):
+        """
+            Arrays of the terms names, computed if needed
+        """
+        self.prepare(names)
+        return tuple(self._arrays[name] for name in names)
+
+    def take(self, start, stop, repeats=1):
+        """
+            Geometry of the receivers start to stop, each repeated
+        """
+        arrays = dict(
+            (name, a[start:stop] if repeats == 1 else
+             np.repeat(a[start:stop], repeats))
+            for name, a in self._arrays.items()
+        )
+        return DipoleGeometry._fromArrays(self.srcLoc, arrays, self._used)
+
+    def astype(self, dtype):
+        """
+            Geometry with arrays of dtype, kept to be reused by the next
+            calls
+        """
+        dtype = np.dtype(dtype)
+        if self.dx.dtype == dtype:
+            return self
+        if dtype not in self._casts:
+            arrays = dict(
+                (name, a.astype(dtype)) for name, a in self._arrays.items()
+            )
+            self._casts[dtype] = DipoleGeometry._fromArrays(
+                self.srcLoc, arrays, self._used
+            )
+        return self._casts[dtype]
+
+
+def dipoleGeometry(XYZ, srcLoc):
+    """
+        DipoleGeometry of (n, 3) locations or an AxisGrid XYZ, or XYZ
+        itself if it is a DipoleGeometry of the source srcLoc
+    """
+    if isinstance(XYZ, DipoleGeometry):
+        if not np.allclose(XYZ.srcLoc, srcLoc):
+            raise Exception(
+                "the geometry was prepared for another source location"
+            )
+        return XYZ
+    return DipoleGeometry(XYZ, srcLoc)
+
+
+# NumPy
+
+def cexp(z):
+    """
+        exp(z) of a complex array; complex64 arrays go through the real
+        exp, cos and sin, which NumPy vectorizes in single precision (its
+        complex64 exp is slower than the complex128 one)
+    """
+    z = np.asarray(z)
+    if z.dtype != np.complex64:
+        return np.exp(z)
+    out = np.empty_like(z)
+    mag = np.exp(z.real)
+    np.multiply(mag, np.cos(z.imag), out=out.real)
+    np.multiply(mag, np.sin(z.imag), out=out.imag)
+    return out
+
+
+def csqrt(z):
+    """
+        sqrt(z) of a complex array; NumPy's complex64 sqrt is twice as slow
+        as computing it in complex128
+    """
+    z = np.asarray(z)
+    if z.dtype != np.complex64:
+        return np.sqrt(z)
+    return np.sqrt(z.astype(np.complex128)).astype(np.complex64)
+
+
+def _fdemDyadicNumpy(g, k, scale, io):
+    ikr = g.r * (1j*k)
+    front = scale * cexp(-ikr)
+    front *= g.r3inv
+    kr2 = ikr**2
+    np.negative(kr2, out=kr2)
+    mid = 3. * ikr
+    mid += 3.
+    mid -= kr2
+    a = front * mid
+    out = [a * dj for dj in g.dyad(io)]
+    out[io] += front * (-1. - ikr)
+    kr2 *= front
+    return out[0], out[1], out[2], kr2
+
+
+def _fdemCurlNumpy(g, k, scale, io):
+    ikr = g.r * (1j*k)
+    front = ikr + 1.
+    front *= cexp(-ikr)
+    front *= scale
+    front *= g.r3inv
+    return _crossNumpy([g.dx, g.dy, g.dz], io, front)
+
+
+def _crossNumpy(d, io, front):
+    j1, j2 = (io + 1) % 3, (io + 2) % 3
+    out = [None, None, None]
+    out[io] = np.zeros(
+        np.broadcast(front, d[io]).shape, dtype=np.result_type(front, d[io])
+    )
+    out[j1] = np.negative(front * d[j2])
+    out[j2] = front * d[j1]
+    return tuple(out)
+
+
+def _tdemDyadicNumpy(g, theta, scale, io):
+    tr = theta * g.r
+    gauss = np.exp(-tr**2) / np.sqrt(np.pi)
+    e = erf(tr)
+    front = scale * g.r3inv
+    mid = 3. * e - (4. * tr**3 + 6. * tr) * gauss
+    extra = e - (4. * tr**3 + 2. * tr) * gauss
+    a = front * mid
+    out = [a * dj for dj in g.dyad(io)]
+    out[io] -= front * extra
+    return tuple(out)
+
+
+def _tdemCurlNumpy(g, theta, scale, io):
+    tr = theta * g.r
+    front = scale * g.r3inv
+    front *= erf(tr) - 2. / np.sqrt(np.pi) * tr * np.exp(-tr**2)
+    return _crossNumpy([g.dx, g.dy, g.dz], io, front)
+
+
+def _sphereFieldNumpy(dx, dy, dz, mx, my, mz, scale):
+    R2 = dx**2 + dy**2 + dz**2
+    R = np.sqrt(R2)
+    R3 = R2 * R
+    mdotr = (mx*dx + my*dy + mz*dz) * 3. / (R3 * R2)
+    return tuple(
+        scale * (d * mdotr - m / R3)
+        for d, m in zip([dx, dy, dz], [mx, my, mz])
+    )
+
+
+# numexpr (no erf, the TDEM kernels use NumPy)
+
+def _fdemDyadicNumexpr(dx, dy, dz, k, scale, io):
+    ev = numexpr.evaluate
+    v = {'dx': dx, 'dy': dy, 'dz': dz, 'k': k, 'scale': scale}
+    v['r'] = ev("sqrt(dx*dx + dy*dy + dz*dz)", local_dict=v)
+    v['front'] = ev("scale*exp(-1j*k*r)/(r*r*r)", local_dict=v)
+    v['di'] = [dx, dy, dz][io]
+    v['a'] = ev("front*(3 + 3j*k*r - k*k*r*r)*di/(r*r)", local_dict=v)
+    out = []
+    for j, dj in enumerate([dx, dy, dz]):
+        v['dj'] = dj
+        if j == io:
+            out.append(ev("a*dj + front*(-1j*k*r - 1)", local_dict=v))
+        else:
+            out.append(ev("a*dj", local_dict=v))
+    return out[0], out[1], out[2], ev("front*k*k*r*r", local_dict=v)
+
+
+def _fdemCurlNumexpr(dx, dy, dz, k, scale, io):
+    v = {'dx': dx, 'dy': dy, 'dz': dz, 'k': k, 'scale': scale}
+    v['r'] = numexpr.evaluate("sqrt(dx*dx + dy*dy + dz*dz)", local_dict=v)
+    front = numexpr.evaluate(
+        "scale*(1j*k*r + 1)*exp(-1j*k*r)/(r*r*r)", local_dict=v
+    )
+    return _crossNumpy([dx, dy, dz], io, front)
+
+
+def _sphereFieldNumexpr(dx, dy, dz, mx, my, mz, scale):
+    ev = numexpr.evaluate
+    v = {
+        'dx': dx, 'dy': dy, 'dz': dz, 'mx': mx, 'my': my, 'mz': mz,
+        'scale': scale
+    }
+    v['R'] = ev("sqrt(dx*dx + dy*dy + dz*dz)", local_dict=v)
+    v['mdotr'] = ev("3*(mx*dx + my*dy + mz*dz)/(R*R*R*R*R)", local_dict=v)
+    out = []
+    for d, m in zip(['dx', 'dy', 'dz'], ['mx', 'my', 'mz']):
+        out.append(ev(
+            "scale*({}*mdotr - {}/(R*R*R))".format(d, m), local_dict=v
+        ))
+    return tuple(out)
+
+
+# numba (complex divisions by zero raise in numba whatever the error
+# model, so the loops multiply by real reciprocals, which give inf / nan at
+# the source as NumPy does)
+
+if numba is not None:
+
+    @numba.njit(nogil=True, error_model='numpy')
+    def _fdemDyadicLoop(dx, dy, dz, k, scale, io, G0, G1, G2, D):
+        for i in range(dx.shape[0]):
+            r2 = dx[i]*dx[i] + dy[i]*dy[i] + dz[i]*dz[i]
+            r = math.sqrt(r2)
+            ikr = 1j * k[i] * r
+            front = scale[i] * cmath.exp(-ikr) * (1. / (r2 * r))
+            di = dx[i] if io == 0 else dy[i] if io == 1 else dz[i]
+            a = front * (3. + 3.*ikr + ikr*ikr) * (di / r2)
+            diag = front * (-1. - ikr)
+            G0[i] = a * dx[i] + (diag if io == 0 else 0.)
+            G1[i] = a * dy[i] + (diag if io == 1 else 0.)
+            G2[i] = a * dz[i] + (diag if io == 2 else 0.)
+            D[i] = -front * ikr * ikr
+
+    @numba.njit(nogil=True, error_model='numpy')
+    def _fdemCurlLoop(dx, dy, dz, k, scale, io, C0, C1, C2):
+        for i in range(dx.shape[0]):
+            r2 = dx[i]*dx[i] + dy[i]*dy[i] + dz[i]*dz[i]
+            r = math.sqrt(r2)
+            ikr = 1j * k[i] * r
+            front = scale[i] * (ikr + 1.) * cmath.exp(-ikr) * (1. / (r2 * r))
+            _crossLoop(dx[i], dy[i], dz[i], io, front, C0, C1, C2, i)
+
+    @numba.njit(nogil=True, error_model='numpy')
+    def _crossLoop(dx, dy, dz, io, front, C0, C1, C2, i):
+        if io == 0:
+            C0[i], C1[i], C2[i] = 0., -front * dz, front * dy
+        elif io == 1:
+            C0[i], C1[i], C2[i] = front * dz, 0., -front * dx
+        else:
+            C0[i], C1[i], C2[i] = -front * dy, front * dx, 0.
+
+    @numba.njit(nogil=True, error_model='numpy')
+    def _tdemDyadicLoop(dx, dy, dz, theta, scale, io, G0, G1, G2):
+        sqrtpi = math.sqrt(math.pi)
+        for i in range(dx.shape[0]):
+            r2 = dx[i]*dx[i] + dy[i]*dy[i] + dz[i]*dz[i]
+            r = math.sqrt(r2)
+            tr = theta[i] * r
+            g = math.exp(-tr*tr) / sqrtpi
+            e = math.erf(tr)
+            front = scale[i] / (r2 * r)
+            mid = 3. * e - (4. * tr**3 + 6. * tr) * g
+            extra = front * (e - (4. * tr**3 + 2. * tr) * g)
+            di = dx[i] if io == 0 else dy[i] if io == 1 else dz[i]
+            a = front * mid * di / r2
+            G0[i] = a * dx[i] - (extra if io == 0 else 0.)
+            G1[i] = a * dy[i] - (extra if io == 1 else 0.)
+            G2[i] = a * dz[i] - (extra if io == 2 else 0.)
+
+    @numba.njit(nogil=True, error_model='numpy')
+    def _tdemCurlLoop(dx, dy, dz, theta, scale, io, C0, C1, C2):
+        sqrtpi = math.sqrt(math.pi)
+        for i in range(dx.shape[0]):
+            r2 = dx[i]*dx[i] + dy[i]*dy[i] + dz[i]*dz[i]
+            r = math.sqrt(r2)
+            tr = theta[i] * r
+            front = scale[i] / (r2 * r) * (
+                math.erf(tr) - 2. / sqrtpi * tr * math.exp(-tr*tr)
+            )
+            _crossLoop(dx[i], dy[i], dz[i], io, front, C0, C1, C2, i)
+
+    @numba.njit(nogil=True, error_model='numpy')
+    def _sphereFieldLoop(dx, dy, dz, mx, my, mz, scale, F0, F1, F2):
+        for i in range(dx.shape[0]):
+            R2 = dx[i]*dx[i] + dy[i]*dy[i] + dz[i]*dz[i]
+            R3inv = 1. / (R2 * math.sqrt(R2))
+            mdotr = 3. * (mx[i]*dx[i] + my[i]*dy[i] + mz[i]*dz[i]) * (
+                R3inv / R2
+            )
+            F0[i] = scale[i] * (dx[i] * mdotr - mx[i] * R3inv)
+            F1[i] = scale[i] * (dy[i] * mdotr - my[i] * R3inv)
+            F2[i] = scale[i] * (dz[i] * mdotr - mz[i] * R3inv)
+
+
+def _numbaKernel(loop, nout, dtype, arrays, io=None):
+    """
+        Run a numba loop on the broadcast arrays, into nout outputs
+    """
+    shape, flat = _prepare(*arrays)
+    args = flat if io is None else flat + [io]
+    outputs = [np.empty(flat[0].size, dtype=dtype) for _ in range(nout)]
+    loop(*(args + outputs))
+    return tuple(o.reshape(shape) for o in outputs)
+
+
+def _resultType(*arrays):
+    # python scalars do not promote float32 / complex64 arrays
+    return np.result_type(*arrays)
+
+
+def _cast(out, dtype):
+    return tuple(o.astype(dtype, copy=False) for o in out)
+
+
+# kernels
+#
+# The outputs have the precision of the inputs: float32 / complex64
+# offsets and wavenumbers give float32 / complex64 fields. The time domain
+# kernels compute in double whatever the inputs, as the erf terms cancel
+# at small theta r (single precision would lose all digits below
+# theta r ~ 0.05).
+
+def fdemDyadic(geometry, k, scale, io):
+    """
+        Frequency domain dipole term: with front = scale exp(-ikr) / r^3,
+
+            G_j = front ((d_io d_j / r^2)(-k^2 r^2 + 3ikr + 3)
+                  + delta_ij (-ikr - 1))
+            D = front k^2 r^2
+
+        G + delta_ij D is E of an electric dipole (scale = I L / (4 pi
+        sig_hat)) or H of a magnetic dipole (scale = m / (4 pi)), G its
+        galvanic and D its inductive part
+
+        :param DipoleGeometry geometry: offsets of the receivers
+        :rtype: tuple
+        :return: G_x, G_y, G_z, D
+    """
+    g = geometry
+    backend = _backend['name']
+    dtype = _resultType(g.dx, k, scale, 1j)
+    if backend == 'numba':
+        return _numbaKernel(
+            _fdemDyadicLoop, 4, dtype, [
+                g.dx, g.dy, g.dz, np.asarray(k).astype(dtype),
+                np.asarray(scale).astype(dtype)
+            ], io
+        )
+    if backend == 'numexpr':
+        return _cast(
+            _fdemDyadicNumexpr(g.dx, g.dy, g.dz, k, scale, io), dtype
+        )
+    return _fdemDyadicNumpy(g, k, scale, io)
+
+
+def fdemCurl(geometry, k, scale, io):
+    """
+        Frequency domain dipole curl term,
+        scale (ikr + 1) exp(-ikr) / r^3 (e_io x d): H of an electric dipole
+        (scale = I L / (4 pi)) or E of a magnetic dipole
+        (scale = -i omega mu m / (4 pi))
+    """
+    g = geometry
+    backend = _backend['name']
+    dtype = _resultType(g.dx, k, scale, 1j)
+    if backend == 'numba':
+        return _numbaKernel(
+            _fdemCurlLoop, 3, dtype, [
+                g.dx, g.dy, g.dz, np.asarray(k).astype(dtype),
+                np.asarray(scale).astype(dtype)
+            ], io
+        )
+    if backend == 'numexpr':
+        return _cast(_fdemCurlNumexpr(g.dx, g.dy, g.dz, k, scale, io), dtype)
+    return _fdemCurlNumpy(g, k, scale, io)
+
+
+def tdemDyadic(geometry, theta, scale, io):
+    """
+        Time domain dipole term, theta = sqrt(mu sig / 4t): with
+        front = scale / r^3,
+
+            G_j = front ((d_io d_j / r^2) mid - delta_ij extra)
+
+        E of an electric dipole (scale = I L / (4 pi sig)) or H of a
+        magnetic dipole (scale = m / (4 pi))
+    """
+    g = geometry.astype(float)
+    dtype = _resultType(geometry.dx, theta, scale)
+    theta, scale = [np.asarray(a, dtype=float) for a in [theta, scale]]
+    if _backend['name'] == 'numba':
+        out = _numbaKernel(
+            _tdemDyadicLoop, 3, float, [g.dx, g.dy, g.dz, theta, scale], io
+        )
+    else:
+        out = _tdemDyadicNumpy(g, theta, scale, io)
+    return _cast(out, dtype)
+
+
+def tdemCurl(geometry, theta, scale, io):
+    """
+        Time domain dipole curl term,
+        scale / r^3 (erf(theta r) - 2 / sqrt(pi) theta r exp(-theta^2 r^2))
+        (e_io x d): H of an electric dipole (scale = I L / (4 pi))
+    """
+    g = geometry.astype(float)
+    dtype = _resultType(geometry.dx, theta, scale)
+    theta, scale = [np.asarray(a, dtype=float) for a in [theta, scale]]
+    if _backend['name'] == 'numba':
+        out = _numbaKernel(
+            _tdemCurlLoop, 3, float, [g.dx, g.dy, g.dz, theta, scale], io
+        )
+    else:
+        out = _tdemCurlNumpy(g, theta, scale, io)
+    return _cast(out, dtype)
+
+
+def sphereField(dx, dy, dz, mx, my, mz, scale=1.):
+    """
+        Field of a dipole of moment m at offsets d:
+        scale (3 d (m . d) / R^5 - m / R^3)
+    """
+    backend = _backend['name']
+    dtype = _resultType(dx, mx, my, mz, scale)
+    if backend == 'numba':
+        return _numbaKernel(
+            _sphereFieldLoop, 3, dtype, [
+                dx, dy, dz, np.asarray(mx).astype(dtype),
+                np.asarray(my).astype(dtype), np.asarray(mz).astype(dtype),
+                np.asarray(scale).astype(dtype)
+            ]
+        )
+    if backend == 'numexpr':
+        return _cast(
+            _sphereFieldNumexpr(dx, dy, dz, mx, my, mz, scale), dtype
+        )
+    return _sphereFieldNumpy(dx, dy, dz, mx, my, mz, scale)
+
+
+def _kernelArguments(n, seed=0):
+    """
+        Random arguments of each kernel at n receivers
+    """
+    rng = np.random.RandomState(seed)
+    xyz = rng.rand(n, 3) * 200. - 100.
+    dx, dy, dz = xyz.T
+    g = DipoleGeometry(xyz, np.zeros(3))
+    k = np.sqrt(-1j * 2. * np.pi * 1e3 * 4e-7 * np.pi * 1e-2) * np.ones(n)
+    theta = np.sqrt(4e-7 * np.pi * 1e-2 / (4. * 1e-3)) * np.ones(n)
+    m = rng.rand(3, n) + 1j * rng.rand(3, n)
+    return {
+        'fdemDyadic': (fdemDyadic, (g, k, 1. / (4. * np.pi), 0)),
+        'fdemCurl': (fdemCurl, (g, k, 1. / (4. * np.pi), 1)),
+        'tdemDyadic': (tdemDyadic, (g, theta, 1. / (4. * np.pi), 2)),
+        'tdemCurl': (tdemCurl, (g, theta, 1. / (4. * np.pi), 0)),
+        'sphereField': (sphereField, (dx, dy, dz, m[0], m[1], m[2], 1e-9)),
+    }
+
+
+def _head(a, n=10):
+    if isinstance(a, DipoleGeometry):
+        return a.take(0, n)
+    return a[:n] if np.ndim(a) else a
+
+
+def checkKernelBackends(n=10**4):
+    """
+        Largest difference of each kernel, on each installed backend, to
+        the NumPy one at n random receivers, relative to the largest value
+        of the kernel
+
+        :rtype: dict
+        :return: {backend: {kernel: relative difference}}
+    """
+    kernels = _kernelArguments(n)
+    backend0 = _backend['name']
+    results = {}
+    try:
+        _backend['name'] = 'numpy'
+        reference = dict(
+            (name, func(*args)) for name, (func, args) in kernels.items()
+        )
+        for backend in availableKernelBackends():
+            _backend['name'] = backend
+            results[backend] = {}
+            for name, (func, args) in kernels.items():
+                results[backend][name] = max(
+                    np.max(np.abs(a - b))
+                    for a, b in zip(func(*args), reference[name])
+                ) / max(np.max(np.abs(b)) for b in reference[name])
+    finally:
+        _backend['name'] = backend0
+    return results
+
+
+def benchmarkKernelBackends(n=10**6, nrepeat=3):
+    """
+        Time of each kernel, on each installed backend, at n random
+        receivers (the numba loops are compiled before they are timed)
+
+        :rtype: dict
+        :return: {backend: {kernel: best time (s)}}
+    """
+    kernels = _kernelArguments(n)
+    backend0 = _backend['name']
+    results = {}
+    print("{:>12s} {:>8s} {:>10s} {:>8s}".format(
+        "kernel", "backend", "time (s)", "speedup"
+    ))
+    try:
+        for name, (func, args) in kernels.items():
+            for backend in availableKernelBackends():
+                _backend['name'] = backend
+                func(*[_head(a) for a in args])
+                times = []
+                for _ in range(nrepeat):
+                    t0 = time.time()
+                    func(*args)
+                    times.append(time.time() - t0)
+                results.setdefault(backend, {})[name] = min(times)
+                print("{:>12s} {:>8s} {:10.3f} {:8.2f}".format(
+                    name, backend, min(times),
+                    results['numpy'][name] / min(times)
+                ))
+    finally:
+        _backend['name'] = backend0
+    return results
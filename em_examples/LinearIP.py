@@ -0,0 +1,98 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import numpy as np
+
+# Linearized IP forward modelling.
+#
+# For small chargeabilities the IP data are J * eta, J being the sensitivity
+# of the DC data of the conductivity model. The sensitivity is built once,
+# row block by row block, with the same adjoint solves as problem.Jtvec but
+# using every receiver datum of a source as a column of the right hand side,
+# so only one (multi right hand side) solve per source is needed. Any
+# chargeability model is then forward modelled with a single matrix-vector
+# product.
+
+
+def getIPSensitivity(problem, m=None, active=None, dtype=np.float32):
+    """
+    Sensitivity matrix of an IP problem, as used by problem.Jvec
+
+    :param IP.Problem3D_CC problem: IP problem paired with its survey
+    :param numpy.array m: chargeability model, the sensitivity does not
+                          depend on it (zero when None)
+    :param numpy.array active: indices (or boolean mask) of the model cells
+                               kept, all of them when None
+    :param dtype: precision the sensitivity is stored in
+    :rtype: numpy.array
+    :return: (nD, nActive) sensitivity matrix
+    """
+    if m is None:
+        m = np.zeros(problem.mesh.nC)
+    problem.model = m
+    f = problem.fields(m)
+    if active is None:
+        active = slice(None)
+
+    J = []
+    for src in problem.survey.srcList:
+        u_src = f[src, problem._solutionType]
+        for rx in src.rxList:
+            V = np.eye(rx.nD)
+            PTv = rx.evalDeriv(src, problem.mesh, f, V, adjoint=True)
+            df_duTFun = getattr(f, '_{0!s}Deriv'.format(rx.projField), None)
+            df_duT, df_dmT = df_duTFun(src, None, PTv, adjoint=True)
+
+            ATinvdf_duT = problem.Ainv * np.asarray(df_duT)
+            dA_dmT = problem.getADeriv(u_src, ATinvdf_duT, adjoint=True)
+            dRHS_dmT = problem.getRHSDeriv(src, ATinvdf_duT, adjoint=True)
+            JT = np.asarray(df_dmT + (-dA_dmT + dRHS_dmT), dtype=float)
+            J.append(JT.reshape((-1, rx.nD), order='F').T[:, active])
+
+    return np.vstack(J).astype(dtype)
+
+
+class LinearIP(object):
+    """
+        Linearized IP forward modelling for a fixed conductivity model
+
+        :param IP.Problem3D_CC problem: IP problem paired with its survey,
+                                        and built for the DC conductivity
+        :param numpy.array active: cells of the chargeability model kept in
+                                   the sensitivity (e.g. the core cells),
+                                   the chargeability elsewhere is ignored
+        :param dtype: precision the sensitivity is stored in
+    """
+
+    problem = None
+    active = None
+    J = None
+
+    def __init__(self, problem, active=None, dtype=np.float32):
+        self.problem = problem
+        self.active = active
+        self.J = getIPSensitivity(problem, active=active, dtype=dtype)
+
+    @property
+    def nD(self):
+        return self.J.shape[0]
+
+    def dpred(self, eta):
+        """
+            IP data of the chargeability model eta (defined on all the cells)
+        """
+        eta = np.asarray(eta)
+        if self.active is not None:
+            eta = eta[self.active]
+        return self.J.dot(eta.astype(self.J.dtype)).astype(float)
+
+    def apparentChargeability(self, eta, etaRef):
+        """
+            Apparent chargeability of eta, normalized such that a model
+            etaRef of constant chargeability (in the earth) returns that
+            constant
+        """
+        etaRef = np.asarray(etaRef)
+        return etaRef.max() * self.dpred(eta) / self.dpred(etaRef)
@@ -17,6 +17,9 @@ from ipywidgets import (
 )
 import ipywidgets as widgets
 
+from . import _set_rcParams
+_set_rcParams()
+
 class LinearInversionApp(object):
     """docstring for LinearInversionApp"""
 
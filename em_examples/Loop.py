@@ -16,6 +16,9 @@ from SimPEG.EM.Analytics.TDEM import hzAnalyticDipoleT,hzAnalyticCentLoopT
 from scipy.interpolate import interp2d,LinearNDInterpolator
 from scipy.special import ellipk,ellipe
 
+from . import _set_rcParams
+_set_rcParams()
+
 
 def rectangular_plane_layout(mesh,corner, closed = False,I=1.):
     """
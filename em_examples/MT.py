@@ -10,6 +10,9 @@ import warnings
 warnings.filterwarnings('ignore') # ignore warnings: only use this once you are sure things are working
 from .Base import widgetify
 
+from . import _set_rcParams
+_set_rcParams()
+
 
 """
 MT1D: n layered earth problem
@@ -1,11 +1,13 @@
 import numpy as np
 import matplotlib.pyplot as plt         # Matplotlib
 from matplotlib import rcParams         # To adjust some plot settings
-from empymod import bipole, utils       # Load required empymod functions
 from ipywidgets import interactive, FloatText, ToggleButtons, widgets
 from scipy.constants import mu_0
 from ipywidgets.widgets import HBox, VBox
 
+from . import _set_rcParams
+_set_rcParams()
+
 
 def show_canonical_model():
     # Plot-style adjustments
@@ -81,6 +83,8 @@ def csem_layered_earth(
     """
     Simulating CSEM response in a layered earth
     """
+    from empymod import bipole, utils  # Load required empymod functions
+
     # Safety checks
     if len(depth) != nlayers-1:
         raise Exception("Length of depth should be nlayers-1")
@@ -351,6 +355,7 @@ def csem_data_app(
             srcloc, rxlocs, depth_bg, res_bg, aniso_bg, frequency_bg,
             rx_direction='y', rx_type="magnetic"
         )
+        from empymod import utils
         data = utils.EMArray(data_ex/data_hy)
         data_bg = utils.EMArray(data_ex_bg/data_hy_bg)
 
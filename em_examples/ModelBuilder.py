@@ -0,0 +1,154 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import numpy as np
+
+# Rasterization of simple geometric bodies onto a 2D TensorMesh.
+#
+# Every getIndices* function only tests the cells overlapping the bounding
+# box of the body (found with a searchsorted on the tensor axes) and returns
+# an index array into mesh.gridCC. With returnFraction=True the cells
+# partially covered by the body are kept too, and the fraction of each cell
+# volume inside the body is returned next to the indices.
+
+
+def _boxRange(nodes, vmin, vmax):
+    """
+        Range of cells along one tensor axis overlapping [vmin, vmax]
+    """
+    i0 = max(np.searchsorted(nodes, vmin, side='left') - 1, 0)
+    i1 = min(np.searchsorted(nodes, vmax, side='right'), nodes.size - 1)
+    return i0, max(i0, i1)
+
+
+def _rasterize(mesh, bbox, inside, returnFraction=False, nsub=5):
+    """
+        Evaluate inside(x, z) on the cells of mesh within
+        bbox = [xmin, xmax, zmin, zmax]
+    """
+    ix0, ix1 = _boxRange(mesh.vectorNx, bbox[0], bbox[1])
+    iz0, iz1 = _boxRange(mesh.vectorNy, bbox[2], bbox[3])
+    ix = np.arange(ix0, ix1)
+    iz = np.arange(iz0, iz1)
+    inds = (ix[:, None] + iz[None, :] * mesh.nCx).ravel(order='F')
+
+    if not returnFraction:
+        isin = inside(
+            mesh.vectorCCx[ix][:, None], mesh.vectorCCy[iz][None, :]
+        )
+        return inds[isin.ravel(order='F')]
+
+    # sub-sample every candidate cell on a nsub x nsub grid
+    s = (np.arange(nsub) + 0.5) / nsub
+    xs = mesh.vectorNx[ix][:, None] + mesh.hx[ix][:, None] * s[None, :]
+    zs = mesh.vectorNy[iz][:, None] + mesh.hy[iz][:, None] * s[None, :]
+    isin = inside(
+        xs[:, None, :, None], zs[None, :, None, :]
+    )
+    frac = isin.mean(axis=(2, 3)).ravel(order='F')
+    keep = frac > 0.
+    return inds[keep], frac[keep]
+
+
+def getIndicesCircle(mesh, xc, zc, r, returnFraction=False, nsub=5):
+    """
+        Cells of a 2D mesh inside the circle of centre (xc, zc) and radius r,
+        its boundary included as for the other bodies
+    """
+    bbox = [xc - r, xc + r, zc - r, zc + r]
+    inside = lambda x, z: (x - xc)**2 + (z - zc)**2 <= r**2
+    return _rasterize(mesh, bbox, inside, returnFraction, nsub)
+
+
+def getIndicesEllipse(mesh, xc, zc, a, b, returnFraction=False, nsub=5):
+    """
+        Cells of a 2D mesh inside the ellipse of centre (xc, zc) with
+        semi-axes a (along x) and b (along z)
+    """
+    bbox = [xc - a, xc + a, zc - b, zc + b]
+    inside = lambda x, z: ((x - xc) / a)**2 + ((z - zc) / b)**2 <= 1.
+    return _rasterize(mesh, bbox, inside, returnFraction, nsub)
+
+
+def getIndicesPlate(
+    mesh, xc, zc, dx, dz, rotAng, returnFraction=False, nsub=5
+):
+    """
+        Cells of a 2D mesh inside the dx by dz rectangle centred on (xc, zc)
+        and rotated by rotAng degrees (same convention as getPlateCorners
+        in the DC widgets)
+    """
+    c = np.cos(rotAng * np.pi / 180.)
+    s = np.sin(rotAng * np.pi / 180.)
+    hw = 0.5 * (np.abs(c) * dx + np.abs(s) * dz)
+    hh = 0.5 * (np.abs(s) * dx + np.abs(c) * dz)
+    bbox = [xc - hw, xc + hw, zc - hh, zc + hh]
+
+    def inside(x, z):
+        u = (x - xc) * c - (z - zc) * s
+        v = (x - xc) * s + (z - zc) * c
+        return (np.abs(u) <= 0.5 * dx) & (np.abs(v) <= 0.5 * dz)
+
+    return _rasterize(mesh, bbox, inside, returnFraction, nsub)
+
+
+def getIndicesLayer(mesh, zcLayer, dzLayer, returnFraction=False, nsub=5):
+    """
+        Cells of a 2D mesh in the horizontal layer centred on zcLayer with
+        thickness dzLayer
+    """
+    zmin = zcLayer - dzLayer / 2.
+    zmax = zcLayer + dzLayer / 2.
+    bbox = [mesh.vectorNx[0], mesh.vectorNx[-1], zmin, zmax]
+    inside = lambda x, z: (
+        (z >= zmin) & (z <= zmax) & np.ones_like(x, dtype=bool)
+    )
+    return _rasterize(mesh, bbox, inside, returnFraction, nsub)
+
+
+def addBody2Mod(mod, inds, value, frac=None):
+    """
+        Assign value to the cells inds of the model mod. When the volume
+        fractions frac are given, partially covered cells are blended
+        linearly with the background.
+    """
+    if frac is None:
+        mod[inds] = value
+    else:
+        mod[inds] = frac * value + (1. - frac) * mod[inds]
+    return mod
+
+
+def getSurfaceIndex(mesh, active):
+    """
+        Index of the top active cell of every column of a 2D mesh
+
+        The active cells are reshaped to (nCx, nCy) and the first active
+        cell from the top is found with an argmax, so draping electrodes on
+        the surface is then a lookup into the returned array of size nCx.
+        A column without any active cell has no surface and raises.
+    """
+    active = np.asarray(active, dtype=bool).reshape(
+        (mesh.nCx, mesh.nCy), order='F'
+    )
+    empty = ~active.any(axis=1)
+    if empty.any():
+        raise Exception(
+            "{} column(s) of the mesh have no active cell, the first at "
+            "x = {:g}".format(empty.sum(), mesh.vectorCCx[empty][0])
+        )
+    iz = mesh.nCy - 1 - np.argmax(active[:, ::-1], axis=1)
+    return np.arange(mesh.nCx) + iz * mesh.nCx
+
+
+def getNearestColumn(mesh, x):
+    """
+        Index of the mesh column whose cell centre is closest to x
+    """
+    x = np.atleast_1d(x)
+    ccx = mesh.vectorCCx
+    ind = np.clip(np.searchsorted(ccx, x), 1, ccx.size - 1)
+    left = np.abs(x - ccx[ind - 1]) <= np.abs(ccx[ind] - x)
+    return np.where(left, ind - 1, ind)
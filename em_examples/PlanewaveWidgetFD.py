@@ -2,21 +2,24 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import copy
+
 import numpy as np
 from SimPEG import EM
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
-import matplotlib
 import matplotlib.gridspec as gridspec
 from ipywidgets import *
+from IPython.display import display
 from scipy.constants import mu_0, epsilon_0
 
 from .DipoleWidgetFD import DipoleWidgetFD, linefun, DisPosNegvalues
 from .VolumeWidget import polyplane
 from .FDEMPlanewave import *
-from .View import DataView
+from .View import DataView, progressiveLevels
 
-matplotlib.rcParams['font.size'] = 12
+from . import _set_rcParams
+_set_rcParams()
 
 
 def PlaneEHfield(z, t=0., f=1., sig=1., mu=mu_0,  epsilon=epsilon_0, E0=1.):
@@ -110,7 +113,7 @@ class PlanewaveWidget(DipoleWidgetFD):
     def __init__(self):
         self.dataview = DataView()
 
-    def SetDataview(self, srcLoc, sig, f, orientation, normal, functype, na=100, nb=100, loc=0.,t=0.):
+    def SetDataview(self, srcLoc, sig, f, orientation, normal, functype, na=100, nb=100, loc=0.,t=0., precision="double"):
 
         self.srcLoc = srcLoc
         self.sig = sig
@@ -118,7 +121,7 @@ class PlanewaveWidget(DipoleWidgetFD):
         self.normal = normal
         self.SetGrid(normal, loc, na, nb)
         self.functype = functype
-        self.dataview.set_xyz(self.x, self.y, self.z, normal=normal) # set plane and locations ...
+        self.dataview.set_xyz(self.x, self.y, self.z, normal=normal, precision=precision) # set plane and locations ...
 
         if self.functype == "E_from_SheetCurrent":
             self.func = E_field_from_SheetCurruent
@@ -131,7 +134,7 @@ class PlanewaveWidget(DipoleWidgetFD):
 
         self.dataview.eval_2D(srcLoc, sig, f, orientation, self.func, t=t) # evaluate
 
-    def Planewave2Dviz(self, x1, y1, x2, y2, npts2D, npts, sig, f, srcLoc=0., orientation="x", component="real", view="x", normal="Z", functype="E_from_ED", loc=0., scale="log", dx=50., t=0.):
+    def Planewave2Dviz(self, x1, y1, x2, y2, npts2D, npts, sig, f, srcLoc=0., orientation="x", component="real", view="x", normal="Z", functype="E_from_ED", loc=0., scale="log", dx=50., t=0., precision="double", progressive=False, show=True):
         nx, ny = npts2D, npts2D
         x, y = linefun(x1, x2, y1, y2, npts)
         if scale == "log":
@@ -140,7 +143,20 @@ class PlanewaveWidget(DipoleWidgetFD):
             logamp = False
         else:
             raise NotImplementedError()
-        self.SetDataview(srcLoc, sig, f, orientation, normal, functype, na=nx, nb=ny, loc=loc, t=t)
+        if progressive:
+            # a coarse figure now, refined in the background
+            def draw(n):
+                return self.Planewave2Dviz(x1, y1, x2, y2, n, npts, sig, f, srcLoc=srcLoc, orientation=orientation, component=component, view=view, normal=normal, functype=functype, loc=loc, scale=scale, dx=dx, t=t, precision=precision, show=False)
+
+            def evaluate(n):
+                worker = copy.copy(self)
+                worker.dataview = self.dataview.worker()
+                worker.SetDataview(srcLoc, sig, f, orientation, normal, functype, na=n, nb=n, loc=loc, t=t, precision=precision)
+
+            self.dataview.draw_progressive(progressiveLevels(npts2D), draw, evaluate)
+            return
+
+        self.SetDataview(srcLoc, sig, f, orientation, normal, functype, na=nx, nb=ny, loc=loc, t=t, precision=precision)
         plot1D = True
         if normal =="X" or normal=="x":
             xyz_line = np.c_[np.ones_like(x)*self.x, x, y]
@@ -152,18 +168,26 @@ class PlanewaveWidget(DipoleWidgetFD):
             xyz_line = np.c_[x, y, np.ones_like(x)*self.z]
             self.dataview.xyz_line =  xyz_line
 
-        fig = plt.figure(figsize=(18*1.5,3.4*1.5))
-        gs1 = gridspec.GridSpec(2, 7)
-        gs1.update(left=0.05, right=0.48, wspace=0.05)
-        ax1 = plt.subplot(gs1[:2, :3])
-        ax1.axis("equal")
+        # kept from the previous call with the same layout in persistent
+        # mode, and updated in place
+        figure = self.dataview.figure_state("Planewave2Dviz", (normal, scale))
+        reused = "figure" in figure
+        if not reused:
+            figure["figure"] = plt.figure(figsize=(18*1.5,3.4*1.5))
+            gs1 = gridspec.GridSpec(2, 7)
+            gs1.update(left=0.05, right=0.48, wspace=0.05)
+            figure["ax1"] = plt.subplot(gs1[:2, :3])
+            figure["ax1"].axis("equal")
+            if plot1D:
+                figure["ax2"] = plt.subplot(gs1[:, 4:6])
+        ax1 = figure["ax1"]
 
         ax1, dat1 = self.dataview.plot2D_FD(ax=ax1, component=component,view=view, colorbar=False, logamp=logamp)
         vmin, vmax = dat1.cvalues.min(), dat1.cvalues.max()
         if scale == "log":
-            cb = plt.colorbar(dat1, ax=ax1, ticks=np.linspace(vmin, vmax, 5), format="$10^{%.1f}$")
+            cb = self.dataview.colorbar(ax1, dat1, np.linspace(vmin, vmax, 5), "$10^{%.1f}$")
         elif scale == "linear":
-            cb = plt.colorbar(dat1, ax=ax1, ticks=np.linspace(vmin, vmax, 5), format="%.1e")
+            cb = self.dataview.colorbar(ax1, dat1, np.linspace(vmin, vmax, 5), "%.1e")
 
         tempstr = functype.split("_")
 
@@ -200,8 +224,8 @@ class PlanewaveWidget(DipoleWidgetFD):
 
 
         if plot1D:
-            ax1.plot(x, y, 'r.', ms=4)
-            ax2 = plt.subplot(gs1[:, 4:6])
+            self.dataview.plot_line(ax1, "Rx", x, y, 'r.', autoscale=False, ms=4)
+            ax2 = figure["ax2"]
             val_line_x, val_line_y, val_line_z = self.dataview.eval(xyz_line, srcLoc, np.r_[sig], np.r_[f], orientation, self.func, t=t)
 
             if view =="X" or view =="x":
@@ -235,19 +259,19 @@ class PlanewaveWidget(DipoleWidgetFD):
             if scale == "log":
                 temp = val_line.copy()*np.nan
                 temp[val_line>0.] = val_line[val_line>0.]
-                ax2.plot(temp, distance, 'k.-')
+                self.dataview.plot_line(ax2, "positive", temp, distance, 'k.-')
                 temp = val_line.copy()*np.nan
                 temp[val_line<0.] = -val_line[val_line<0.]
-                ax2.plot(temp, distance, 'k.--')
+                self.dataview.plot_line(ax2, "negative", temp, distance, 'k.--')
                 ax2.set_xlim(abs(val_line).min(), abs(val_line).max())
                 ax2.set_xscale(scale)
 
             elif scale == "linear":
-                ax2.plot(val_line, distance, 'k.-')
+                self.dataview.plot_line(ax2, "line", val_line, distance, 'k.-')
                 ax2.set_xlim(val_line.min(), val_line.max())
                 ax2.set_xscale(scale)
                 xticks = np.linspace(-abs(val_line).max(), abs(val_line).max(), 3)
-                plt.plot(np.r_[0., 0.], np.r_[distance.min(), distance.max()], 'k-', lw=2)
+                self.dataview.plot_line(ax2, "zero", np.r_[0., 0.], np.r_[distance.min(), distance.max()], 'k-', lw=2)
                 ax2.xaxis.set_ticks(xticks)
                 ax2.xaxis.set_major_formatter(ticker.FormatStrFormatter("%.0e"))
                 ax2.set_xlim(-abs(val_line).max(), abs(val_line).max())
@@ -284,11 +308,21 @@ class PlanewaveWidget(DipoleWidgetFD):
             # ax2.legend((component, ), bbox_to_anchor=(0.5, -0.3))
             ax2.grid(True)
         # plt.tight_layout()
-        plt.show()
+        if not show:
+            return figure["figure"]
+        if reused:
+            # the inline backend closed the figure once it showed it
+            figure["figure"].canvas.draw_idle()
+            display(figure["figure"])
+        else:
+            plt.show()
         pass
 
 
-    def InteractivePlaneWave(self, nRx=100, npts2D=50, scale="log", offset_plane=50., X1=-500, X2=500, Y1=-500, Y2=500, Z1=-1000, Z2=0):
+    def InteractivePlaneWave(self, nRx=100, npts2D=50, scale="log", offset_plane=50., X1=-500, X2=500, Y1=-500, Y2=500, Z1=-1000, Z2=0, progressive=False):
+
+        # update the figure in place on the callbacks that keep its layout
+        self.dataview.set_persistent()
 
         # x1, x2, y1, y2 = offset_rx, offset_rx, Z1, Z2
         self.xmin, self.xmax = X1, X2
@@ -322,7 +356,7 @@ class PlanewaveWidget(DipoleWidgetFD):
             elif ComplexNumber == "Phase":
                 ComplexNumber = "phase"
 
-            return self.Planewave2Dviz(x1, y1, x2, y2, npts2D, nRx, sig, f, srcLoc=0., orientation="X", component=ComplexNumber, view=Component, normal=normal, functype=Field, scale=Scale, t=Time)
+            return self.Planewave2Dviz(x1, y1, x2, y2, npts2D, nRx, sig, f, srcLoc=0., orientation="X", component=ComplexNumber, view=Component, normal=normal, functype=Field, scale=Scale, t=Time, progressive=progressive)
 
         out = widgets.interactive (foo
                         ,Field=widgets.ToggleButtons(options=["Ex", "Hy"])
@@ -2,21 +2,24 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
+import copy
+
 import numpy as np
 from SimPEG import EM
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
-import matplotlib
 import matplotlib.gridspec as gridspec
-matplotlib.rcParams['font.size'] = 12
 from ipywidgets import *
 from scipy.constants import mu_0, epsilon_0
 
 from .DipoleWidgetTD import DipoleWidgetTD, linefun, DisPosNegvalues
-from .View import DataView
+from .View import DataView, progressiveLevels
 from .VolumeWidget import polyplane
 from .TDEMPlanewave import *
 
+from . import _set_rcParams
+_set_rcParams()
+
 
 def PlaneEHfield(z, t=0., sig=1., mu=mu_0,  epsilon=epsilon_0, E0=1.):
     """
@@ -66,7 +69,7 @@ class PlanewaveWidget(DipoleWidgetTD):
 
         self.dataview.eval_2D_TD(srcLoc, sig, t, orientation, self.func) # evaluate
 
-    def Planewave2Dviz(self, x1, y1, x2, y2, npts2D, npts, sig, t, srcLoc=0., orientation="x", view="x", normal="Z", functype="E_from_ED", loc=0., scale="log", dx=50.):
+    def Planewave2Dviz(self, x1, y1, x2, y2, npts2D, npts, sig, t, srcLoc=0., orientation="x", view="x", normal="Z", functype="E_from_ED", loc=0., scale="log", dx=50., progressive=False, show=True):
         nx, ny = npts2D, npts2D
         x, y = linefun(x1, x2, y1, y2, npts)
         if scale == "log":
@@ -75,6 +78,19 @@ class PlanewaveWidget(DipoleWidgetTD):
             logamp = False
         else:
             raise NotImplementedError()
+        if progressive:
+            # a coarse figure now, refined in the background
+            def draw(n):
+                return self.Planewave2Dviz(x1, y1, x2, y2, n, npts, sig, t, srcLoc=srcLoc, orientation=orientation, view=view, normal=normal, functype=functype, loc=loc, scale=scale, dx=dx, show=False)
+
+            def evaluate(n):
+                worker = copy.copy(self)
+                worker.dataview = self.dataview.worker()
+                worker.SetDataview(srcLoc, sig, t, orientation, normal, functype, na=n, nb=n, loc=loc)
+
+            self.dataview.draw_progressive(progressiveLevels(npts2D), draw, evaluate)
+            return
+
         self.SetDataview(srcLoc, sig, t, orientation, normal, functype, na=nx, nb=ny, loc=loc)
         plot1D = True
         if normal =="X" or normal=="x":
@@ -167,11 +183,13 @@ class PlanewaveWidget(DipoleWidgetTD):
             ax2.set_title("EM data")
             ax2.set_xlabel(label)
             ax2.grid(True)
+        if not show:
+            return fig
         plt.show()
         pass
 
 
-    def InteractivePlaneWave(self, nRx=100, npts2D=50, scale="log", offset_plane=50., X1=-500, X2=500, Y1=-500, Y2=500, Z1=-1000, Z2=0):
+    def InteractivePlaneWave(self, nRx=100, npts2D=50, scale="log", offset_plane=50., X1=-500, X2=500, Y1=-500, Y2=500, Z1=-1000, Z2=0, progressive=False):
 
         # x1, x2, y1, y2 = offset_rx, offset_rx, Z1, Z2
         self.xmin, self.xmax = X1, X2
@@ -196,7 +214,7 @@ class PlanewaveWidget(DipoleWidgetTD):
 
             x1, x2, y1, y2 = self.offset_rx, self.offset_rx, Z1, Z2
 
-            return self.Planewave2Dviz(x1, y1, x2, y2, npts2D, nRx, sig, t, srcLoc=0., orientation="X", view=Component, normal=normal, functype=Field, scale=Scale)
+            return self.Planewave2Dviz(x1, y1, x2, y2, npts2D, nRx, sig, t, srcLoc=0., orientation="X", view=Component, normal=normal, functype=Field, scale=Scale, progressive=progressive)
 
         out = widgets.interactive (foo
                         ,Field=widgets.ToggleButtons(options=["Ex", "Hy"])
@@ -4,13 +4,35 @@ from __future__ import unicode_literals
 from __future__ import division
 import numpy as np
 from scipy.constants import mu_0, pi, epsilon_0
-from scipy.special import erfc, erf
+from scipy.special import erfc
 from SimPEG import Utils
 
+from . import KernelBackends
+from .ChunkedKernels import broadcastKernel
+
 # TODO:
 # r = lambda dx, dy, dz: np.sqrt( dx**2. + dy**2. + dz**2.)
 
 
+def _orientationIndex(orientation):
+    if orientation.upper() not in ['X', 'Y', 'Z']:
+        raise Exception("orientation should be 'X', 'Y' or 'Z'")
+    return 'XYZ'.index(orientation.upper())
+
+
+def _geometry(XYZ, srcLoc):
+    """
+        Offsets of the recievers XYZ, an array, an AxisGrid or a
+        DipoleGeometry prepared for srcLoc
+    """
+    if not isinstance(
+        XYZ, (KernelBackends.DipoleGeometry, KernelBackends.AxisGrid)
+    ):
+        XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
+    return KernelBackends.dipoleGeometry(XYZ, srcLoc)
+
+
+@broadcastKernel(single=False, geometry=True)
 def E_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1., orientation='X', kappa=0., epsr=1.):
 
     """
@@ -32,46 +54,16 @@ def E_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1.,
     """
 
     mu = mu_0*(1+kappa)
-    epsilon = epsilon_0*epsr
-
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & t.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single time can be specified.")
-
-    dx = XYZ[:,0]-srcLoc[0]
-    dy = XYZ[:,1]-srcLoc[1]
-    dz = XYZ[:,2]-srcLoc[2]
-
-    r  = np.sqrt( dx**2. + dy**2. + dz**2.)
     theta = np.sqrt((mu*sig)/(4*t))
+    g = _geometry(XYZ, srcLoc)
 
-    front = current * length / (4.* pi * sig * r**3)
-    mid   = 3 * erf(theta*r) - (4/np.sqrt(pi) * (theta)**3 * r**3 + 6/np.sqrt(pi) * theta * r) * np.exp(-(theta)**2 * (r)**2)
-    extra = (erf(theta*r) - (4/np.sqrt(pi) * (theta)**3 * r**3 + 2/np.sqrt(pi) * theta * r) * np.exp(-(theta)**2 * (r)**2))
-
-    if orientation.upper() == 'X':
-        Ex = front*(dx**2 / r**2)*mid - front*extra
-        Ey = front*(dx*dy  / r**2)*mid
-        Ez = front*(dx*dz  / r**2)*mid
-        return Ex, Ey, Ez
-
-    elif orientation.upper() == 'Y':
-        #  x--> y, y--> z, z-->x
-        Ey = front*(dy**2 / r**2)*mid - front*extra
-        Ez = front*(dy*dz  / r**2)*mid
-        Ex = front*(dy*dx  / r**2)*mid
-        return Ex, Ey, Ez
-
-    elif orientation.upper() == 'Z':
-        # x --> z, y --> x, z --> y
-        Ez = front*(dz**2 / r**2)*mid - front*extra
-        Ex = front*(dz*dx  / r**2)*mid
-        Ey = front*(dz*dy  / r**2)*mid
-        return Ex, Ey, Ez
-
+    return KernelBackends.tdemDyadic(
+        g, theta, current * length / (4.* pi * sig),
+        _orientationIndex(orientation)
+    )
 
 
+@broadcastKernel(single=False, geometry=True)
 def J_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1., orientation='X', kappa=1., epsr=1.):
 
     """
@@ -99,6 +91,7 @@ def J_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1.,
     return Jx, Jy, Jz
 
 
+@broadcastKernel(single=False, geometry=True)
 def H_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1., orientation='X', kappa=1., epsr=1.):
 
     """
@@ -120,40 +113,16 @@ def H_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1.,
     """
 
     mu = mu_0*(1+kappa)
-    epsilon = epsilon_0*epsr
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & t.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single time can be specified.")
-
-    dx = XYZ[:, 0]-srcLoc[0]
-    dy = XYZ[:, 1]-srcLoc[1]
-    dz = XYZ[:, 2]-srcLoc[2]
-
-    r = np.sqrt(dx**2. + dy**2. + dz**2.)
     theta = np.sqrt((mu*sig)/(4*t))
+    g = _geometry(XYZ, srcLoc)
 
-    front = (current * length) / (4.*pi*(r)**3)
-    mid = erf(theta*r) - (2/np.sqrt(pi)) * theta * r * np.exp(-(theta)**2 * (r)**2)
-    if orientation.upper() == 'X':
-        Hy = front * mid * -dz
-        Hz = front * mid * dy
-        Hx = np.zeros_like(Hy)
-        return Hx, Hy, Hz
-
-    elif orientation.upper() == 'Y':
-        Hx = front * mid * dz
-        Hz = front * mid * -dx
-        Hy = np.zeros_like(Hx)
-        return Hx, Hy, Hz
-
-    elif orientation.upper() == 'Z':
-        Hx = front * mid * -dy
-        Hy = front * mid * dx
-        Hz = np.zeros_like(Hx)
-        return Hx, Hy, Hz
+    return KernelBackends.tdemCurl(
+        g, theta, (current * length) / (4.*pi),
+        _orientationIndex(orientation)
+    )
 
 
+@broadcastKernel(single=False, geometry=True)
 def dHdt_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1., orientation='X', kappa=1., epsr=1.):
 
     """
@@ -176,16 +145,8 @@ def dHdt_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1
 
     mu = mu_0*(1+kappa)
     epsilon = epsilon_0*epsr
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & t.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single time can be specified.")
-
-    dx = XYZ[:, 0]-srcLoc[0]
-    dy = XYZ[:, 1]-srcLoc[1]
-    dz = XYZ[:, 2]-srcLoc[2]
-
-    r = np.sqrt(dx**2. + dy**2. + dz**2.)
+    g = _geometry(XYZ, srcLoc)
+    dx, dy, dz, r = g.dx, g.dy, g.dz, g.r
     theta = np.sqrt((mu*sig)/(4*t))
 
     front = - 2.*(current * length) * theta**5 * np.exp(-(theta)**2 * (r)**2)
@@ -211,6 +172,7 @@ def dHdt_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1
         Hz = np.zeros_like(Hx)
         return Hx, Hy, Hz
 
+@broadcastKernel(single=False, geometry=True)
 def B_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1., orientation='X', kappa=1., epsr=1.):
 
     """
@@ -239,6 +201,7 @@ def B_from_ElectricDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1.,
     Bz = mu*Hz
     return Bx, By, Bz
 
+@broadcastKernel(single=False, geometry=True)
 def E_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1., orientation='X', kappa=0., epsr=1.):
 
     """
@@ -261,16 +224,8 @@ def E_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1.,
 
     mu = mu_0*(1+kappa)
     epsilon = epsilon_0*epsr
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & t.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single time can be specified.")
-
-    dx = XYZ[:, 0]-srcLoc[0]
-    dy = XYZ[:, 1]-srcLoc[1]
-    dz = XYZ[:, 2]-srcLoc[2]
-
-    r = np.sqrt(dx**2. + dy**2. + dz**2.)
+    g = _geometry(XYZ, srcLoc)
+    dx, dy, dz, r = g.dx, g.dy, g.dz, g.r
     theta = np.sqrt((mu*sig)/(4*t))
 
     front = 2.*(current * length) * theta**5 * np.exp(-(theta)**2 * (r)**2)
@@ -280,13 +235,13 @@ def E_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1.,
         Ey = front * mid * -dz
         Ez = front * mid * dy
         Ex = np.zeros_like(Ey)
-        return Hx, Hy, Hz
+        return Ex, Ey, Ez
 
     elif orientation.upper() == 'Y':
         Ex = front * mid * dz
         Ez = front * mid * -dx
         Ey = np.zeros_like(Ex)
-        return Hx, Hy, Hz
+        return Ex, Ey, Ez
 
     elif orientation.upper() == 'Z':
         Ex = front * mid * -dy
@@ -294,6 +249,7 @@ def E_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1.,
         Ez = np.zeros_like(Ex)
         return Ex, Ey, Ez
 
+@broadcastKernel(single=False, geometry=True)
 def J_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1., orientation='X', kappa=1., epsr=1.):
 
     """
@@ -320,6 +276,7 @@ def J_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1.,
     Jz = sig*Ez
     return Jx, Jy, Jz
 
+@broadcastKernel(single=False, geometry=True)
 def H_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1., orientation='X', kappa=0., epsr=1.):
 
     """
@@ -341,44 +298,16 @@ def H_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1.,
     """
 
     mu = mu_0*(1+kappa)
-    epsilon = epsilon_0*epsr
-
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & t.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single time can be specified.")
-
-    dx = XYZ[:,0]-srcLoc[0]
-    dy = XYZ[:,1]-srcLoc[1]
-    dz = XYZ[:,2]-srcLoc[2]
-
-    r  = np.sqrt( dx**2. + dy**2. + dz**2.)
     theta = np.sqrt((mu*sig)/(4*t))
+    g = _geometry(XYZ, srcLoc)
 
-    front = current * length / (4.* pi  * r**3)
-    mid   = 3 * erf(theta*r) - (4/np.sqrt(pi) * (theta)**3 * r**3 + 6/np.sqrt(pi) * theta * r) * np.exp(-(theta)**2 * (r)**2)
-    extra = (erf(theta*r) - (4/np.sqrt(pi) * (theta)**3 * r**3 + 2/np.sqrt(pi) * theta * r) * np.exp(-(theta)**2 * (r)**2))
-
-    if orientation.upper() == 'X':
-        Hx = front*(dx**2 / r**2)*mid - front*extra
-        Hy = front*(dx*dy  / r**2)*mid
-        Hz = front*(dx*dz  / r**2)*mid
-        return Ex, Ey, Ez
-
-    elif orientation.upper() == 'Y':
-        #  x--> y, y--> z, z-->x
-        Hy = front*(dy**2 / r**2)*mid - front*extra
-        Hz = front*(dy*dz  / r**2)*mid
-        Hx = front*(dy*dx  / r**2)*mid
-        return Ex, Ey, Ez
+    return KernelBackends.tdemDyadic(
+        g, theta, current * length / (4.* pi),
+        _orientationIndex(orientation)
+    )
 
-    elif orientation.upper() == 'Z':
-        # x --> z, y --> x, z --> y
-        Hz = front*(dz**2 / r**2)*mid - front*extra
-        Hx = front*(dz*dx  / r**2)*mid
-        Hy = front*(dz*dy  / r**2)*mid
-        return Hx, Hy, Hz
 
+@broadcastKernel(single=False, geometry=True)
 def dHdt_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1., orientation='X', kappa=1., epsr=1.):
 
     """
@@ -402,16 +331,8 @@ def dHdt_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1
     mu = mu_0*(1+kappa)
     epsilon = epsilon_0*epsr
 
-    XYZ = Utils.asArray_N_x_Dim(XYZ, 3)
-    # Check
-    if XYZ.shape[0] > 1 & t.shape[0] > 1:
-        raise Exception("I/O type error: For multiple field locations only a single time can be specified.")
-
-    dx = XYZ[:,0]-srcLoc[0]
-    dy = XYZ[:,1]-srcLoc[1]
-    dz = XYZ[:,2]-srcLoc[2]
-
-    r  = np.sqrt( dx**2. + dy**2. + dz**2.)
+    g = _geometry(XYZ, srcLoc)
+    dx, dy, dz, r = g.dx, g.dy, g.dz, g.r
     theta = np.sqrt((mu*sig)/(4*t))
 
     front =  -4*(current*length)*theta**5 * np.exp(-(theta)**2 * (r)**2)
@@ -423,14 +344,14 @@ def dHdt_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1
         Hx = front*(dx**2 / r**2)*mid + front*extra
         Hy = front*(dx*dy  / r**2)*mid
         Hz = front*(dx*dz  / r**2)*mid
-        return Ex, Ey, Ez
+        return Hx, Hy, Hz
 
     elif orientation.upper() == 'Y':
         #  x--> y, y--> z, z-->x
         Hy = front*(dy**2 / r**2)*mid + front*extra
         Hz = front*(dy*dz  / r**2)*mid
         Hx = front*(dy*dx  / r**2)*mid
-        return Ex, Ey, Ez
+        return Hx, Hy, Hz
 
     elif orientation.upper() == 'Z':
         # x --> z, y --> x, z --> y
@@ -439,6 +360,7 @@ def dHdt_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1
         Hy = front*(dz*dy  / r**2)*mid
         return Hx, Hy, Hz
 
+@broadcastKernel(single=False, geometry=True)
 def B_from_MagneticDipoleWholeSpace(XYZ, srcLoc, sig, t, current=1., length=1., orientation='X', kappa=1., epsr=1.):
 
     """
@@ -1,11 +1,13 @@
 import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
-import deepdish as dd
 from SimPEG import Utils, Mesh
 import tarfile
 import os
 
+from . import _set_rcParams
+_set_rcParams()
+
 def download_and_unzip_data(
     url="https://storage.googleapis.com/simpeg/em_examples/tdem_groundedsource/tdem_groundedsource.tar"
 ):
@@ -41,6 +43,7 @@ def load_or_run_results(
         downloads, directory = download_and_unzip_data()
         fname = os.path.sep.join([directory, fname])
 
+    import deepdish as dd
     simulation_results = dd.io.load(fname)
     mesh = Mesh.TensorMesh(simulation_results['mesh']['h'], x0=simulation_results['mesh']['x0'])
     sigma = simulation_results['sigma']
@@ -148,6 +151,7 @@ def run_simulation(
     E, B, J = getEBJcore(src)
     tdem_gs = { "E": E, "B": B, "J": J,
                 "sigma": sigma_core, "mesh": meshCore.serialize(), 'time':prb.times-t0, 'input_currents':input_currents}
+    import deepdish as dd
     dd.io.save(fname, tdem_gs)
 
 
@@ -156,10 +160,8 @@ def run_simulation(
 ##-------------------------------------------------------------------##
 
 from mpl_toolkits.mplot3d import axes3d
-import matplotlib.pyplot as plt
 from matplotlib import cm
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-import matplotlib.pyplot as plt
 from matplotlib.patches import FancyArrowPatch
 from mpl_toolkits.mplot3d import proj3d
 
@@ -16,6 +16,9 @@ from .Base import widgetify
 from .DipoleWidgetFD import DisPosNegvalues
 from .BiotSavart import BiotSavartFun
 
+from . import _set_rcParams
+_set_rcParams()
+
 
 class TDEMHorizontalLoopCylWidget(object):
     """TDEMCylWidgete"""
@@ -11,7 +11,9 @@ from IPython.display import display
 from mpl_toolkits.mplot3d import Axes3D
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 from scipy import sparse as spar
-from cvxopt import solvers,matrix
+
+from . import _set_rcParams
+_set_rcParams()
 
 
 
@@ -1613,6 +1615,8 @@ class EM61problem(UXOTEM):
 
     def updatePolarizationsQP(self,r0,UB):
 
+        from cvxopt import solvers,matrix
+
         # Set operator and solution array
         Hp = self.computeHp(r0=r0)
         Brx = self.computeBrx(r0=r0)
@@ -1974,6 +1978,8 @@ class TEMTADSproblem(UXOTEM):
 
     def updatePolarizationsQP(self,r0,UB):
 
+        from cvxopt import solvers,matrix
+
         # Set operator and solution array
         Hp = self.computeHp(r0=r0)
         Brx = self.computeBrx(r0=r0)
@@ -2332,6 +2338,8 @@ class MPVproblem(UXOTEM):
 
     def updatePolarizationsQP(self,r0,UB):
 
+        from cvxopt import solvers,matrix
+
         # Set operator and solution array
         Hp = self.computeHp(r0=r0)
         Brx = self.computeBrx(r0=r0)
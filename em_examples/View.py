@@ -6,8 +6,14 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib
 import copy
+import threading
+from collections import OrderedDict
 
-matplotlib.rcParams["font.size"] = 13
+from .ChunkedKernels import getPrecision
+from .KernelBackends import AxisGrid, DipoleGeometry
+
+from . import _set_rcParams
+_set_rcParams()
 
 
 def phase(z):
@@ -16,46 +22,415 @@ def phase(z):
     return val
 
 
+def amplitude(a, b, c):
+    """
+        sqrt(a**2 + b**2 + c**2), without the squares underflowing (or
+        overflowing) in single precision
+    """
+    return np.hypot(np.hypot(a, b), c)
+
+
+def _precisionKwargs(func, precision):
+    # the kernels that are not ChunkedKernels.broadcastKernel (e.g. the
+    # SimPEG analytics or TDEMPlanewave) do not take a precision
+    if precision == "double" or not getattr(func, "broadcasts", False):
+        return {}
+    return {"precision": precision}
+
+
+def _key(value):
+    """
+        Hashable key of a number or an array of numbers
+    """
+    return np.asarray(value, dtype=float).tobytes()
+
+
+# pyplot is not thread safe: the figures refined in the background (see
+# DataView.draw_progressive) are drawn holding this lock
+_drawLock = threading.RLock()
+
+
+def progressiveLevels(n, coarsest=16):
+    """
+        Resolutions of a progressive draw up to n, halving n down to no
+        less than coarsest, e.g. [25, 50, 100, 200] for 200
+    """
+    levels = [n]
+    while levels[0] // 2 >= coarsest:
+        levels.insert(0, levels[0] // 2)
+    return levels
+
+
+def _remove(artist):
+    """
+        Remove an artist, a list of artists, a colorbar or a ContourSet
+        (not an artist before matplotlib 3.8) from its axes
+    """
+    if isinstance(artist, list):
+        for a in artist:
+            _remove(a)
+    elif (
+        isinstance(artist, matplotlib.contour.ContourSet) and
+        not isinstance(artist, matplotlib.artist.Artist)
+    ):
+        for collection in artist.collections:
+            collection.remove()
+    else:
+        artist.remove()
+
+
+class LRUCache(object):
+    """
+        Least recently used cache of tuples of arrays, bounded by the bytes
+        of the arrays (maxBytes) and / or their number (maxItems)
+
+        The cached arrays are made read only, as they are shared by all the
+        lookups. The cache can be shared by threads (see
+        DataView.worker).
+    """
+
+    def __init__(self, maxBytes=None, maxItems=None):
+        self.maxBytes = maxBytes
+        self.maxItems = maxItems
+        self.nbytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            # most recently used last
+            arrays = self._items.pop(key)
+            self._items[key] = arrays
+            return arrays
+
+    def put(self, key, arrays):
+        with self._lock:
+            if key in self._items:
+                self.nbytes -= sum(a.nbytes for a in self._items.pop(key))
+            nbytes = sum(a.nbytes for a in arrays)
+            if self.maxBytes is not None and nbytes > self.maxBytes:
+                return
+            for a in arrays:
+                a.flags.writeable = False
+            self._items[key] = arrays
+            self.nbytes += nbytes
+            self.evict()
+
+    def evict(self):
+        with self._lock:
+            while (
+                (self.maxBytes is not None and self.nbytes > self.maxBytes) or
+                (
+                    self.maxItems is not None and
+                    len(self._items) > self.maxItems
+                )
+            ):
+                self.nbytes -= sum(
+                    a.nbytes for a in self._items.popitem(last=False)[1]
+                )
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
 class DataView(object):
     """
         Provides viewingtions for Data
         This can be inherited by XXX
+
+        With precision="single" (see set_xyz) the fields are computed and
+        kept in float32 / complex64, for display: about 1e-6 relative
+        accuracy, see ChunkedKernels.
+
+        The fields evaluated on the grid (eval_2D, eval_2D_TD) are kept in
+        an LRU cache of planeCacheBytes (see set_plane_cache), keyed by the
+        grid, source, conductivity, frequency or time, orientation and
+        function: the callbacks that only change what is displayed, or come
+        back to a recent frequency, do not evaluate the fields again.
+
+        The dipole kernels get the grid as a DipoleGeometry of the source,
+        with the terms they use prepared and kept in the plane cache (see
+        _locations).
+
+        set_xyz keeps a grid as its sparse axis vectors (self.grid, an
+        AxisGrid), which the kernels decorated by broadcastKernel take.
+        The (n, 3) locations (self.xyz) are only built for the other
+        functions, and kept for a profile.
+
+        In persistent mode (see set_persistent) the plot methods keep the
+        figures and artists they draw, and the next call with the same
+        layout updates them in place (set_data, colorbar norms, texts)
+        instead of drawing a new figure. The filled contours and
+        streamlines have no in place update in matplotlib and are drawn
+        again.
+
+        draw_progressive draws a figure on a coarse grid first, and refines
+        it in a background thread that a new draw cancels.
     """
 
-    def set_xyz(self, x, y, z, normal="Z", geometry="grid"):
+    precision = "double"
+
+    grid = None
+
+    @property
+    def xyz(self):
+        """
+            (n, 3) locations, built on each access for a grid
+        """
+        if self.grid is not None:
+            return self.grid.XYZ
+        return self._xyz
+
+    @xyz.setter
+    def xyz(self, xyz):
+        self.grid = None
+        self._xyz = xyz
+
+    # bytes of fields eval_2D and eval_2D_TD keep
+    planeCacheBytes = 256 * 2**20
+
+    def _getCache(self, name, **kwargs):
+        if name not in self.__dict__:
+            setattr(self, name, LRUCache(**kwargs))
+        return getattr(self, name)
+
+    def set_plane_cache(self, nbytes):
+        """
+            Memory (bytes) of the fields kept by eval_2D and eval_2D_TD, 0
+            to keep none
+        """
+        if nbytes < 0:
+            raise Exception("the cache size should not be negative")
+        self.planeCacheBytes = nbytes
+        cache = self._getCache("_planes", maxBytes=nbytes)
+        cache.maxBytes = nbytes
+        cache.evict()
+
+    persistent = False
+
+    def set_persistent(self, persistent=True):
+        """
+            Keep the figures and artists of the plot methods and update
+            them in place, or draw new ones on every call (False)
+        """
+        self.persistent = persistent
+        if not persistent:
+            self.__dict__.pop("_figures", None)
+
+    def _plot_state(self, ax, kind, layout=None):
+        """
+            Artists of kind (e.g. "plane", "lines") drawn on ax by the
+            previous call with the same layout in persistent mode, else an
+            empty dict to keep the new ones in (after removing the ones of
+            another layout)
+        """
+        if not self.persistent:
+            return {}
+        # kept on the axes, so that they go with its figure
+        states = ax.__dict__.setdefault("_dataview_artists", {})
+        state = states.get(kind)
+        if state is not None and state["layout"] == layout:
+            return state
+        if state is not None:
+            _remove([a for name, a in state.items() if name != "layout"])
+        state = states[kind] = {"layout": layout}
+        return state
+
+    def figure_state(self, name, layout):
+        """
+            Figure and axes (see the widgets' Dipole2Dviz) kept for name
+            from the previous call with the same layout in persistent mode,
+            else an empty dict to create them in
+        """
+        if not self.persistent:
+            return {}
+        figures = self.__dict__.setdefault("_figures", {})
+        state = figures.get(name)
+        if state is not None and state["layout"] == layout:
+            return state
+        if state is not None and "figure" in state:
+            plt.close(state["figure"])
+        state = figures[name] = {"layout": layout}
+        return state
+
+    def _figure_axes(self, name, figsize=(6.5, 5)):
+        """
+            Axes of a new figure, or of the figure kept for name in
+            persistent mode
+        """
+        state = self.figure_state(name, figsize)
+        if "ax" not in state:
+            state["figure"] = plt.figure(figsize=figsize)
+            state["ax"] = plt.subplot(111)
+        return state["ax"]
+
+    def colorbar(self, ax, mappable, ticks, format, label=None):
+        """
+            Colorbar of mappable next to ax, updated in place in
+            persistent mode
+        """
+        state = self._plot_state(ax, "colorbar")
+        if "colorbar" in state:
+            # the levels of filled contours are only read by the
+            # constructor: draw a new colorbar in the axes of the old one,
+            # which keeps the layout of the figure
+            cax = state["colorbar"].ax
+            cax.cla()
+            cb = ax.figure.colorbar(
+                mappable, cax=cax, ticks=ticks, format=format
+            )
+        else:
+            cb = ax.figure.colorbar(
+                mappable, ax=ax, ticks=ticks, format=format
+            )
+        state["colorbar"] = cb
+        if label is not None:
+            cb.set_label(label)
+        return cb
+
+    def plot_line(self, ax, name, x, y, fmt=None, autoscale=True, **kwargs):
+        """
+            ax.plot(x, y, fmt, **kwargs), or set_data of the line name drawn
+            by the previous call in persistent mode
+
+            :param bool autoscale: rescale the axes to the updated line
+                                   (False for lines drawn over a map)
+        """
+        state = self._plot_state(ax, "lines")
+        if name in state:
+            state[name].set_data(x, y)
+            if autoscale:
+                ax.relim()
+                ax.autoscale_view()
+        else:
+            args = (x, y) if fmt is None else (x, y, fmt)
+            state[name], = ax.plot(*args, **kwargs)
+        return state[name]
+
+    def text(self, ax, name, x, y, s, **kwargs):
+        """
+            ax.text(x, y, s, **kwargs), or the text name drawn by the
+            previous call moved and set to s in persistent mode
+        """
+        state = self._plot_state(ax, "texts")
+        if name in state:
+            state[name].set_position((x, y))
+            state[name].set_text(s)
+        else:
+            state[name] = ax.text(x, y, s, **kwargs)
+        return state[name]
+
+    def worker(self):
+        """
+            DataView sharing the plane cache of this one, to evaluate the
+            fields of another grid in a background thread
+        """
+        worker = DataView()
+        worker.planeCacheBytes = self.planeCacheBytes
+        worker._planes = self._getCache(
+            "_planes", maxBytes=self.planeCacheBytes
+        )
+        return worker
+
+    def draw_progressive(self, levels, draw, evaluate):
+        """
+            Draw and show a figure at the coarsest resolution of levels now,
+            then at the finer ones in a background thread, which updates the
+            figure shown. A new call cancels the refinement of the previous
+            one, before its next evaluation or draw. Outside of IPython,
+            where a figure shown cannot be updated, the figure is drawn at
+            the finest resolution and shown with plt.show.
+
+            :param list levels: resolutions, coarsest first (see
+                                progressiveLevels)
+            :param callable draw: draw(n) draws the figure at the
+                                  resolution n and returns it, without
+                                  showing it
+            :param callable evaluate: evaluate(n) evaluates the fields of
+                                      the resolution n into the plane
+                                      cache of this DataView (see worker),
+                                      so that draw(n) only draws
+            :rtype: threading.Thread
+            :return: the thread refining the figure (also kept as
+                     self.refinement), None for a single level or
+                     outside of IPython
+        """
+        try:
+            from IPython import get_ipython
+            from IPython.display import display
+        except ImportError:
+            get_ipython = lambda: None
+
+        self.refinement = None
+        with _drawLock:
+            self._generation = self.__dict__.get("_generation", 0) + 1
+            generation = self._generation
+            if get_ipython() is None:
+                draw(levels[-1])
+                plt.show()
+                return None
+            fig = draw(levels[0])
+            handle = display(fig, display_id=True)
+            # shown: the inline backend would show it again
+            plt.close(fig)
+
+        # a frontend without display ids gives no handle to update
+        if len(levels) > 1 and handle is not None:
+            self.refinement = threading.Thread(
+                target=self._refine,
+                args=(generation, levels[1:], draw, evaluate, handle)
+            )
+            self.refinement.daemon = True
+            self.refinement.start()
+        return self.refinement
+
+    def _refine(self, generation, levels, draw, evaluate, handle):
+        for n in levels:
+            if self._generation != generation:
+                return
+            evaluate(n)
+            with _drawLock:
+                if self._generation != generation:
+                    return
+                fig = draw(n)
+                handle.update(fig)
+                plt.close(fig)
+
+    def set_xyz(self, x, y, z, normal="Z", geometry="grid", precision="double"):
+        getPrecision(precision)  # raises on an unknown precision
         self.normal = normal
         self.geometry = geometry
+        self.precision = precision
+        self._gridKey = (
+            _key(x), _key(y), _key(z), normal.upper(), geometry.upper()
+        )
 
         if geometry.upper() == "GRID":
+            # sparse axis vectors, raveled in the order of the full meshgrid
             if normal.upper() == "X":
                 self.x, self.y, self.z = x, y, z
                 self.ncx, self.ncy, self.ncz = 1, y.size, z.size
-                self.Y, self.Z = np.meshgrid(y, z)
-                self.xyz = np.c_[
-                    x*np.ones(self.ncy*self.ncz),
-                    self.Y.flatten(),
-                    self.Z.flatten()
-                ]
+                self.Y, self.Z = np.meshgrid(y, z, sparse=True)
+                self.grid = AxisGrid(x, self.Y, self.Z)
 
             elif normal.upper() == "Y":
                 self.x, self.y, self.z = x, y, z
                 self.ncx, self.ncy, self.ncz = x.size, 1, z.size
-                self.X, self.Z = np.meshgrid(x, z)
-                self.xyz = np.c_[
-                    self.X.flatten(),
-                    y*np.ones(self.ncx*self.ncz),
-                    self.Z.flatten()
-                ]
+                self.X, self.Z = np.meshgrid(x, z, sparse=True)
+                self.grid = AxisGrid(self.X, y, self.Z)
 
             elif normal.upper() == "Z":
                 self.x, self.y, self.z = x, y, z
                 self.ncx, self.ncy, self.ncz = x.size, y.size, 1
-                self.X, self.Y = np.meshgrid(x, y)
-                self.xyz = np.c_[
-                    self.X.flatten(),
-                    self.Y.flatten(),
-                    z*np.ones(self.ncx*self.ncy)
-                ]
+                self.X, self.Y = np.meshgrid(x, y, sparse=True)
+                self.grid = AxisGrid(self.X, self.Y, z)
 
         elif geometry.upper() == "PROFILE":
             if normal.upper() == "X":
@@ -76,6 +451,9 @@ class DataView(object):
                 self.Y, self.Z = self.y, self.z
                 self.xyz = np.c_[self.x, self.y, z*np.ones_like(self.x)]
 
+    # number of sweeps eval_loc keeps
+    sweepCacheSize = 16
+
     def eval_loc(
         self, srcLoc, obsLoc, log_sigvec, log_fvec, orientation, normal, func
     ):
@@ -88,73 +466,170 @@ class DataView(object):
         self.orientation = orientation
         self.normal = normal
         self.func1D = func
-        self.val_xfs = np.zeros(
-            (len(log_sigvec), len(log_fvec)), dtype=complex
-        )
-        self.val_yfs = np.zeros(
-            (len(log_sigvec), len(log_fvec)), dtype=complex
-        )
-        self.val_zfs = np.zeros(
-            (len(log_sigvec), len(log_fvec)), dtype=complex
+        self.val_xfs, self.val_yfs, self.val_zfs = self.eval_sweep(
+            srcLoc, obsLoc, self.sigvec, self.fvec, orientation, func
         )
 
-        for n in range(len(log_sigvec)):
-            self.val_xfs[n], self.val_yfs[n], self.val_zfs[n] = func(
-                self.obsLoc, srcLoc, 10.**log_sigvec[n], 10.**log_fvec,
-                orientation=self.orientation
+    def eval_sweep(self, srcLoc, obsLoc, sigvec, fvec, orientation, func):
+        """
+            Fields at obsLoc for all the conductivities and frequencies
+
+            The (sigma, f) pairs are evaluated in one call when func
+            broadcasts (ChunkedKernels.broadcastKernel), one call per
+            conductivity otherwise. The last sweepCacheSize sweeps are
+            kept, so the panels plotting the same location reuse one
+            evaluation.
+
+            :rtype: tuple
+            :return: x, y, z components, (nsig, nfreq) arrays
+        """
+        sigvec, fvec = np.atleast_1d(sigvec), np.atleast_1d(fvec)
+        key = (
+            _key(obsLoc), _key(srcLoc), orientation, func, _key(sigvec),
+            _key(fvec), self.precision
+        )
+        sweeps = self._getCache("_sweeps", maxItems=self.sweepCacheSize)
+        vals = sweeps.get(key)
+        if vals is not None:
+            return vals
+
+        if getattr(func, "broadcasts", False):
+            vals = func(
+                obsLoc, srcLoc, sigvec, fvec, orientation=orientation,
+                **_precisionKwargs(func, self.precision)
+            )
+            # (nloc=1, nfreq, nsig) -> (nsig, nfreq)
+            vals = tuple(
+                np.reshape(v, (fvec.size, sigvec.size)).T.astype(
+                    np.result_type(v, 1j)
+                ) for v in vals
+            )
+        else:
+            vals = tuple(
+                np.zeros((sigvec.size, fvec.size), dtype=complex)
+                for _ in range(3)
             )
+            for n in range(sigvec.size):
+                vals[0][n], vals[1][n], vals[2][n] = func(
+                    obsLoc, srcLoc, sigvec[n], fvec, orientation=orientation
+                )
+
+        sweeps.put(key, vals)
+        return vals
 
     def eval(self, xyz, srcLoc, sig, f, orientation, func, normal="Z", t=0.):
         val_x, val_y, val_z = func(
-            xyz, srcLoc, sig, f, orientation=orientation, t=t
+            xyz, srcLoc, sig, f, orientation=orientation, t=t,
+            **_precisionKwargs(func, self.precision)
         )
         return val_x, val_y, val_z
 
     def eval_TD(self, xyz, srcLoc, sig, t, orientation, func, normal="Z"):
         val_x, val_y, val_z = func(
-            xyz, srcLoc, sig, t, orientation=orientation
+            xyz, srcLoc, sig, t, orientation=orientation,
+            **_precisionKwargs(func, self.precision)
         )
         return val_x, val_y, val_z
 
+    def _eval_plane(self, timeKey, srcLoc, sig, orientation, func, evaluate):
+        """
+            Fields (and their vector amplitudes) on the grid from the plane
+            cache, or from evaluate()
+        """
+        gridKey = self.__dict__.get("_gridKey") or _key(self.xyz)
+        key = (
+            gridKey, timeKey, _key(srcLoc), _key(sig), orientation, func,
+            self.precision
+        )
+        planes = self._getCache("_planes", maxBytes=self.planeCacheBytes)
+        vals = planes.get(key)
+        if vals is None:
+            vals = evaluate()
+            planes.put(key, vals)
+        return vals
+
+    def _locations(self, srcLoc, func, evaluate):
+        """
+            The grid locations: a DipoleGeometry for srcLoc when func takes
+            one, as the AxisGrid when func broadcasts
+
+            evaluate(locations) runs func on the first location, to find
+            the terms of the geometry its kernel uses (see
+            DipoleGeometry.usedTerms): only those are prepared, and kept
+            in the plane cache, so changing the conductivity, frequency or
+            time only evaluates the exponential / erf terms of the fields.
+            A geometry larger than the cache is not prepared, the kernels
+            compute its terms block by block.
+        """
+        if self.grid is not None and getattr(func, "broadcasts", False):
+            locations = self.grid
+        else:
+            locations = self.xyz
+        if not getattr(func, "dipoleGeometry", False):
+            return locations
+        if isinstance(locations, AxisGrid):
+            first = locations.take(0, 1)
+        else:
+            first = np.asarray(locations)[:1]
+        probe = DipoleGeometry(first, srcLoc)
+        evaluate(probe)
+        names = probe.usedTerms
+
+        gridKey = self.__dict__.get("_gridKey") or _key(locations)
+        key = ("geometry", gridKey, _key(srcLoc), names)
+        planes = self._getCache("_planes", maxBytes=self.planeCacheBytes)
+        arrays = planes.get(key)
+        if arrays is not None:
+            return DipoleGeometry.fromTerms(srcLoc, names, arrays)
+        geometry = DipoleGeometry(locations, srcLoc)
+        if len(names) * geometry.dx.nbytes <= planes.maxBytes:
+            planes.put(key, geometry.terms(names))
+        return geometry
+
+    def _reshape_plane(self, v):
+        if self.normal.upper() == "X":
+            return v.reshape(self.ncy, self.ncz)
+        elif self.normal.upper() == "Y":
+            return v.reshape(self.ncx, self.ncz)
+        elif self.normal.upper() == "Z":
+            return v.reshape(self.ncx, self.ncy)
+
     def eval_2D(self, srcLoc, sig, f, orientation, func, t=0.):
         self.func2D = func
         self.srcLoc = srcLoc
         self.sig = sig
         self.t = f
         self.orientation = orientation
-        self.val_x, self.val_y, self.val_z = func(
-            self.xyz, srcLoc, sig, f, orientation=orientation, t=t
-        )
 
-        if self.normal.upper() == "X":
-            def Freshape(v):
-                return v.reshape(self.ncy, self.ncz)
-        elif self.normal.upper() == "Y":
-            def Freshape(v):
-                return v.reshape(self.ncx, self.ncz)
-        elif self.normal == "Z":
-            def Freshape(v):
-                return v.reshape(self.ncx, self.ncy)
+        def call(locations):
+            return func(
+                locations, srcLoc, sig, f, orientation=orientation, t=t,
+                **_precisionKwargs(func, self.precision)
+            )
 
-        self.VAL_X = Freshape(self.val_x)
-        self.VAL_Y = Freshape(self.val_y)
-        self.VAL_Z = Freshape(self.val_z)
-        self.VEC_R_amp = np.sqrt(
-            self.VAL_X.real**2 + self.VAL_Y.real**2 + self.VAL_Z.real**2
-        )
-        self.VEC_I_amp = np.sqrt(
-            self.VAL_X.imag**2 + self.VAL_Y.imag**2 + self.VAL_Z.imag**2
-        )
-        self.VEC_A_amp = np.sqrt(
-            np.abs(self.VAL_X)**2 +
-            np.abs(self.VAL_Y)**2 +
-            np.abs(self.VAL_Z)**2
-        )
-        self.VEC_P_amp = np.sqrt(
-            phase(self.VAL_X)**2 +
-            phase(self.VAL_Y)**2 +
-            phase(self.VAL_Z)**2
+        def evaluate():
+            val_x, val_y, val_z = [
+                self._reshape_plane(np.asarray(v))
+                for v in call(self._locations(srcLoc, func, call))
+            ]
+            return (
+                val_x, val_y, val_z,
+                amplitude(val_x.real, val_y.real, val_z.real),
+                amplitude(val_x.imag, val_y.imag, val_z.imag),
+                amplitude(np.abs(val_x), np.abs(val_y), np.abs(val_z)),
+                amplitude(phase(val_x), phase(val_y), phase(val_z)),
+            )
+
+        (
+            self.VAL_X, self.VAL_Y, self.VAL_Z, self.VEC_R_amp,
+            self.VEC_I_amp, self.VEC_A_amp, self.VEC_P_amp
+        ) = self._eval_plane(
+            ("FD", _key(f), _key(t)), srcLoc, sig, orientation, func,
+            evaluate
         )
+        self.val_x = self.VAL_X.ravel()
+        self.val_y = self.VAL_Y.ravel()
+        self.val_z = self.VAL_Z.ravel()
 
     def eval_2D_TD(self, srcLoc, sig, t, orientation, func):
         self.func2D = func
@@ -162,26 +637,79 @@ class DataView(object):
         self.sig = sig
         self.t = t
         self.orientation = orientation
-        self.val_x, self.val_y, self.val_z = func(
-            self.xyz, srcLoc, sig, t, orientation=orientation
+
+        def call(locations):
+            return func(
+                locations, srcLoc, sig, t, orientation=orientation,
+                **_precisionKwargs(func, self.precision)
+            )
+
+        def evaluate():
+            val_x, val_y, val_z = [
+                self._reshape_plane(np.asarray(v))
+                for v in call(self._locations(srcLoc, func, call))
+            ]
+            return (
+                val_x, val_y, val_z,
+                amplitude(val_x.real, val_y.real, val_z.real),
+            )
+
+        (
+            self.VAL_X, self.VAL_Y, self.VAL_Z, self.VEC_amp
+        ) = self._eval_plane(
+            ("TD", _key(t)), srcLoc, sig, orientation, func, evaluate
         )
+        self.val_x = self.VAL_X.ravel()
+        self.val_y = self.VAL_Y.ravel()
+        self.val_z = self.VAL_Z.ravel()
 
-        if self.normal.upper() == "X":
-            def Freshape(v):
-                return v.reshape(self.ncy, self.ncz)
-        elif self.normal.upper() == "Y":
-            def Freshape(v):
-                return v.reshape(self.ncx, self.ncz)
-        elif self.normal.upper() == "Z":
-            def Freshape(v):
-                return v.reshape(self.ncx, self.ncy)
+    def _draw_plane(
+        self, ax, a, b, val, vmin, vmax, ncontour, cmap, showcontour, levels,
+        colorbar, logamp, vec
+    ):
+        """
+            Filled contours of val on the grid (a, b), with contour lines,
+            a colorbar and the streamlines of vec = (vec_a, vec_b) (None for
+            none). In persistent mode the colorbar of the previous call is
+            updated, and its contours and streamlines replaced.
+        """
+        state = self._plot_state(
+            ax, "plane", (
+                a[0], a[-1], a.size, b[0], b[-1], b.size, ncontour, cmap,
+                showcontour, colorbar, logamp, vec is None
+            )
+        )
+        for name in ["contourf", "contour", "streamlines"]:
+            if name in state:
+                _remove(state.pop(name))
 
-        self.VAL_X = Freshape(self.val_x)
-        self.VAL_Y = Freshape(self.val_y)
-        self.VAL_Z = Freshape(self.val_z)
-        self.VEC_amp = np.sqrt(
-            self.VAL_X.real**2 + self.VAL_Y.real**2 + self.VAL_Z.real**2
+        dat = ax.contourf(
+            a, b, val, ncontour, clim=(vmin, vmax), vmin=vmin, vmax=vmax,
+            cmap=cmap
         )
+        state["contourf"] = dat
+
+        if showcontour:
+            state["contour"] = ax.contour(
+                a, b, val, levels, colors="k", linestyles="-"
+            )
+
+        if colorbar:
+            if logamp is True:
+                format = "$10^{%.1f}$"
+            else:
+                format = "%.1e"
+            self.colorbar(ax, dat, np.linspace(vmin, vmax, 3), format)
+
+        if vec is not None:
+            # streamplot adds its arrows to the axes one patch at a time
+            npatch = len(ax.patches)
+            stream = ax.streamplot(
+                a, b, vec[0], vec[1], color="w", linewidth=0.5
+            )
+            state["streamlines"] = [stream.lines] + list(ax.patches[npatch:])
+
+        return dat
 
     def plot2D_FD(
         self, component="real", view="vec", ncontour=20, logamp=True,
@@ -192,8 +720,7 @@ class DataView(object):
             2D visualization of dipole fields
         """
         if ax is None:
-            fig = plt.figure(figsize=(6.5, 5))
-            ax = plt.subplot(111)
+            ax = self._figure_axes("plot2D_FD")
 
         if component == "real":
             VAL_X = self.VAL_X.real
@@ -258,51 +785,28 @@ class DataView(object):
         else:
             vmin, vmax = clim[0], clim[1]
 
-        dat = ax.contourf(
-            a, b, val, ncontour, clim=(vmin, vmax), vmin=vmin, vmax=vmax,
-            cmap=cmap
-        )
-
-        if showcontour:
-            ax.contour(a, b, val, levels, colors="k", linestyles="-")
-
-        if colorbar:
-            if logamp is True:
-                cb = plt.colorbar(
-                    dat, ax=ax, format="$10^{%.1f}$",
-                    ticks=np.linspace(vmin, vmax, 3)
-                )
-            else:
-                cb = plt.colorbar(
-                    dat, ax=ax, format="%.1e", ticks=np.linspace(vmin, vmax, 3)
-                )
-
-        ax.set_xlabel(xlabel)
-        ax.set_ylabel(ylabel)
-
+        vec = None
         if view == "vec":
-            nx = self.x.size
-            nskip = int(nx/15)
             if component == "real":
                 # ax.quiver(a[::nskip], b[::nskip], (vec_a.real/VEC_amp)[::nskip,::nskip],  (vec_b.real/VEC_amp)[::nskip,::nskip], color="w", linewidth=0.5)
-                ax.streamplot(
-                    a, b, vec_a.real,  vec_b.real, color="w", linewidth=0.5
-                )
+                vec = vec_a.real, vec_b.real
             elif component == "imag":
                 # ax.quiver(a, b, vec_a.imag/VEC_amp,  vec_b.imag/VEC_amp, color="w", linewidth=0.5)
-                ax.streamplot(
-                    a, b, vec_a.imag,  vec_b.imag, color="w", linewidth=0.5
-                )
+                vec = vec_a.imag, vec_b.imag
             if component == "amplitude":
                 # ax.quiver(a, b, abs(vec_a)/VEC_amp,  abs(vec_b)/VEC_amp, color="w", linewidth=0.5)
-                ax.streamplot(
-                    a, b, abs(vec_a),  abs(vec_b), color="w", linewidth=0.5
-                )
+                vec = abs(vec_a), abs(vec_b)
             elif component == "phase":
                 # ax.quiver(a, b, phase(vec_a)/VEC_amp,  phase(vec_b)/VEC_amp, color="w", linewidth=0.5)
-                ax.streamplot(
-                    a, b, phase(vec_a),  phase(vec_b), color="w", linewidth=0.5
-                )
+                vec = phase(vec_a), phase(vec_b)
+
+        dat = self._draw_plane(
+            ax, a, b, val, vmin, vmax, ncontour, cmap, showcontour, levels,
+            colorbar, logamp, vec
+        )
+
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
 
         return ax, dat
 
@@ -314,8 +818,7 @@ class DataView(object):
             2D visualization of dipole fields
         """
         if ax is None:
-            fig = plt.figure(figsize=(6.5, 5))
-            ax = plt.subplot(111)
+            ax = self._figure_axes("plot2D_TD")
 
         if view == "amp" or view == "vec":
             val = self.VEC_amp
@@ -352,35 +855,19 @@ class DataView(object):
         else:
             vmin, vmax = clim[0], clim[1]
 
-        dat = ax.contourf(
-            a, b, val, ncontour, clim=(vmin, vmax), vmin=vmin, vmax=vmax,
-            cmap=cmap
-        )
-
-        if showcontour:
-            ax.contour(a, b, val, levels, colors="k", linestyles="-")
+        vec = None
+        if view == "vec":
+            # ax.quiver(a[::nskip], b[::nskip], (vec_a.real/VEC_amp)[::nskip,::nskip],  (vec_b.real/VEC_amp)[::nskip,::nskip], color="w", linewidth=0.5)
+            vec = vec_a, vec_b
 
-        if colorbar:
-            if logamp is True:
-                cb = plt.colorbar(
-                    dat, ax=ax, format="$10^{%.1f}$",
-                    ticks=np.linspace(vmin, vmax, 3)
-                )
-            else:
-                cb = plt.colorbar(
-                    dat, ax=ax, format="%.1e",
-                    ticks=np.linspace(vmin, vmax, 3)
-                )
+        dat = self._draw_plane(
+            ax, a, b, val, vmin, vmax, ncontour, cmap, showcontour, levels,
+            colorbar, logamp, vec
+        )
 
         ax.set_xlabel(xlabel)
         ax.set_ylabel(ylabel)
 
-        if view == "vec":
-            nx = self.x.size
-            nskip = int(nx/15)
-            # ax.quiver(a[::nskip], b[::nskip], (vec_a.real/VEC_amp)[::nskip,::nskip],  (vec_b.real/VEC_amp)[::nskip,::nskip], color="w", linewidth=0.5)
-            ax.streamplot(a, b, vec_a,  vec_b, color="w", linewidth=0.5)
-
         return ax, dat
 
     def plot_profile_FD(
@@ -389,8 +876,7 @@ class DataView(object):
     ):
 
         if ax is None:
-            fig = plt.figure(figsize=(6.5, 5))
-            ax = plt.subplot(111)
+            ax = self._figure_axes("plot_profile_FD")
 
         if self.geometry.upper() == "PROFILE":
             start = self.xyz[0]
@@ -435,19 +921,25 @@ class DataView(object):
         elif view.upper() == "Z":
             pltvalue = self1D.val_z
 
+        if self.persistent:
+            # the axes may be log scaled by the previous call
+            ax.set_yscale("linear")
+
         if component.upper() == "REAL":
-            ax.plot(D, pltvalue.real, color=color)
+            self.plot_line(ax, "profile", D, pltvalue.real, color=color)
             ax.set_ylabel("E field, Real part (V/m)")
         elif component.upper() == "IMAG":
-            ax.plot(D, pltvalue.imag, color=color)
+            self.plot_line(ax, "profile", D, pltvalue.imag, color=color)
             ax.set_ylabel("E field, Imag part (V/m)")
         elif component.upper() == "AMPLITUDE":
             if logamp is True:
                 ax.set_yscale('log')
-            ax.plot(D, np.absolute(pltvalue), color=color)
+            self.plot_line(
+                ax, "profile", D, np.absolute(pltvalue), color=color
+            )
             ax.set_ylabel("E field, Amplitude (V/m)")
         elif component.upper() == "PHASE":
-            ax.plot(D, phase(pltvalue), color=color)
+            self.plot_line(ax, "profile", D, phase(pltvalue), color=color)
             ax.set_ylabel("E field, Phase")
 
         ax.set_xlabel("Distance from startinng point (m)")
@@ -552,14 +1044,30 @@ class DataView(object):
 
         return ax0, ax1
 
+    def _annotate(self, ax, text, xy):
+        """
+            Label of the slice of plot1D_FD at xy, moved and set to text in
+            persistent mode
+        """
+        state = self._plot_state(ax, "texts")
+        if "annotation" in state:
+            state["annotation"].set_text(text)
+            state["annotation"].xy = xy
+            state["annotation"].set_position(xy)
+        else:
+            state["annotation"] = ax.annotate(
+                text, xy=xy, xycoords='data', xytext=xy, textcoords='data',
+                fontsize=14.
+            )
+        return state["annotation"]
+
     def plot1D_FD(
         self, component="real", view="x", abscisse="Conductivity", slic=None,
         logamp=True, ax=None,legend=True, color = 'black'
     ):
 
         if ax is None:
-            fig = plt.figure(figsize=(6.5, 5))
-            ax = plt.subplot(111)
+            ax = self._figure_axes("plot1D_FD")
 
         slice_ind = 0
         if slic is None:
@@ -572,6 +1080,11 @@ class DataView(object):
 
         pltvalue = []
 
+        if self.persistent:
+            # the axes may be log scaled by the previous call
+            ax.set_xscale("linear")
+            ax.set_yscale("linear")
+
         if view.upper() == "X":
             pltvalue = self.val_xfs
         elif view.upper() == "Y":
@@ -598,9 +1111,9 @@ class DataView(object):
         if component.upper() == "PHASOR":
             if abscisse.upper() == "CONDUCTIVITY":
                 slice_ind = np.where( slic == self.log_fvec)[0][0]
-                ax.plot(
-                    pltvalue.real[:, slice_ind], pltvalue.imag[:, slice_ind],
-                    color=color
+                self.plot_line(
+                    ax, "1D", pltvalue.real[:, slice_ind],
+                    pltvalue.imag[:, slice_ind], color=color
                 )
                 ax.set_xlabel("E field, Real part (V/m)")
                 ax.set_ylabel("E field, Imag part(V/m)")
@@ -609,31 +1122,22 @@ class DataView(object):
                 axymax = pltvalue.imag[:, slice_ind].max()
 
                 if legend:
-                    ax.annotate(
-                        ("f =%0.5f Hz") % (self.fvec[slice_ind]),
-                        xy=(
+                    self._annotate(
+                        ax, ("f =%0.5f Hz") % (self.fvec[slice_ind]),
+                        (
                             (
                                 pltvalue.real[:, slice_ind].min() +
                                 pltvalue.real[:, slice_ind].max()
                             )/2.,
                             axymin+(axymax-axymin)/4.
-                            ),
-                        xycoords='data',
-                        xytext=(
-                            (
-                                pltvalue.real[:, slice_ind].min() +
-                                pltvalue.real[:, slice_ind].max()
-                            )/2.,
-                            axymin+(axymax-axymin)/4.),
-                        textcoords='data',
-                        fontsize=14.
+                        )
                     )
 
             elif abscisse.upper() == "FREQUENCY":
                 slice_ind = np.where(slic == self.log_sigvec)[0][0]
-                ax.plot(
-                    pltvalue.real[slice_ind, :], pltvalue.imag[slice_ind, :],
-                    color=color
+                self.plot_line(
+                    ax, "1D", pltvalue.real[slice_ind, :],
+                    pltvalue.imag[slice_ind, :], color=color
                 )
                 ax.set_xlabel("E field, Real part (V/m)")
                 ax.set_ylabel("E field, Imag part(V/m)")
@@ -642,23 +1146,14 @@ class DataView(object):
                 axymax = pltvalue.imag[slice_ind, :].max()
 
                 if legend:
-                    ax.annotate(
-                        ("$\sigma$ =%0.5f S/m") % (self.sigvec[slice_ind]),
-                        xy=(
+                    self._annotate(
+                        ax, ("$\sigma$ =%0.5f S/m") % (self.sigvec[slice_ind]),
+                        (
                             (
                                 pltvalue.real[slice_ind, :].min() +
                                 pltvalue.real[slice_ind, :].max())/2.,
                             axymin+(axymax-axymin)/4.
-                        ),
-                        xycoords='data',
-                        xytext=(
-                            (
-                                pltvalue.real[slice_ind, :].min() +
-                                pltvalue.real[slice_ind, :].max()
-                            )/2.,
-                            axymin+(axymax-axymin)/4.),
-                        textcoords='data',
-                        fontsize=14.
+                        )
                     )
 
         else:
@@ -666,24 +1161,17 @@ class DataView(object):
                 ax.set_xlabel("Conductivity (S/m)")
                 ax.set_xscale('log')
                 slice_ind = np.where( slic == self.log_fvec)[0][0]
-                ax.plot(self.sigvec, pltvalue[:, slice_ind], color=color)
+                self.plot_line(
+                    ax, "1D", self.sigvec, pltvalue[:, slice_ind],
+                    color=color
+                )
 
                 axymin = pltvalue[:, slice_ind].min()
                 axymax = pltvalue[:, slice_ind].max()
                 if legend:
-                    ax.annotate(
-                        ("f =%0.5f Hz") % (self.fvec[slice_ind]),
-                        xy=(
-                            10.**(
-                                (
-                                    np.log10(self.sigvec.min()) +
-                                    np.log10(self.sigvec.max())
-
-                            )/2
-                            ),
-                            axymin+(axymax-axymin)/4.),
-                        xycoords='data',
-                        xytext=(
+                    self._annotate(
+                        ax, ("f =%0.5f Hz") % (self.fvec[slice_ind]),
+                        (
                             10.**(
                                 (
                                     np.log10(self.sigvec.min()) +
@@ -691,23 +1179,23 @@ class DataView(object):
 
                             )/2
                             ),
-                            axymin+(axymax-axymin)/4.),
-                        textcoords='data',
-                        fontsize=14.
+                            axymin+(axymax-axymin)/4.)
                     )
 
             elif abscisse.upper() == "FREQUENCY":
                 ax.set_xlabel("Frequency (Hz)")
                 ax.set_xscale('log')
                 slice_ind = np.where( slic == self.log_sigvec)[0][0]
-                ax.plot(self.fvec, pltvalue[slice_ind, :], color=color)
+                self.plot_line(
+                    ax, "1D", self.fvec, pltvalue[slice_ind, :], color=color
+                )
 
                 axymin = pltvalue[slice_ind, :].min()
                 axymax = pltvalue[slice_ind, :].max()
                 if legend:
-                    ax.annotate(
-                        ("$\sigma$ =%0.5f S/m") % (self.sigvec[slice_ind]),
-                        xy=(
+                    self._annotate(
+                        ax, ("$\sigma$ =%0.5f S/m") % (self.sigvec[slice_ind]),
+                        (
                             10.**(
                                 (
                                     np.log10(self.fvec.min()) +
@@ -715,20 +1203,8 @@ class DataView(object):
                                 )/2
                             ),
                             axymin+(axymax-axymin)/4.
-                        ),
-                        xycoords='data',
-                        xytext=(
-                            10.**(
-                                (
-                                    np.log10(self.fvec.min()) +
-                                    np.log10(self.fvec.max())
-
-                            )/2
-                            ),
-                            axymin+(axymax-axymin)/4.
-                        ),
-                        textcoords='data',
-                        fontsize=14.)
+                        )
+                    )
 
         return ax
 
@@ -742,8 +1218,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Frequency (Hz)")
@@ -829,8 +1305,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Frequency (Hz)")
@@ -916,8 +1392,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Conductivity (S/m)")
@@ -1003,8 +1479,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Conductivity (S/m)")
@@ -1093,8 +1569,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax.plot(self.val_xfs.real[sigind, :], self.val_xfs.imag[sigind, :])
@@ -1109,8 +1585,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax.plot(self.val_xfs.real[:, freqind], self.val_xfs.imag[:, freqind])
@@ -1125,8 +1601,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Frequency (Hz)")
@@ -1214,8 +1690,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Frequency (Hz)")
@@ -1307,8 +1783,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Conductivity (S/m)")
@@ -1392,8 +1868,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Conductivity (S/m)")
@@ -1478,8 +1954,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax.plot(self.val_yfs.real[sigind, :], self.val_yfs.imag[sigind, :])
@@ -1494,8 +1970,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax.plot(self.val_yfs.real[:, freqind], self.val_yfs.imag[:, freqind])
@@ -1510,8 +1986,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Frequency (Hz)")
@@ -1602,8 +2078,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Frequency (Hz)")
@@ -1697,8 +2173,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Conductivity (S/m)")
@@ -1781,8 +2257,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax0.set_xlabel("Conductivity (S/m)")
@@ -1875,8 +2351,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax.plot(self.val_zfs.real[sigind, :], self.val_zfs.imag[sigind, :])
@@ -1891,8 +2367,8 @@ class DataView(object):
             obsLoc = np.c_[self.x, absloc, coordloc]
 
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         ax.plot(self.val_zfs.real[:, freqind], self.val_zfs.imag[:, freqind])
@@ -1911,8 +2387,8 @@ class DataView(object):
 
         obsLoc = np.c_[obslocx, obslocy, obslocz]
         self.eval_loc(
-            self.srcLoc, obsLoc, self.sigvec, self.fvec, self.orientation,
-            self.func1D
+            self.srcLoc, obsLoc, self.log_sigvec, self.log_fvec,
+            self.orientation, self.normal, self.func1D
         )
 
         if mode == "RI":
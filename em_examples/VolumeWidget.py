@@ -11,6 +11,9 @@ from mpl_toolkits.mplot3d import proj3d
 
 from .Base import widgetify
 
+from . import _set_rcParams
+_set_rcParams()
+
 
 class Arrow3D(FancyArrowPatch):
     def __init__(self, xs, ys, zs, *args, **kwargs):
@@ -13,6 +13,9 @@ from mpl_toolkits.mplot3d import proj3d
 from .VolumeWidget import Arrow3D, polyplane
 from .Base import widgetify
 
+from . import _set_rcParams
+_set_rcParams()
+
 
 def plotObj3D(
     fig=None, ax=None, offset_plane=0., offset_rx=50., elev=20, azim=300,
@@ -2,49 +2,89 @@ from __future__ import print_function
 from __future__ import absolute_import
 from __future__ import unicode_literals
 import sys
+import importlib
 
-from . import Attenuation
-from . import BiotSavart
-from . import CondUtils
-from . import DC_cylinder
-from . import DCLayers
-from . import DCsphere
-from . import DC_Pseudosections
-from . import DCIP_overburden_PseudoSection
-from . import DCWidget_Overburden_2_5D
-from . import DCWidgetPlate2_5D
-from . import DCWidgetPlate_2D
-from . import DCWidgetResLayer2_5D
-from . import DCWidgetResLayer2D
-from . import DipoleWidget1D
-from . import DipoleWidgetFD
-from . import DipoleWidgetTD
-from . import EMcircuit
-from . import FDEMDipolarfields
-from . import FDEMPlanewave
-from . import FDEM3loop
-from . import FreqtoTime
-from . import HarmonicVMDCylWidget
-from . import InductionLoop
-from . import InductionSphereFEM
-from . import InductionSphereTEM
-from . import Loop
-from . import MT
-from . import PlanewaveWidgetFD
-from . import Reflection
-from . import sphereElectrostatic_example
-from . import TDEMHorizontalLoopCylWidget
-from . import View
-from . import VolumeWidget
-from . import VolumeWidgetPlane
+# Submodules are resolved on first attribute access (PEP 562), so that e.g.
+# ``from em_examples import FDEMDipolarfields`` does not pull in SimPEG,
+# ipywidgets and every widget of the package.
+_submodules = [
+    'Attenuation',
+    'BiotSavart',
+    'CondUtils',
+    'DC_cylinder',
+    'DCLayers',
+    'DCsphere',
+    'DC_Pseudosections',
+    'DCIP_overburden_PseudoSection',
+    'DCWidget_Overburden_2_5D',
+    'DCWidgetPlate2_5D',
+    'DCWidgetPlate_2D',
+    'DCWidgetResLayer2_5D',
+    'DCWidgetResLayer2D',
+    'DipoleWidget1D',
+    'DipoleWidgetFD',
+    'DipoleWidgetTD',
+    'EMcircuit',
+    'FDEMDipolarfields',
+    'FDEMPlanewave',
+    'FDEM3loop',
+    'FreqtoTime',
+    'HarmonicVMDCylWidget',
+    'InductionLoop',
+    'InductionSphereFEM',
+    'InductionSphereTEM',
+    'Loop',
+    'MT',
+    'PlanewaveWidgetFD',
+    'Reflection',
+    'sphereElectrostatic_example',
+    'TDEMHorizontalLoopCylWidget',
+    'View',
+    'VolumeWidget',
+    'VolumeWidgetPlane',
+    'TDEMGroundedSource',
+    'LinearInversion',
+    'ModelBuilder',
+    'DCSurvey',
+    'DCProblem2D',
+    'LinearIP',
+    'DCSweep',
+    'DCSolvers',
+    'DCMesh',
+    'ChunkedKernels',
+    'KernelBackends',
+]
 if sys.version_info[0] > 2:
-    from . import MarineCSEM1D
-from . import TDEMGroundedSource
-from . import LinearInversion
+    _submodules.append('MarineCSEM1D')
 
+__all__ = list(_submodules)
 
-from matplotlib import rcParams
-rcParams['font.size'] = 16
+def _set_rcParams():
+    """
+        Apply the package plot style. The submodules that import matplotlib
+        call it after their own module level settings, so that importing
+        any of them gives the style the package import used to set.
+    """
+    from matplotlib import rcParams
+    rcParams['font.size'] = 16
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name)
+    )
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + _submodules)
+
+
+if sys.version_info < (3, 7):
+    # module level __getattr__ is not available, import everything up front
+    for _name in _submodules:
+        globals()[_name] = importlib.import_module('.' + _name, __name__)
 
 __version__ = '0.0.35'
 __author__ = 'GeoScixyz developers'
@@ -8,6 +8,10 @@ import matplotlib.colors as colors
 import numpy as np
 from SimPEG.Utils import ndgrid, mkvc
 
+if __package__:
+    from . import _set_rcParams
+    _set_rcParams()
+
 """
 Authors: Thibaut Astic, Lindsey Heagy, Sanna Tyrvainen, Ronghua Peng
 Date: December 2015
@@ -0,0 +1,160 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import unittest
+import numpy as np
+
+from em_examples import ChunkedKernels, FDEMDipolarfields, TDEMDipolarfields
+from em_examples.ChunkedKernels import (
+    evalInChunks, setChunkSize, setMemoryBudget, setThreads
+)
+from em_examples.KernelBackends import AxisGrid
+
+# The broadcasting and chunking of ChunkedKernels.broadcastKernel, through
+# the kernels it decorates.
+
+
+def relativeDifference(fields, reference):
+    return max(
+        np.max(np.abs(a - b)) for a, b in zip(fields, reference)
+    ) / max(np.max(np.abs(b)) for b in reference)
+
+
+class ChunkedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.options = dict(ChunkedKernels._options)
+        rng = np.random.RandomState(0)
+        self.xyz = rng.rand(100, 3) * 200. - 100.
+        self.srcLoc = np.r_[1., -2., 3.]
+        self.sig = np.r_[1e-3, 1e-2, 1e-1]
+        self.f = np.r_[1e1, 1e2, 1e3, 1e4]
+
+    def tearDown(self):
+        ChunkedKernels._options.update(self.options)
+
+    def assertSame(self, fields, reference):
+        self.assertEqual(len(fields), len(reference))
+        for a, b in zip(fields, reference):
+            self.assertEqual(a.shape, b.shape)
+            np.testing.assert_allclose(a, b, rtol=1e-12, atol=0.)
+
+    def test_shapes(self):
+        func = FDEMDipolarfields.E_from_ElectricDipoleWholeSpace
+        xyz, src, sig, f = self.xyz, self.srcLoc, self.sig, self.f
+        cases = [
+            ((xyz, src, sig, f), (100, 4, 3)),
+            ((xyz, src, sig, f[0]), (100, 1, 3)),
+            ((xyz, src, sig[0], f), (100, 4, 1)),
+            ((xyz[:1], src, sig, f), (1, 4, 3)),
+            # 1D, for a single conductivity and a single location or
+            # frequency
+            ((xyz, src, sig[0], f[0]), (100,)),
+            ((xyz[:1], src, sig[0], f), (4,)),
+            ((xyz[0], src, sig[0], f[0]), (1,)),
+        ]
+        for args, shape in cases:
+            for component in func(*args, orientation='X'):
+                self.assertEqual(component.shape, shape)
+
+    def test_loops(self):
+        # each (frequency, conductivity) as the kernels computed them one
+        # at a time
+        for func, times in [
+            (FDEMDipolarfields.E_from_ElectricDipoleWholeSpace, self.f),
+            (FDEMDipolarfields.H_from_MagneticDipoleWholeSpace, self.f),
+            (TDEMDipolarfields.E_from_ElectricDipoleWholeSpace, self.f * 1e-7),
+        ]:
+            out = func(
+                self.xyz, self.srcLoc, self.sig, times, orientation='Z'
+            )
+            for i, t in enumerate(times):
+                for j, sig in enumerate(self.sig):
+                    self.assertSame(
+                        [o[:, i, j] for o in out],
+                        func(self.xyz, self.srcLoc, sig, t, orientation='Z')
+                    )
+
+    def test_chunks(self):
+        # blocks of 1 to 9 receivers, most not dividing 100, serial and on
+        # the thread pool, and an AxisGrid of the same receivers
+        func = FDEMDipolarfields.H_from_ElectricDipoleWholeSpace
+        args = (self.srcLoc, self.sig, self.f)
+        setChunkSize(None)
+        setThreads(1)
+        reference = func(self.xyz, *args, orientation='Y')
+        x, y = np.meshgrid(
+            np.linspace(-50., 50., 10), np.linspace(-20., 30., 10),
+            sparse=True
+        )
+        grid = AxisGrid(x, y, 5.)
+        gridReference = func(grid.XYZ, *args, orientation='Y')
+
+        for nThreads in [1, 3]:
+            setThreads(nThreads)
+            for chunkSize in [12, 37, 60, 108]:
+                setChunkSize(chunkSize)
+                self.assertSame(
+                    func(self.xyz, *args, orientation='Y'), reference
+                )
+                self.assertSame(
+                    func(grid, *args, orientation='Y'), gridReference
+                )
+
+        # blocks bound by the memory budget
+        setChunkSize(None)
+        setMemoryBudget(ChunkedKernels.bytesPerPoint * 3 * 50)
+        self.assertSame(func(self.xyz, *args, orientation='Y'), reference)
+
+    def test_evalInChunks(self):
+        # every row computed once, for the output types of the kernels
+        def func(start, stop):
+            rows = np.arange(start, stop)
+            return {
+                'a': (rows * 1., rows[:, None] * np.r_[1j, 2j]),
+                'b': (-rows,),
+            }
+
+        for nThreads in [1, 4]:
+            setThreads(nThreads)
+            for chunkSize in [1, 7, 33, 1000]:
+                setChunkSize(chunkSize)
+                out = evalInChunks(func, 100)
+                rows = np.arange(100)
+                np.testing.assert_array_equal(out['a'][0], rows)
+                np.testing.assert_array_equal(
+                    out['a'][1], rows[:, None] * np.r_[1j, 2j]
+                )
+                np.testing.assert_array_equal(out['b'][0], -rows)
+                self.assertEqual(
+                    evalInChunks(lambda i, j: np.arange(i, j), 10).tolist(),
+                    list(range(10))
+                )
+
+        with self.assertRaises(Exception):
+            setChunkSize(0)
+        with self.assertRaises(Exception):
+            setThreads(0)
+
+
+class SinglePrecisionTest(unittest.TestCase):
+
+    def test_farFromOrigin(self):
+        # the offsets to the source are taken before the cast to float32
+        rng = np.random.RandomState(0)
+        xyz = rng.rand(500, 3) * 200. - 100.
+        srcLoc = np.r_[1., -2., 3.]
+        func = FDEMDipolarfields.E_from_ElectricDipoleWholeSpace
+        for shift in [0., 1e5]:
+            args = (xyz + shift, srcLoc + shift, 1e-2, 1e3)
+            reference = func(*args, orientation='Y')
+            fields = func(*args, orientation='Y', precision='single')
+            self.assertEqual(fields[0].dtype, np.complex64)
+            error = relativeDifference(fields, reference)
+            self.assertLess(error, 1e-6, "{:g}: {:.1e}".format(shift, error))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import unittest
+import numpy as np
+
+from SimPEG import Maps
+from SimPEG.EM.Static import DC
+from em_examples.DCMesh import designDCMesh
+
+# The meshes of designDCMesh against the analytic potential of a line source
+# on a halfspace, rho / pi ln(rN / rM).
+
+
+def dipoleErrors(mesh, x, srcx, rho=100.):
+    """
+        Relative errors of the dipoles between consecutive electrodes beyond
+        a pole source at srcx
+    """
+    xs = x[x > srcx]
+    z = np.zeros(xs.size - 1)
+    rx = DC.Rx.Dipole(np.c_[xs[:-1], z], np.c_[xs[1:], z])
+    survey = DC.Survey([DC.Src.Pole([rx], np.r_[srcx, 0.])])
+    problem = DC.Problem3D_CC(mesh, sigmaMap=Maps.ExpMap(mesh))
+    problem.pair(survey)
+    d = survey.dpred(np.log(1. / rho) * np.ones(mesh.nC))
+    analytic = rho / np.pi * np.log((xs[1:] - srcx) / (xs[:-1] - srcx))
+    return np.abs(d - analytic) / np.abs(analytic)
+
+
+class DesignDCMeshTest(unittest.TestCase):
+
+    def test_accuracy(self):
+        for a, n in [(5., 21), (10., 11)]:
+            x = np.arange(n) * a - (n // 2) * a
+            for accuracy in [0.1, 0.05]:
+                mesh, info = designDCMesh(x, accuracy=accuracy, verbose=False)
+                self.assertLessEqual(info['error'], accuracy)
+                # source at the end and in the middle of the line
+                for srcx in [x[0], x[n // 2]]:
+                    error = dipoleErrors(mesh, x, srcx).max()
+                    self.assertLess(
+                        error, accuracy, "a = {}, accuracy {}: {:.3f}".format(
+                            a, accuracy, error
+                        )
+                    )
+
+    def test_cellSize(self):
+        x = np.arange(21) * 5.
+        mesh, info = designDCMesh(x, accuracy=0.05, verbose=False)
+        self.assertEqual(info['cs'], 5. / 8.)
+        # the electrodes fall on cell boundaries
+        faces = mesh.vectorNx
+        self.assertTrue(all(np.isclose(faces, xi).any() for xi in x))
+        self.assertEqual(info['nC'], mesh.nC)
+        with self.assertRaises(Exception):
+            designDCMesh([0.], verbose=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
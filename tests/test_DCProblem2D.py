@@ -0,0 +1,35 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import unittest
+import warnings
+import numpy as np
+
+from em_examples.DCProblem2D import getAdaptiveKys, getKyError
+
+# The wavenumber quadrature of the 2.5D DC problems.
+
+
+class AdaptiveKysTest(unittest.TestCase):
+
+    def test_tolerance(self):
+        r = np.logspace(0, 2, 50)
+        for tol in [1e-2, 1e-3]:
+            kys, w, err = getAdaptiveKys(1., 100., tol)
+            self.assertLessEqual(err, tol)
+            self.assertLessEqual(getKyError(kys, r, w), tol * (1. + 1e-6))
+
+    def test_notReached(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            kys, w, err = getAdaptiveKys(1., 1e3, 1e-9, nkyMax=3)
+        self.assertEqual(kys.size, 3)
+        self.assertGreater(err, 1e-9)
+        self.assertEqual(len(caught), 1)
+        self.assertIn("not reached", str(caught[0].message))
+
+
+if __name__ == '__main__':
+    unittest.main()
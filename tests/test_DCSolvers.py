@@ -0,0 +1,145 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import unittest
+import numpy as np
+
+from SimPEG import Mesh, Maps
+from SimPEG.EM.Static import DC
+from em_examples.DCSolvers import (
+    SolverPCG, getDCSolver, clearLastSolutions, _lastSolutions,
+    _lastSolutionsLock
+)
+
+# Compare the iterative DC solvers with SolverLU on a small halfspace.
+
+
+def halfspaceProblem(nc=40, npad=8):
+    cs = 80. / nc
+    hx = [(cs, npad, -1.3), (cs, nc), (cs, npad, 1.3)]
+    hy = [(cs, npad, -1.3), (cs, nc//2)]
+    mesh = Mesh.TensorMesh([hx, hy], "CN")
+    rx = DC.Rx.Pole(mesh.gridCC)
+    src = DC.Src.Pole([rx], np.r_[0., 0.])
+    survey = DC.Survey([src])
+    problem = DC.Problem3D_CC(mesh, sigmaMap=Maps.ExpMap(mesh))
+    problem.pair(survey)
+    return problem, survey, np.log(1e-2) * np.ones(mesh.nC)
+
+
+class SolverPCGTest(unittest.TestCase):
+
+    def setUp(self):
+        clearLastSolutions()
+        self.problem, self.survey, self.m = halfspaceProblem()
+        self.problem.Solver = getDCSolver('LU')
+        self.phiLU = self.survey.dpred(self.m)
+
+    def test_backends(self):
+        for name in ['PCG', 'PCG-Jacobi']:
+            problem, survey, m = halfspaceProblem()
+            problem.Solver = getDCSolver(name)
+            phi = survey.dpred(m)
+            error = (
+                np.linalg.norm(phi - self.phiLU) / np.linalg.norm(self.phiLU)
+            )
+            self.assertLess(error, 1e-6, "{}: {:.1e}".format(name, error))
+
+    def plate(self, x0):
+        """
+            Conductive plate at x0 in the halfspace, the model of a widget
+        """
+        cc = self.problem.mesh.gridCC
+        m = self.m.copy()
+        m[(abs(cc[:, 0] - x0) < 5.) & (abs(cc[:, 1] + 15.) < 5.)] = np.log(
+            1e-1
+        )
+        return m
+
+    def solveWidget(self, m, system, Solver=None):
+        """
+            A new problem and solver for the model, as a widget callback
+        """
+        problem, survey, _ = halfspaceProblem()
+        problem.Solver = Solver or getDCSolver('PCG', system=system)
+        u = problem.fields(m)[:, 'phiSolution']
+        return getattr(problem.Ainv, 'nIterations', [None])[0], u
+
+    def test_warmStart(self):
+        # the next callback of a widget starts from the last solution: at
+        # once converged for the same model, in fewer iterations for a
+        # plate 10 % more conductive
+        m0 = self.plate(0.)
+        m1 = m0.copy()
+        m1[m0 != self.m] = np.log(1.1e-1)
+        cold, _ = self.solveWidget(m0, ('widget', 'total'))
+        again, _ = self.solveWidget(m0, ('widget', 'total'))
+        self.assertGreater(cold, 0)
+        self.assertEqual(again, 0)
+
+        coldChanged, _ = self.solveWidget(m1, None)
+        warm, u = self.solveWidget(m1, ('widget', 'total'))
+        self.assertLess(warm, coldChanged)
+        _, uLU = self.solveWidget(m1, None, Solver=getDCSolver('LU'))
+        self.assertLess(
+            np.linalg.norm(u - uLU) / np.linalg.norm(uLU), 1e-6
+        )
+
+        # not from another system of the same size
+        other, _ = self.solveWidget(m1, ('widget', 'primary'))
+        self.assertEqual(other, coldChanged)
+
+    def test_sensitivityKeepsFields(self):
+        # the adjoint solves of Jtvec do not replace the fields solution
+        problem, survey, m = halfspaceProblem()
+        problem.Solver = getDCSolver('PCG', system=('widget', 'sens'))
+        f = problem.fields(m)
+        problem.Jtvec(m, np.ones(survey.nD), f=f)
+        warm, _ = self.solveWidget(m, ('widget', 'sens'))
+        self.assertLessEqual(warm, 1)
+
+    def test_kySystems(self):
+        # each wavenumber of a 2.5D problem is a system of its own
+        from em_examples.DCProblem2D import Problem2D_CC
+
+        def solve(m, parallel):
+            mesh = self.problem.mesh
+            problem = Problem2D_CC(
+                mesh, sigmaMap=Maps.ExpMap(mesh), parallel=parallel
+            )
+            problem.Solver = getDCSolver('PCG', system=('widget', '2.5D'))
+            rx = DC.Rx.Pole_ky(mesh.gridCC)
+            survey = DC.Survey_ky([DC.Src.Pole([rx], np.r_[0., 0.])])
+            problem.pair(survey)
+            problem.fields(m)
+            return problem, [
+                getattr(Ainv, 'solver', Ainv).nIterations[0]
+                for Ainv in problem.Ainv
+            ]
+
+        for parallel in [None, 'thread']:
+            clearLastSolutions()
+            problem, cold = solve(self.plate(0.), parallel)
+            with _lastSolutionsLock:
+                systems = set(key[0] for key in _lastSolutions)
+            self.assertEqual(systems, set(
+                (('widget', '2.5D'), float(ky)) for ky in problem.kys
+            ))
+            _, warm = solve(self.plate(2.), parallel)
+            self.assertTrue(all(w <= c for w, c in zip(warm, cold)))
+            self.assertLess(sum(warm), sum(cold))
+
+    def test_options(self):
+        A = self.problem.getA()
+        with self.assertRaises(Exception):
+            SolverPCG(A, tolerance=1e-6)
+        with self.assertRaises(Exception):
+            SolverPCG(A, precond='ssor')
+        with self.assertRaises(Exception):
+            getDCSolver('CG')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import unittest
+import numpy as np
+
+from SimPEG.EM.Static import DC
+from em_examples.DCSurvey import (
+    getSurveyGeometry, makeSourceList, getGeometricFactor, calculateRhoA,
+    surveyTypes
+)
+
+# The survey geometries of DCSurvey against the loops of the widgets.
+
+
+def widgetSurvey(xr, flag, nmax, xmin, xmax, zloc=-2.5):
+    """
+        The sources of the DC2Dsurvey loops of the widgets, remote electrodes
+        at xmin (B) and xmax (N)
+    """
+    ntx = xr.size - 3 if flag == "DipoleDipole" else xr.size - 2
+    txList = []
+    for i in range(ntx):
+        if flag == "PoleDipole":
+            A, B = xr[i], xmin
+            if i < ntx-nmax+1:
+                M, N = xr[i+1:i+1+nmax], xr[i+2:i+2+nmax]
+            else:
+                M, N = xr[i+1:ntx+1], xr[i+2:i+2+nmax]
+        elif flag == "DipolePole":
+            A, B = xr[i], xr[i+1]
+            if i < ntx-nmax+1:
+                M = xr[i+2:i+2+nmax]
+            else:
+                M = xr[i+2:ntx+2]
+            N = np.ones(M.size) * xmax
+        elif flag == "DipoleDipole":
+            A, B = xr[i], xr[i+1]
+            if i < ntx-nmax:
+                M, N = xr[i+2:i+2+nmax], xr[i+3:i+3+nmax]
+            else:
+                M, N = xr[i+2:len(xr)-1], xr[i+3:len(xr)]
+        elif flag == "PolePole":
+            A, B = xr[i], xmin
+            if i < ntx-nmax+1:
+                M = xr[i+2:i+2+nmax]
+            else:
+                M = xr[i+2:ntx+2]
+            N = np.ones(M.size) * xmax
+
+        z = np.ones(M.size) * zloc
+        rx = DC.Rx.Dipole(np.c_[M, z], np.c_[N, z])
+        txList.append(DC.Src.Dipole([rx], np.r_[A, zloc], np.r_[B, zloc]))
+    return txList
+
+
+def widgetRhoA(survey, VM, VN, A, B, M, N):
+    """
+        calculateRhoA of the widgets
+    """
+    eps = 1e-9
+    if survey == "Dipole-Dipole":
+        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(M - B) + eps) -
+                  1. / (np.abs(N - A) + eps) + 1. / (np.abs(N - B) + eps))
+        return (VM - VN) * 2. * np.pi * G
+    elif survey == "Pole-Dipole":
+        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(N - A) + eps))
+        return (VM - VN) * 2. * np.pi * G
+    elif survey == "Dipole-Pole":
+        G = 1. / (1. / (np.abs(A - M) + eps) - 1. / (np.abs(M - B) + eps))
+        return VM * 2. * np.pi * G
+    elif survey == "Pole-Pole":
+        G = 1. / (1. / (np.abs(A - M) + eps))
+        return VM * 2. * np.pi * G
+
+
+class SurveyGeometryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.xr = np.arange(-40., 41., 5.)
+
+    def test_pseudoLocations(self):
+        # halfway between the transmitter and receiver midpoints, the remote
+        # electrodes left out
+        for surveyType in surveyTypes:
+            geometry = getSurveyGeometry(self.xr, surveyType, nmax=8)
+            A, B, M, N = [geometry[key] for key in 'ABMN']
+            xr = self.xr
+            txmid = np.where(B < 0, xr[A], 0.5*(xr[A] + xr[B]))
+            rxmid = np.where(N < 0, xr[M], 0.5*(xr[M] + xr[N]))
+            np.testing.assert_allclose(
+                geometry['xzlocs'], np.c_[0.5*(txmid + rxmid), geometry['n']],
+                err_msg=surveyType
+            )
+
+    def test_poleDipolePseudoLocations(self):
+        # the same as the getPseudoLocs of the widgets for a pole-dipole
+        # survey, whose receivers start next to A
+        xr, nmax = self.xr, 8
+        xzlocs = []
+        for i in range(xr.size - 2):
+            m = np.arange(i+1, min(i+1+nmax, xr.size-1))
+            rxmid = 0.5*(xr[m] + xr[m+1])
+            xzlocs.append(np.c_[
+                0.5*(xr[i] + rxmid), np.arange(rxmid.size) + 1.
+            ])
+        geometry = getSurveyGeometry(xr, 'PoleDipole', nmax)
+        np.testing.assert_allclose(geometry['xzlocs'], np.vstack(xzlocs))
+
+    def test_widgetSources(self):
+        # the same sources and receivers as the loops of the widgets
+        xr, zloc, xmin, xmax = self.xr, -2.5, -100., 100.
+        electrodes = np.c_[xr, np.ones_like(xr) * zloc]
+        for flag in ['PoleDipole', 'DipolePole', 'DipoleDipole', 'PolePole']:
+            for nmax in [1, 4, 8, 20]:
+                geometry = getSurveyGeometry(
+                    electrodes, flag, nmax, remoteB=np.r_[xmin, zloc],
+                    remoteN=np.r_[xmax, zloc]
+                )
+                srcList = makeSourceList(geometry)
+                oldList = widgetSurvey(xr, flag, nmax, xmin, xmax, zloc)
+                msg = "{} nmax={}".format(flag, nmax)
+                self.assertEqual(len(srcList), len(oldList), msg)
+                for src, old in zip(srcList, oldList):
+                    for loc, oldLoc in zip(src.loc, old.loc):
+                        np.testing.assert_array_equal(loc, oldLoc, msg)
+                    for loc, oldLoc in zip(src.rxList[0].locs,
+                                           old.rxList[0].locs):
+                        np.testing.assert_array_equal(loc, oldLoc, msg)
+
+    def test_geometricFactors(self):
+        # calculateRhoA of the widgets, for scalars and arrays
+        rng = np.random.RandomState(0)
+        A, B, M, N = np.sort(rng.rand(4, 50) * 100. - 50., axis=0)
+        VM, VN = rng.rand(2, 50)
+        for survey in ['Dipole-Dipole', 'Pole-Dipole', 'Dipole-Pole',
+                       'Pole-Pole']:
+            np.testing.assert_allclose(
+                calculateRhoA(survey, VM, VN, A, B, M, N),
+                widgetRhoA(survey, VM, VN, A, B, M, N), rtol=1e-10,
+                err_msg=survey
+            )
+            rhoa = calculateRhoA(survey, VM[0], VN[0], A[0], B[0], M[0], N[0])
+            self.assertTrue(np.isscalar(rhoa))
+            self.assertAlmostEqual(
+                rhoa, widgetRhoA(survey, VM[0], VN[0], A[0], B[0], M[0], N[0])
+            )
+        with self.assertRaises(Exception):
+            calculateRhoA('Wenner', VM, VN, A, B, M, N)
+
+    def test_remoteElectrodes(self):
+        # the terms of infinite remote electrodes drop out
+        xr = self.xr
+        for flag in ['DipoleDipole', 'PoleDipole', 'DipolePole', 'PolePole']:
+            geometry = getSurveyGeometry(xr, flag, nmax=8)
+            A, B, M, N = [geometry[key] for key in 'ABMN']
+            self.assertEqual(geometry['G'].shape, A.shape)
+            G = getGeometricFactor(
+                xr[A], None if B[0] < 0 else xr[B], xr[M],
+                None if N[0] < 0 else xr[N]
+            )
+            np.testing.assert_allclose(geometry['G'], G, err_msg=flag)
+            self.assertTrue(np.isfinite(G).all())
+            if flag == 'PolePole':
+                np.testing.assert_allclose(G, np.abs(xr[M] - xr[A]))
+
+
+if __name__ == '__main__':
+    unittest.main()
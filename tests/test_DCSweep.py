@@ -0,0 +1,129 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from em_examples import DCSweep
+from em_examples.DCSweep import getSweepParameters, _openStore, runSweep
+
+# The stores of DCSweep, written and resumed.
+
+
+class StoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = os.path.join(tempfile.mkdtemp(), 'sweep')
+        self.names, self.values = getSweepParameters(
+            r=[1., 2.], zc=[-5., -10., -15.]
+        )
+        self.fixed = {'A': -10., 'B': 10.}
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.store))
+
+    def openStore(self, values=None):
+        return _openStore(
+            self.store, 'layer', self.names,
+            self.values if values is None else values, self.fixed, 5
+        )
+
+    def test_resume(self):
+        arrays = self.openStore()
+        self.assertEqual(arrays['done'].shape, (6,))
+        self.assertEqual(arrays['V'].shape, (6, 5))
+        self.assertEqual(arrays['rhoa'].shape, (6, 4))
+        self.assertFalse(arrays['done'].any())
+        arrays['V'][2] = 1.
+        arrays['done'][2] = True
+        for a in arrays.values():
+            a.flush()
+        del arrays
+
+        arrays = self.openStore()
+        np.testing.assert_array_equal(arrays['done'], np.arange(6) == 2)
+        np.testing.assert_array_equal(arrays['V'][2], 1.)
+
+        with self.assertRaises(Exception):
+            self.openStore(self.values + 1.)
+
+    def test_interrupted(self):
+        # the sweep is described last: without meta.json the store is
+        # created again
+        arrays = self.openStore()
+        arrays['done'][:] = True
+        arrays['done'].flush()
+        del arrays
+        os.remove(os.path.join(self.store, 'meta.json'))
+        self.assertFalse(self.openStore()['done'].any())
+
+        # an array lost after the sweep was described, all runs again
+        arrays = self.openStore()
+        arrays['done'][:] = True
+        arrays['done'].flush()
+        del arrays
+        os.remove(os.path.join(self.store, 'V.npy'))
+        arrays = self.openStore()
+        self.assertFalse(arrays['done'].any())
+        self.assertEqual(arrays['V'].shape, (6, 5))
+
+
+class ResumeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.params = {'xc': [-10., 10.], 'zc': [-10., -20.]}
+        self.fixed = {
+            'A': -30., 'B': 30., 'dx': 10., 'dz': 5., 'rotAng': 0.,
+            'sigplate': 1e-1, 'sighalf': 1e-3
+        }
+        self.runOne = DCSweep._runOne
+        self.runs = []
+
+    def tearDown(self):
+        DCSweep._runOne = self.runOne
+        shutil.rmtree(self.tmp)
+
+    def runSweep(self, name, interruptAfter=None):
+        def runOne(args):
+            if len(self.runs) == interruptAfter:
+                raise KeyboardInterrupt
+            self.runs.append(args[1])
+            return self.runOne(args)
+
+        DCSweep._runOne = runOne
+        return runSweep(
+            'plate2D', os.path.join(self.tmp, name), self.params, self.fixed,
+            nWorkers=0, verbose=False
+        )
+
+    def test_resume(self):
+        with self.assertRaises(KeyboardInterrupt):
+            self.runSweep('partial', interruptAfter=2)
+        self.assertEqual(self.runs, [0, 1])
+
+        # only the runs left, and the same results as a sweep in one go
+        self.runs = []
+        out = self.runSweep('partial')
+        self.assertEqual(self.runs, [2, 3])
+        self.assertTrue(out['done'].all())
+
+        self.runs = []
+        full = self.runSweep('full')
+        self.assertEqual(self.runs, [0, 1, 2, 3])
+        for name in ['V', 'rhoa']:
+            np.testing.assert_array_equal(out[name], full[name])
+
+        # nothing left to run
+        self.runs = []
+        self.runSweep('partial')
+        self.assertEqual(self.runs, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
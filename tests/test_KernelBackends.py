@@ -0,0 +1,121 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import unittest
+import numpy as np
+
+from em_examples import KernelBackends
+from em_examples import FDEMDipolarfields, TDEMDipolarfields
+from em_examples.KernelBackends import sphereField
+
+# Compare the compiled backends of the dipole and sphere kernels with the
+# NumPy one, through the FDEM / TDEM field functions that use them. The
+# tests of a backend that is not installed are skipped.
+
+TOL = 1e-10
+# float32 / complex64 fields, see ChunkedKernels
+TOL_SINGLE = 1e-5
+
+
+def relativeDifference(fields, reference):
+    return max(
+        np.max(np.abs(a - b)) for a, b in zip(fields, reference)
+    ) / max(np.max(np.abs(b)) for b in reference)
+
+
+def dipoleFunctions(module):
+    return [
+        getattr(module, name) for name in sorted(dir(module))
+        if name.endswith('DipoleWholeSpace')
+    ]
+
+
+class KernelBackendTest(object):
+
+    backend = None
+
+    def setUp(self):
+        self.backend0 = KernelBackends.getKernelBackend()
+        rng = np.random.RandomState(0)
+        self.xyz = rng.rand(500, 3) * 200. - 100.
+        self.srcLoc = np.r_[1., -2., 3.]
+
+    def tearDown(self):
+        KernelBackends.setKernelBackend(self.backend0)
+
+    def compare(self, func, args, kwargs={}, tol=TOL):
+        KernelBackends.setKernelBackend('numpy')
+        reference = func(*args, **kwargs)
+        KernelBackends.setKernelBackend(self.backend)
+        fields = func(*args, **kwargs)
+        for a, b in zip(fields, reference):
+            self.assertEqual(a.dtype, b.dtype)
+        error = relativeDifference(fields, reference)
+        self.assertLess(
+            error, tol, "{} {}: {:.1e}".format(
+                self.backend, func.__name__, error
+            )
+        )
+
+    def test_kernels(self):
+        results = KernelBackends.checkKernelBackends(n=1000)
+        for name, error in results[self.backend].items():
+            self.assertLess(error, TOL, "{}: {:.1e}".format(name, error))
+
+    def test_FDEM_dipoles(self):
+        for func in dipoleFunctions(FDEMDipolarfields):
+            for orientation in ['X', 'Y', 'Z']:
+                for f in [1e2, 1e5]:
+                    self.compare(
+                        func, (self.xyz, self.srcLoc, 1e-2, f),
+                        {'orientation': orientation}
+                    )
+
+    def test_FDEM_dipoles_single(self):
+        for func in dipoleFunctions(FDEMDipolarfields):
+            self.compare(
+                func, (self.xyz, self.srcLoc, 1e-2, 1e3),
+                {'orientation': 'Y', 'precision': 'single'}, tol=TOL_SINGLE
+            )
+
+    def test_TDEM_dipoles(self):
+        for func in dipoleFunctions(TDEMDipolarfields):
+            for orientation in ['X', 'Y', 'Z']:
+                for t in [1e-5, 1e-3]:
+                    self.compare(
+                        func, (self.xyz, self.srcLoc, 1e-2, t),
+                        {'orientation': orientation}
+                    )
+
+    def test_sphere(self):
+        rng = np.random.RandomState(1)
+        dx, dy, dz = self.xyz.T
+        mx, my, mz = rng.rand(3, dx.size) + 1j * rng.rand(3, dx.size)
+        self.compare(
+            sphereField, (dx, dy, dz, mx, my, mz, 1. / (4. * np.pi))
+        )
+        self.compare(sphereField, (dx, dy, dz, 1., 0., 2., 1.))
+
+
+@unittest.skipUnless(
+    'numba' in KernelBackends.availableKernelBackends(),
+    'numba is not installed'
+)
+class NumbaTest(KernelBackendTest, unittest.TestCase):
+
+    backend = 'numba'
+
+
+@unittest.skipUnless(
+    'numexpr' in KernelBackends.availableKernelBackends(),
+    'numexpr is not installed'
+)
+class NumexprTest(KernelBackendTest, unittest.TestCase):
+
+    backend = 'numexpr'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import unittest
+import numpy as np
+
+from SimPEG import Mesh, Maps, SolverLU
+from SimPEG.EM.Static import IP
+from em_examples.DCSurvey import getSurveyGeometry, makeSourceList
+from em_examples.LinearIP import LinearIP
+
+# The linearized IP data against the dpred of the IP survey, on a small
+# dipole-dipole survey over a conductive block.
+
+
+def ipProblem(surveyType='DipoleDipole'):
+    cs = 2.
+    hx = [(cs, 6, -1.3), (cs, 30), (cs, 6, 1.3)]
+    hy = [(cs, 6, -1.3), (cs, 15)]
+    mesh = Mesh.TensorMesh([hx, hy], "CN")
+
+    cc = mesh.gridCC
+    block = (abs(cc[:, 0]) < 6.) & (cc[:, 1] < -4.) & (cc[:, 1] > -12.)
+    sigma = 1e-2 * np.ones(mesh.nC)
+    sigma[block] = 1e-1
+
+    xr = np.arange(-20., 21., 4.)
+    geometry = getSurveyGeometry(np.c_[xr, np.zeros_like(xr)], surveyType, 4)
+    survey = IP.Survey(makeSourceList(geometry))
+    problem = IP.Problem3D_CC(mesh, sigma=sigma, etaMap=Maps.IdentityMap(mesh))
+    problem.Solver = SolverLU
+    problem.pair(survey)
+
+    eta = np.zeros(mesh.nC)
+    eta[block] = 0.1
+    return problem, survey, eta
+
+
+class LinearIPTest(unittest.TestCase):
+
+    def setUp(self):
+        self.problem, self.survey, self.eta = ipProblem()
+        self.d = self.survey.dpred(self.eta)
+
+    def error(self, d):
+        return np.linalg.norm(d - self.d) / np.linalg.norm(self.d)
+
+    def test_dpred(self):
+        for dtype, tol in [(np.float32, 1e-5), (np.float64, 1e-10)]:
+            linearIP = LinearIP(self.problem, dtype=dtype)
+            self.assertEqual(linearIP.nD, self.survey.nD)
+            d = linearIP.dpred(self.eta)
+            self.assertEqual(d.dtype, np.float64)
+            self.assertLess(self.error(d), tol, str(dtype))
+
+    def test_active(self):
+        # the chargeability outside of the active cells is ignored
+        active = self.eta > 0.
+        linearIP = LinearIP(self.problem, active=active, dtype=np.float64)
+        eta = self.eta + 0.05 * ~active
+        self.assertLess(self.error(linearIP.dpred(eta)), 1e-10)
+
+    def test_apparentChargeability(self):
+        linearIP = LinearIP(self.problem)
+        etaRef = 0.1 * np.ones_like(self.eta)
+        np.testing.assert_allclose(
+            linearIP.apparentChargeability(etaRef, etaRef), 0.1, rtol=1e-6
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
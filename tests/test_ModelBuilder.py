@@ -0,0 +1,67 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import unittest
+import numpy as np
+
+from SimPEG import Mesh
+from em_examples.ModelBuilder import (
+    getIndicesCircle, getIndicesEllipse, getSurfaceIndex, getNearestColumn
+)
+
+# The rasterization and surface helpers of ModelBuilder on small meshes.
+
+
+class BodyTest(unittest.TestCase):
+
+    def test_boundary(self):
+        # cell centres on the boundary are inside, for all the bodies
+        mesh = Mesh.TensorMesh([np.ones(20), np.ones(20)], x0='CN')
+        circle = getIndicesCircle(mesh, 0.5, -10.5, 3.)
+        ellipse = getIndicesEllipse(mesh, 0.5, -10.5, 3., 3.)
+        np.testing.assert_array_equal(np.sort(circle), np.sort(ellipse))
+        cc = mesh.gridCC
+        onBoundary = np.where(
+            np.isclose((cc[:, 0] - 0.5)**2 + (cc[:, 1] + 10.5)**2, 9.)
+        )[0]
+        self.assertEqual(onBoundary.size, 4)
+        self.assertTrue(np.in1d(onBoundary, circle).all())
+
+        wide = getIndicesEllipse(mesh, 0.5, -10.5, 4., 2.)
+        self.assertTrue(np.in1d(np.where(
+            np.isclose(cc[:, 0], 4.5) & np.isclose(cc[:, 1], -10.5)
+        )[0], wide).all())
+
+
+class SurfaceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = Mesh.TensorMesh([np.ones(10), np.ones(6)], x0='CN')
+
+    def test_surfaceIndex(self):
+        mesh = self.mesh
+        # a valley: the surface 2 cells lower in the middle columns
+        cc = mesh.gridCC
+        top = np.where(np.abs(cc[:, 0]) < 2., -3., -1.)
+        active = cc[:, 1] < top
+        ind = getSurfaceIndex(mesh, active)
+        self.assertEqual(ind.size, mesh.nCx)
+        self.assertTrue(active[ind].all())
+        np.testing.assert_allclose(
+            cc[ind, 1], np.where(np.abs(mesh.vectorCCx) < 2., -3.5, -1.5)
+        )
+        np.testing.assert_array_equal(
+            ind[getNearestColumn(mesh, [-4.6, 0.2])], ind[[0, 5]]
+        )
+
+    def test_emptyColumn(self):
+        active = self.mesh.gridCC[:, 1] < -1.
+        active[self.mesh.gridCC[:, 0] == 2.5] = False
+        with self.assertRaises(Exception):
+            getSurfaceIndex(self.mesh, active)
+
+
+if __name__ == '__main__':
+    unittest.main()
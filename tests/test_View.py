@@ -0,0 +1,159 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import unicode_literals
+
+import unittest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from em_examples import FDEMDipolarfields
+from em_examples.View import DataView, LRUCache, progressiveLevels
+
+# The drawing and caching helpers of View.DataView.
+
+
+class LRUCacheTest(unittest.TestCase):
+
+    @staticmethod
+    def arrays(n):
+        # n float64 values, 8 n bytes
+        return (np.zeros(n),)
+
+    def test_maxItems(self):
+        cache = LRUCache(maxItems=2)
+        cache.put('a', self.arrays(1))
+        cache.put('b', self.arrays(1))
+        # a used last, b evicted first
+        self.assertIsNotNone(cache.get('a'))
+        cache.put('c', self.arrays(1))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual(len(cache), 2)
+
+    def test_maxBytes(self):
+        cache = LRUCache(maxBytes=800)
+        cache.put('a', self.arrays(50))
+        cache.put('b', self.arrays(40))
+        self.assertEqual(cache.nbytes, 720)
+        cache.put('c', self.arrays(20))
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.nbytes, 480)
+        # replacing an item counts its bytes once
+        cache.put('b', self.arrays(10))
+        self.assertEqual(cache.nbytes, 240)
+        self.assertEqual(cache.get('b')[0].size, 10)
+        # larger than the cache: not kept, nothing evicted
+        cache.put('d', self.arrays(101))
+        self.assertIsNone(cache.get('d'))
+        self.assertEqual(len(cache), 2)
+        cache.clear()
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+
+    def test_readOnly(self):
+        cache = LRUCache(maxItems=1)
+        arrays = (np.ones(3), np.ones(2, dtype=complex))
+        cache.put('a', arrays)
+        for a in cache.get('a'):
+            with self.assertRaises(ValueError):
+                a[0] = 2.
+
+
+class EvalSweepTest(unittest.TestCase):
+
+    def setUp(self):
+        self.srcLoc = np.r_[0., 0., 0.]
+        self.obsLoc = np.r_[[50., 20., -10.]]
+        self.sig = np.logspace(-3, -1, 3)
+        self.f = np.logspace(1, 4, 5)
+        self.func = FDEMDipolarfields.E_from_ElectricDipoleWholeSpace
+
+    def loop(self, obsLoc, srcLoc, sig, f, orientation='X'):
+        # the same kernel, as a function that does not broadcast
+        return self.func(obsLoc, srcLoc, sig, f, orientation=orientation)
+
+    def test_broadcastLoop(self):
+        dataview = DataView()
+        vals = dataview.eval_sweep(
+            self.srcLoc, self.obsLoc, self.sig, self.f, 'X', self.func
+        )
+        loop = dataview.eval_sweep(
+            self.srcLoc, self.obsLoc, self.sig, self.f, 'X', self.loop
+        )
+        for v, w in zip(vals, loop):
+            self.assertEqual(v.shape, (3, 5))
+            self.assertEqual(v.dtype, np.complex128)
+            np.testing.assert_allclose(v, w, rtol=1e-12)
+        for n, sig in enumerate(self.sig):
+            for m, f in enumerate(self.f):
+                ex = self.func(self.obsLoc, self.srcLoc, sig, f)[0]
+                np.testing.assert_allclose(vals[0][n, m], ex[0], rtol=1e-12)
+
+    def test_cacheKeys(self):
+        calls = []
+
+        def func(*args, **kwargs):
+            calls.append(args[2])
+            return self.loop(*args, **kwargs)
+
+        dataview = DataView()
+        args = (self.srcLoc, self.obsLoc, self.sig, self.f, 'X', func)
+        vals = dataview.eval_sweep(*args)
+        self.assertEqual(len(calls), 3)
+        # the same sweep, with equal but new arrays
+        again = dataview.eval_sweep(
+            self.srcLoc.copy(), self.obsLoc.copy(), self.sig.copy(),
+            list(self.f), 'X', func
+        )
+        self.assertEqual(len(calls), 3)
+        self.assertTrue(all(a is b for a, b in zip(vals, again)))
+        # anything else is another sweep
+        for changed in [
+            (self.srcLoc + 1., self.obsLoc, self.sig, self.f, 'X', func),
+            (self.srcLoc, self.obsLoc + 1., self.sig, self.f, 'X', func),
+            (self.srcLoc, self.obsLoc, self.sig[:2], self.f, 'X', func),
+            (self.srcLoc, self.obsLoc, self.sig, self.f[1:], 'X', func),
+            (self.srcLoc, self.obsLoc, self.sig, self.f, 'Y', func),
+        ]:
+            n = len(calls)
+            dataview.eval_sweep(*changed)
+            self.assertGreater(len(calls), n)
+        dataview.precision = 'single'
+        n = len(calls)
+        dataview.eval_sweep(*args)
+        self.assertGreater(len(calls), n)
+
+        # the cached sweeps are read only and bounded
+        with self.assertRaises(ValueError):
+            vals[0][0, 0] = 0.
+        self.assertLessEqual(len(dataview._sweeps), dataview.sweepCacheSize)
+
+
+class DrawProgressiveTest(unittest.TestCase):
+
+    def test_withoutIPython(self):
+        # no figure to update: drawn once, at the finest resolution
+        drawn, evaluated = [], []
+
+        def draw(n):
+            drawn.append(n)
+            fig = plt.figure()
+            plt.plot(np.arange(n))
+            return fig
+
+        dataview = DataView()
+        levels = progressiveLevels(64)
+        self.assertEqual(levels[-1], 64)
+        refinement = dataview.draw_progressive(levels, draw, evaluated.append)
+        self.assertIsNone(refinement)
+        self.assertIsNone(dataview.refinement)
+        self.assertEqual(drawn, [64])
+        self.assertEqual(evaluated, [])
+        plt.close('all')
+
+
+if __name__ == '__main__':
+    unittest.main()